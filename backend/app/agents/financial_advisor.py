@@ -3,9 +3,9 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.models.transaction import Transaction
 from app.models.goal import Goal
 from app.models.jar import Jar
+from app.services.monthly_rollup import MonthlyRollup
 
 class FinancialAdvisor:
     """AI Agent for providing financial advice"""
@@ -15,29 +15,21 @@ class FinancialAdvisor:
     
     def analyze_spending_patterns(self, user_id: int) -> Dict:
         """Analyze user spending patterns"""
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense"
-        ).all()
+        # All-time spending by category, summed from the monthly rollup table
+        category_totals = MonthlyRollup(self.db).category_totals(user_id, "expense")
         
-        if not transactions:
+        if not category_totals:
             return {"status": "no_data", "message": "No expense data available"}
         
-        # Calculate spending by category
-        category_spending = {}
-        for transaction in transactions:
-            category = transaction.category
-            if category not in category_spending:
-                category_spending[category] = 0
-            category_spending[category] += transaction.amount
+        category_spending = {category: stats["total"] for category, stats in category_totals.items()}
         
         # Sort by highest spending
         sorted_categories = sorted(category_spending.items(), key=lambda x: x[1], reverse=True)
         
         return {
             "status": "success",
-            "total_expenses": sum(t.amount for t in transactions),
-            "transaction_count": len(transactions),
+            "total_expenses": sum(category_spending.values()),
+            "transaction_count": sum(stats["count"] for stats in category_totals.values()),
             "category_breakdown": dict(sorted_categories),
             "top_spending_category": sorted_categories[0][0] if sorted_categories else None,
             "top_spending_amount": sorted_categories[0][1] if sorted_categories else 0
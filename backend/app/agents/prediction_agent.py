@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models.transaction import Transaction
 from app.models.user import User
+from app.services.monthly_rollup import MonthlyRollup
 
 class PredictionAgent:
     """AI Agent for predicting financial trends"""
@@ -13,31 +14,19 @@ class PredictionAgent:
     
     def predict_monthly_expenses(self, user_id: int, months_ahead: int = 3) -> Dict:
         """Predict future monthly expenses"""
-        # Get last 6 months of data
+        # Get last 6 months of monthly expense totals from the rollup table
         six_months_ago = datetime.utcnow() - timedelta(days=180)
-        historical_expenses = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= six_months_ago
-        ).all()
+        monthly_data = MonthlyRollup(self.db).monthly_totals(user_id, "expense", since=six_months_ago)
         
-        if len(historical_expenses) < 20:
+        if sum(month["count"] for month in monthly_data) < 20:
             return {
                 "status": "warning",
                 "message": "Insufficient historical data for accurate prediction",
                 "recommendation": "Track expenses for at least 6 months"
             }
         
-        # Calculate monthly totals
-        monthly_totals = {}
-        for expense in historical_expenses:
-            month_key = expense.transaction_date.strftime("%Y-%m")
-            if month_key not in monthly_totals:
-                monthly_totals[month_key] = 0
-            monthly_totals[month_key] += expense.amount
-        
         # Simple moving average prediction
-        amounts = sorted(monthly_totals.values())
+        amounts = sorted(month["total"] for month in monthly_data)
         average = sum(amounts) / len(amounts)
         
         # Generate predictions
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.transaction import Transaction
 from app.models.goal import Goal
+from app.services.monthly_rollup import MonthlyRollup
 
 class RiskAssessor:
     """AI Agent for assessing financial risks"""
@@ -169,30 +170,18 @@ class RiskAssessor:
     
     def assess_spending_volatility(self, user_id: int) -> Dict:
         """Assess spending volatility and consistency"""
-        # Get last 3 months of expenses
+        # Get last 3 months of monthly expense totals from the rollup table
         three_months_ago = datetime.utcnow() - timedelta(days=90)
-        expenses = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= three_months_ago
-        ).all()
+        monthly_data = MonthlyRollup(self.db).monthly_totals(user_id, "expense", since=three_months_ago)
         
-        if len(expenses) < 10:
+        if sum(month["count"] for month in monthly_data) < 10:
             return {
                 "status": "warning",
                 "message": "Insufficient data for volatility assessment",
                 "recommendation": "Track more transactions for accurate analysis"
             }
         
-        # Calculate monthly totals
-        monthly_totals = {}
-        for expense in expenses:
-            month_key = expense.transaction_date.strftime("%Y-%m")
-            if month_key not in monthly_totals:
-                monthly_totals[month_key] = 0
-            monthly_totals[month_key] += expense.amount
-        
-        if len(monthly_totals) < 2:
+        if len(monthly_data) < 2:
             return {
                 "status": "warning",
                 "message": "Need at least 2 months of data",
@@ -200,7 +189,7 @@ class RiskAssessor:
             }
         
         # Calculate standard deviation
-        amounts = list(monthly_totals.values())
+        amounts = [month["total"] for month in monthly_data]
         average = sum(amounts) / len(amounts)
         variance = sum((x - average) ** 2 for x in amounts) / len(amounts)
         std_dev = variance ** 0.5
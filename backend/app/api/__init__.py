@@ -16,6 +16,7 @@ from . import predictive_insights
 from . import multi_agent_system
 from . import intelligent_recommendations
 from . import pattern_recognition
+from . import imports
 
 __all__ = [
     "auth",
@@ -34,5 +35,6 @@ __all__ = [
     "predictive_insights",
     "multi_agent_system",
     "intelligent_recommendations",
-    "pattern_recognition"
+    "pattern_recognition",
+    "imports"
 ]
@@ -1,19 +1,38 @@
 """Alerts API routes"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.models.alert import Alert
 from app.schemas.alert import AlertCreate, AlertResponse
 from app.api.users import get_current_user
 from app.models.user import User
+from app.services.transaction_aggregates import TransactionAggregates
+from app.utils.pagination import apply_keyset, set_next_cursor
+from typing import Optional
 
 router = APIRouter()
 
+async def _get_user_alert(db: AsyncSession, alert_id: int, user_id: int) -> Alert:
+    """Load an alert owned by the user or raise 404"""
+    result = await db.execute(
+        select(Alert).where((Alert.id == alert_id) & (Alert.user_id == user_id))
+    )
+    alert = result.scalar_one_or_none()
+    
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
+        )
+    
+    return alert
+
 @router.post("", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
 async def create_alert(
     alert_data: AlertCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new alert"""
     db_alert = Alert(
@@ -24,47 +43,47 @@ async def create_alert(
     )
     
     db.add(db_alert)
-    db.commit()
-    db.refresh(db_alert)
+    await db.commit()
+    await db.refresh(db_alert)
     
     return db_alert
 
 @router.get("", response_model=list[AlertResponse])
 async def list_alerts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     is_read: bool = Query(None),
     severity: str = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List user alerts"""
-    query = db.query(Alert).filter(Alert.user_id == current_user.id)
+    """List user alerts, paginated by offset or by keyset cursor"""
+    query = select(Alert).where(Alert.user_id == current_user.id)
     
     if is_read is not None:
-        query = query.filter(Alert.is_read == is_read)
+        query = query.where(Alert.is_read == is_read)
     if severity:
-        query = query.filter(Alert.severity == severity)
+        query = query.where(Alert.severity == severity)
     
-    alerts = query.order_by(Alert.created_at.desc()).offset(skip).limit(limit).all()
+    query = apply_keyset(query, Alert.created_at, Alert.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
+    
+    result = await db.execute(query.limit(limit))
+    alerts = result.scalars().all()
+    set_next_cursor(response, alerts, limit, "created_at")
     return alerts
 
 @router.get("/{alert_id}", response_model=AlertResponse)
 async def get_alert(
     alert_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get alert by ID"""
-    alert = db.query(Alert).filter(
-        (Alert.id == alert_id) & (Alert.user_id == current_user.id)
-    ).first()
-    
-    if not alert:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Alert not found"
-        )
+    alert = await _get_user_alert(db, alert_id, current_user.id)
     
     return alert
 
@@ -72,23 +91,15 @@ async def get_alert(
 async def mark_alert_as_read(
     alert_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark alert as read"""
-    alert = db.query(Alert).filter(
-        (Alert.id == alert_id) & (Alert.user_id == current_user.id)
-    ).first()
-    
-    if not alert:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Alert not found"
-        )
+    alert = await _get_user_alert(db, alert_id, current_user.id)
     
     alert.is_read = True
     db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    await db.commit()
+    await db.refresh(alert)
     
     return {"message": "Alert marked as read", "alert": alert}
 
@@ -96,37 +107,26 @@ async def mark_alert_as_read(
 async def delete_alert(
     alert_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete alert"""
-    alert = db.query(Alert).filter(
-        (Alert.id == alert_id) & (Alert.user_id == current_user.id)
-    ).first()
+    alert = await _get_user_alert(db, alert_id, current_user.id)
     
-    if not alert:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Alert not found"
-        )
-    
-    db.delete(alert)
-    db.commit()
+    await db.delete(alert)
+    await db.commit()
 
 @router.get("/stats/summary", response_model=dict)
 async def get_alerts_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get alerts summary"""
-    alerts = db.query(Alert).filter(Alert.user_id == current_user.id).all()
-    
-    unread_count = sum(1 for a in alerts if not a.is_read)
-    critical_count = sum(1 for a in alerts if a.severity == "critical")
-    warning_count = sum(1 for a in alerts if a.severity == "warning")
+    user_id = current_user.id
+    counts = await db.run_sync(lambda session: TransactionAggregates(session).alert_counts(user_id))
     
     return {
-        "total_alerts": len(alerts),
-        "unread_alerts": unread_count,
-        "critical_alerts": critical_count,
-        "warning_alerts": warning_count
+        "total_alerts": counts["total"],
+        "unread_alerts": counts["unread"],
+        "critical_alerts": counts["critical"],
+        "warning_alerts": counts["warning"]
     }
@@ -1,16 +1,13 @@
 """Analytics API endpoints for FINCoach AI Backend"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Optional
 from app.core.database import get_db
 from app.api.users import get_current_user
-from app.models.user import User
-from app.models.transaction import Transaction
 from app.models.goal import Goal
-from app.models.jar import Jar
 from app.schemas.user import UserResponse
-from sqlalchemy import func
+from app.services.transaction_aggregates import TransactionAggregates
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
 
@@ -21,31 +18,23 @@ async def get_dashboard_analytics(
 ):
     """Get comprehensive dashboard analytics for the user"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
-        # Get transactions for the current month
+        # Aggregate the current month in SQL
         today = datetime.now()
-        month_start = today.replace(day=1)
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= month_start
-        ).all()
-        
-        # Calculate totals
-        total_income = sum(t.amount for t in transactions if t.type == "income")
-        total_expense = sum(t.amount for t in transactions if t.type == "expense")
+        month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        aggregates = TransactionAggregates(db)
+        totals = aggregates.totals_by_type(user.id, start_date=month_start)
+        
+        total_income = totals["income"]
+        total_expense = totals["expense"]
         net_balance = total_income - total_expense
         
         # Get category breakdown
-        category_breakdown = {}
-        for transaction in transactions:
-            if transaction.type == "expense":
-                category = transaction.category
-                if category not in category_breakdown:
-                    category_breakdown[category] = 0
-                category_breakdown[category] += transaction.amount
+        category_breakdown = {
+            category: stats["total"]
+            for category, stats in aggregates.expense_by_category(user.id, start_date=month_start).items()
+        }
         
         # Get goals progress
         goals = db.query(Goal).filter(Goal.user_id == user.id).all()
@@ -54,7 +43,7 @@ async def get_dashboard_analytics(
             progress_percentage = (goal.current_amount / goal.target_amount * 100) if goal.target_amount > 0 else 0
             goals_progress.append({
                 "id": goal.id,
-                "name": goal.name,
+                "name": goal.title,
                 "target": goal.target_amount,
                 "current": goal.current_amount,
                 "progress_percentage": round(progress_percentage, 2),
@@ -62,8 +51,8 @@ async def get_dashboard_analytics(
             })
         
         # Get jars summary
-        jars = db.query(Jar).filter(Jar.user_id == user.id).all()
-        total_saved = sum(jar.current_amount for jar in jars)
+        jar_totals = aggregates.jar_totals(user.id)
+        total_saved = jar_totals["total_saved"]
         
         return {
             "period": f"{month_start.strftime('%B %Y')}",
@@ -75,48 +64,48 @@ async def get_dashboard_analytics(
             },
             "category_breakdown": {k: round(v, 2) for k, v in category_breakdown.items()},
             "goals_progress": goals_progress,
-            "transaction_count": len(transactions),
+            "transaction_count": totals["transaction_count"],
             "goals_count": len(goals),
-            "jars_count": len(jars)
+            "jars_count": jar_totals["jars_count"]
         }
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/spending-trends", response_model=Dict[str, Any])
 async def get_spending_trends(
-    months: int = 6,
+    months: int = Query(6, ge=1, le=120),
+    granularity: str = Query("month", pattern="^(day|week|month)$"),
+    periods: Optional[int] = Query(None, ge=1, le=730),
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get spending trends for the last N months"""
+    """Get spending trends for the last N months, weeks or days in a single grouped query"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
+        
+        if periods is None:
+            periods = months if granularity == "month" else 30
+        
+        buckets = TransactionAggregates(db).expense_trend(user.id, granularity=granularity, periods=periods)
         
         trends = []
-        for i in range(months):
-            month_date = datetime.now() - timedelta(days=30*i)
-            month_start = month_date.replace(day=1)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            month_transactions = db.query(Transaction).filter(
-                Transaction.user_id == user.id,
-                Transaction.date >= month_start,
-                Transaction.date <= month_end,
-                Transaction.type == "expense"
-            ).all()
-            
-            total_expense = sum(t.amount for t in month_transactions)
-            trends.append({
-                "month": month_start.strftime("%B %Y"),
-                "total_expense": round(total_expense, 2),
-                "transaction_count": len(month_transactions)
-            })
+        for bucket in buckets:
+            trend = {
+                "period_start": bucket["period_start"].isoformat(),
+                "total_expense": round(bucket["total"], 2),
+                "transaction_count": bucket["count"]
+            }
+            if granularity == "month":
+                trend["month"] = bucket["period_start"].strftime("%B %Y")
+            trends.append(trend)
+        
+        average_expense = round(sum(t["total_expense"] for t in trends) / len(trends), 2) if trends else 0
         
         return {
-            "trends": list(reversed(trends)),
-            "average_monthly_expense": round(sum(t["total_expense"] for t in trends) / len(trends), 2) if trends else 0
+            "granularity": granularity,
+            "trends": trends,
+            "average_expense_per_period": average_expense,
+            "average_monthly_expense": average_expense if granularity == "month" else None
         }
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -128,37 +117,18 @@ async def get_category_analysis(
 ):
     """Get detailed category-wise spending analysis"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         today = datetime.now()
-        month_start = today.replace(day=1)
-        
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= month_start,
-            Transaction.type == "expense"
-        ).all()
+        month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         category_analysis = {}
-        for transaction in transactions:
-            category = transaction.category
-            if category not in category_analysis:
-                category_analysis[category] = {
-                    "total": 0,
-                    "count": 0,
-                    "average": 0
-                }
-            category_analysis[category]["total"] += transaction.amount
-            category_analysis[category]["count"] += 1
-        
-        # Calculate averages
-        for category in category_analysis:
-            category_analysis[category]["average"] = round(
-                category_analysis[category]["total"] / category_analysis[category]["count"], 2
-            )
-            category_analysis[category]["total"] = round(category_analysis[category]["total"], 2)
+        for category, stats in TransactionAggregates(db).expense_by_category(user.id, start_date=month_start).items():
+            category_analysis[category] = {
+                "total": round(stats["total"], 2),
+                "count": stats["count"],
+                "average": round(stats["total"] / stats["count"], 2)
+            }
         
         total_expense = sum(cat["total"] for cat in category_analysis.values())
         
@@ -183,29 +153,26 @@ async def get_financial_health(
 ):
     """Get comprehensive financial health score and metrics"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         today = datetime.now()
-        month_start = today.replace(day=1)
-        
-        # Get transactions
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= month_start
-        ).all()
+        month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
-        total_income = sum(t.amount for t in transactions if t.type == "income")
-        total_expense = sum(t.amount for t in transactions if t.type == "expense")
+        # Aggregate transactions, jars and goals in SQL
+        aggregates = TransactionAggregates(db)
+        totals = aggregates.totals_by_type(user.id, start_date=month_start)
+        total_income = totals["income"]
+        total_expense = totals["expense"]
         
         # Get savings
-        jars = db.query(Jar).filter(Jar.user_id == user.id).all()
-        total_saved = sum(jar.current_amount for jar in jars)
+        jar_totals = aggregates.jar_totals(user.id)
+        total_saved = jar_totals["total_saved"]
+        jars_count = jar_totals["jars_count"]
         
         # Get goals
-        goals = db.query(Goal).filter(Goal.user_id == user.id).all()
-        completed_goals = sum(1 for g in goals if g.current_amount >= g.target_amount)
+        goal_counts = aggregates.goal_counts(user.id)
+        completed_goals = goal_counts["completed"]
+        total_goals = goal_counts["total"]
         
         # Calculate health score (0-100)
         health_score = 0
@@ -226,13 +193,13 @@ async def get_financial_health(
                 health_score += 10
         
         # Goal achievement (0-20 points)
-        if goals:
-            goal_completion_rate = (completed_goals / len(goals)) * 100
+        if total_goals:
+            goal_completion_rate = (completed_goals / total_goals) * 100
             health_score += (goal_completion_rate / 100) * 20
         
         # Jar diversity (0-20 points)
-        if jars:
-            health_score += min(20, len(jars) * 5)
+        if jars_count:
+            health_score += min(20, jars_count * 5)
         
         return {
             "health_score": round(health_score, 2),
@@ -244,8 +211,8 @@ async def get_financial_health(
                 "expense_ratio": round((total_expense / total_income * 100) if total_income > 0 else 0, 2),
                 "total_saved": round(total_saved, 2),
                 "goals_completed": completed_goals,
-                "total_goals": len(goals),
-                "jars_count": len(jars)
+                "total_goals": total_goals,
+                "jars_count": jars_count
             }
         }
     except Exception as e:
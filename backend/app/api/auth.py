@@ -3,13 +3,23 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from app.core.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from app.core.security import (
+    hash_password_async, verify_password_async, create_access_token, create_refresh_token, PasswordHashPoolBusy
+)
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from pydantic import BaseModel, EmailStr
 
 router = APIRouter()
 
+def _hashing_busy() -> HTTPException:
+    """Build the 503 returned when the password hashing queue is full"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -34,7 +44,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    try:
+        hashed_password = await hash_password_async(user_data.password)
+    except PasswordHashPoolBusy:
+        raise _hashing_busy()
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -56,7 +69,12 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Login user and return tokens"""
     user = db.query(User).filter(User.email == credentials.email).first()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    try:
+        password_ok = bool(user) and await verify_password_async(credentials.password, user.hashed_password)
+    except PasswordHashPoolBusy:
+        raise _hashing_busy()
+    
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
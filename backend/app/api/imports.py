@@ -0,0 +1,119 @@
+"""Bank statement import API endpoints for FINCoach AI Backend"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+import os
+import tempfile
+from typing import Optional
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.api.users import get_current_user
+from app.models.import_job import ImportJob
+from app.schemas.user import UserResponse
+from app.services.anomaly_stage import anomaly_stage
+from app.services.statement_import import StatementImporter
+
+router = APIRouter(prefix="/api/v1/imports", tags=["Statement Import"])
+
+def job_response(job: ImportJob) -> dict:
+    return {
+        "job_id": job.id,
+        "format": job.source_format,
+        "status": job.status.value,
+        "rows_read": job.rows_read,
+        "inserted": job.inserted,
+        "duplicates": job.duplicates,
+        "failed": job.failed,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+async def run_statement_import(job_id: str, path: str) -> None:
+    """Import a spooled statement off the event loop, then hand recent expenses to the anomaly stage"""
+    def run():
+        db = SessionLocal()
+        try:
+            importer = StatementImporter(db)
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            with open(path, newline="", encoding="utf-8-sig") as stream:
+                importer.run(job, stream)
+            return importer.recent
+        finally:
+            db.close()
+    
+    try:
+        recent = await run_in_threadpool(run)
+        anomaly_stage.submit(recent)
+    finally:
+        os.unlink(path)
+
+@router.post("/statements", status_code=status.HTTP_202_ACCEPTED)
+async def import_statement(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Optional[str] = Query(None, pattern="^(csv|ofx)$", description="Defaults from the content type"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a CSV or OFX bank statement for background import
+    
+    The body is streamed to a temporary file and imported chunk by chunk after the
+    response is sent; poll the returned job for progress. Rows are deduplicated, so
+    uploading an overlapping statement again is safe. Bodies over
+    STATEMENT_IMPORT_MAX_BYTES are rejected with 413.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Statements are limited to {settings.STATEMENT_IMPORT_MAX_BYTES} bytes"
+    )
+    if int(request.headers.get("content-length") or 0) > settings.STATEMENT_IMPORT_MAX_BYTES:
+        raise too_large
+    
+    try:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = format or ("ofx" if content_type in ("application/x-ofx", "application/ofx") else "csv")
+        
+        spool = tempfile.NamedTemporaryFile(prefix="statement-", suffix=f".{format}", delete=False)
+        scheduled = False
+        try:
+            with spool:
+                received = 0
+                async for chunk in request.stream():
+                    # Content-Length can be absent (chunked uploads), so count what actually arrives
+                    received += len(chunk)
+                    if received > settings.STATEMENT_IMPORT_MAX_BYTES:
+                        raise too_large
+                    spool.write(chunk)
+            
+            job = StatementImporter(db).create_job(current_user.id, format)
+            background_tasks.add_task(run_statement_import, job.id, spool.name)
+            scheduled = True
+        finally:
+            # Once scheduled, run_statement_import owns (and removes) the spool file
+            if not scheduled:
+                os.unlink(spool.name)
+        
+        return {
+            "status": "accepted",
+            "job_id": job.id,
+            "status_url": f"{router.prefix}/jobs/{job.id}"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("/jobs/{job_id}")
+async def get_import_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the progress of a statement import"""
+    job = db.query(ImportJob).filter(ImportJob.id == job_id, ImportJob.user_id == current_user.id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job_response(job)
@@ -6,7 +6,9 @@ from app.core.database import get_db
 from app.ml_modules.prediction_engine import PredictionEngine
 from app.ml_modules.categorizer import TransactionCategorizer
 from app.ml_modules.anomaly_detector import AnomalyDetector
+from app.services.category_rules import CategoryRules
 from app.api.users import get_current_user
+from app.models.transaction import TransactionCategory
 
 router = APIRouter(prefix="/api/v1/ml", tags=["ml_modules"])
 
@@ -14,31 +16,78 @@ class TransactionInput(BaseModel):
     description: str
     amount: float = None
 
+class CategoryRuleInput(BaseModel):
+    keyword: str
+    category: TransactionCategory
+
 class AnomalyCheckInput(BaseModel):
     transaction_amount: float
-    category: str
+    category: TransactionCategory
 
 @router.post("/categorize")
 def categorize_transaction(
     transaction: TransactionInput,
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Automatically categorize a transaction"""
-    categorizer = TransactionCategorizer()
+    categorizer = TransactionCategorizer(db, current_user.id)
     return categorizer.categorize_transaction(transaction.description, transaction.amount)
 
 @router.post("/categorize-suggestions")
 def get_category_suggestions(
     transaction: TransactionInput,
+    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get multiple category suggestions for a transaction"""
-    categorizer = TransactionCategorizer()
+    categorizer = TransactionCategorizer(db, current_user.id)
     return {
         "status": "success",
         "suggestions": categorizer.get_category_suggestions(transaction.description)
     }
 
+@router.get("/categorize/rules")
+def list_category_rules(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """List the user's custom categorization rules"""
+    rules = CategoryRules(db)
+    return {
+        "status": "success",
+        "version": rules.version(current_user.id),
+        "rules": [
+            {"id": rule.id, "keyword": rule.keyword, "category": rule.category}
+            for rule in rules.list(current_user.id)
+        ]
+    }
+
+@router.post("/categorize/rules")
+def add_category_rule(
+    rule: CategoryRuleInput,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Add a custom categorization rule; it takes precedence over the built-in keywords"""
+    categorizer = TransactionCategorizer(db, current_user.id)
+    try:
+        return categorizer.add_custom_category_rule(rule.keyword, rule.category.value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/categorize/rules/{rule_id}")
+def delete_category_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Delete a custom categorization rule"""
+    if not CategoryRules(db).remove(current_user.id, rule_id):
+        raise HTTPException(status_code=404, detail="Rule not found")
+    db.commit()
+    return {"status": "success", "message": "Rule deleted"}
+
 @router.get("/prediction/next-month-spending")
 def predict_next_month_spending(
     db: Session = Depends(get_db),
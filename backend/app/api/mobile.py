@@ -1,21 +1,31 @@
 """Mobile App Integration API endpoints for FINCoach AI Backend"""
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+import io
+import tempfile
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.api.users import get_current_user
-from app.models.user import User
 from app.models.transaction import Transaction
 from app.models.goal import Goal
 from app.models.jar import Jar
 from app.models.alert import Alert
 from app.schemas.user import UserResponse
 from app.schemas.transaction import TransactionCreate, TransactionResponse
+from app.services.transaction_events import TransactionEvents
+from app.services.anomaly_stage import anomaly_stage, staged
+from app.services.bulk_ingest import TransactionBulkWriter, validate_transaction_rows
+from app.services.sms_ingest import SMSIngestor, iter_sms_records
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/v1/mobile", tags=["Mobile Integration"])
 
+# SMS exports larger than this are spooled to disk while uploading
+SMS_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
 class MobileDeviceRegister(BaseModel):
     device_id: str
     device_type: str  # ios, android
@@ -36,10 +46,6 @@ async def register_mobile_device(
 ):
     """Register a mobile device for push notifications"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Store device information (in production, use a Device model)
         return {
             "status": "success",
@@ -59,10 +65,6 @@ async def update_notification_preferences(
 ):
     """Update mobile notification preferences"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         return {
             "status": "success",
             "message": "Notification preferences updated",
@@ -79,16 +81,12 @@ async def get_mobile_quick_summary(
 ):
     """Get quick summary for mobile home screen"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         today = datetime.now()
         month_start = today.replace(day=1)
         
         # Get today's transactions
         today_transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
+            Transaction.user_id == current_user.id,
             Transaction.date >= today.replace(hour=0, minute=0, second=0, microsecond=0)
         ).all()
         
@@ -97,7 +95,7 @@ async def get_mobile_quick_summary(
         
         # Get month summary
         month_transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
+            Transaction.user_id == current_user.id,
             Transaction.date >= month_start
         ).all()
         
@@ -105,12 +103,12 @@ async def get_mobile_quick_summary(
         month_income = sum(t.amount for t in month_transactions if t.type == "income")
         
         # Get jars
-        jars = db.query(Jar).filter(Jar.user_id == user.id).all()
+        jars = db.query(Jar).filter(Jar.user_id == current_user.id).all()
         total_saved = sum(jar.current_amount for jar in jars)
         
         # Get pending alerts
         alerts = db.query(Alert).filter(
-            Alert.user_id == user.id,
+            Alert.user_id == current_user.id,
             Alert.is_read == False
         ).all()
         
@@ -156,28 +154,26 @@ async def add_quick_transaction(
 ):
     """Quick transaction add from mobile app"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         new_transaction = Transaction(
-            user_id=user.id,
+            user_id=current_user.id,
             amount=transaction.amount,
             category=transaction.category,
             description=transaction.description,
             type=transaction.type,
-            date=transaction.date or datetime.now()
+            transaction_date=transaction.transaction_date or datetime.now()
         )
         
         db.add(new_transaction)
+        TransactionEvents(db).added(new_transaction)
         db.commit()
         db.refresh(new_transaction)
+        anomaly_stage.submit([staged(new_transaction)])
         
         return {
             "status": "success",
             "message": "Transaction added successfully",
             "transaction_id": new_transaction.id,
-            "created_at": new_transaction.date.isoformat()
+            "created_at": new_transaction.transaction_date.isoformat()
         }
     except Exception as e:
         db.rollback()
@@ -190,11 +186,7 @@ async def get_mobile_goals(
 ):
     """Get goals optimized for mobile display"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        goals = db.query(Goal).filter(Goal.user_id == user.id).all()
+        goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
         
         mobile_goals = []
         for goal in goals:
@@ -220,11 +212,7 @@ async def get_mobile_jars(
 ):
     """Get jars optimized for mobile display"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        jars = db.query(Jar).filter(Jar.user_id == user.id).all()
+        jars = db.query(Jar).filter(Jar.user_id == current_user.id).all()
         
         mobile_jars = []
         for jar in jars:
@@ -249,12 +237,8 @@ async def get_recent_transactions(
 ):
     """Get recent transactions for mobile app"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id
+            Transaction.user_id == current_user.id
         ).order_by(Transaction.date.desc()).limit(limit).all()
         
         return [
@@ -279,33 +263,88 @@ async def sync_offline_data(
 ):
     """Sync offline data from mobile app"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        # Process transactions from offline sync; retried batches are deduplicated by idempotency key
+        raw_transactions = [
+            {
+                **trans_data,
+                "transaction_date": trans_data.get("transaction_date") or trans_data.get("date") or datetime.now(),
+                "idempotency_key": trans_data.get("idempotency_key") or trans_data.get("client_id")
+            }
+            for trans_data in data.get("transactions", [])
+        ]
+        valid, errors = validate_transaction_rows(raw_transactions)
+        writer = TransactionBulkWriter(db)
+        written = writer.write_idempotent(current_user.id, valid)
+        results = written["results"]
+        errors = sorted(errors + written["errors"], key=lambda error: error["index"])
+        anomaly_stage.submit(writer.committed)
         
-        # Process transactions from offline sync
-        synced_count = 0
-        if "transactions" in data:
-            for trans_data in data["transactions"]:
-                new_transaction = Transaction(
-                    user_id=user.id,
-                    amount=trans_data.get("amount"),
-                    category=trans_data.get("category"),
-                    description=trans_data.get("description"),
-                    type=trans_data.get("type"),
-                    date=datetime.fromisoformat(trans_data.get("date", datetime.now().isoformat()))
-                )
-                db.add(new_transaction)
-                synced_count += 1
+        return {
+            "status": "success" if not errors else "partial",
+            "message": (
+                "Offline data synced successfully" if not errors
+                else f"Offline data partially synced; {len(errors)} item(s) failed"
+            ),
+            "synced_items": sum(1 for result in results if result["status"] == "created"),
+            "duplicate_items": sum(1 for result in results if result["status"] == "duplicate"),
+            "transactions": results,
+            "errors": errors,
+            "synced_at": datetime.now().isoformat()
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.post("/sms/import")
+async def import_sms_inbox(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Defaults from the content type"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import transactions from an exported SMS inbox (NDJSON or CSV)
+    
+    The body is spooled to a temporary file and parsed in chunks off the event loop;
+    messages are deduplicated by UPI reference, so re-uploading an export is safe.
+    Bodies over SMS_IMPORT_MAX_BYTES are rejected with 413.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"SMS exports are limited to {settings.SMS_IMPORT_MAX_BYTES} bytes"
+    )
+    if int(request.headers.get("content-length") or 0) > settings.SMS_IMPORT_MAX_BYTES:
+        raise too_large
+    
+    try:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = format or ("csv" if content_type in ("text/csv", "application/csv") else "ndjson")
         
-        db.commit()
+        with tempfile.SpooledTemporaryFile(max_size=SMS_SPOOL_MAX_MEMORY) as spool:
+            received = 0
+            async for chunk in request.stream():
+                # Content-Length can be absent (chunked uploads), so count what actually arrives
+                received += len(chunk)
+                if received > settings.SMS_IMPORT_MAX_BYTES:
+                    raise too_large
+                spool.write(chunk)
+            spool.seek(0)
+            
+            ingestor = SMSIngestor(db)
+
+            def ingest():
+                with io.TextIOWrapper(spool, encoding="utf-8", newline="") as stream:
+                    return ingestor.ingest(current_user.id, iter_sms_records(stream, format))
+            
+            stats = await run_in_threadpool(ingest)
+        anomaly_stage.submit(ingestor.writer.committed)
         
         return {
             "status": "success",
-            "message": "Offline data synced successfully",
-            "synced_items": synced_count,
-            "synced_at": datetime.now().isoformat()
+            **stats,
+            "imported_at": datetime.now().isoformat()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
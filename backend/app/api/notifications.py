@@ -1,38 +1,59 @@
 """Real-time Notifications API endpoints for FINCoach AI Backend"""
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Response
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.core.database import get_db
 from app.api.users import get_current_user
 from app.models.user import User
 from app.models.alert import Alert
 from app.schemas.user import UserResponse
 from app.schemas.alert import AlertResponse
+from app.services.notification_backplane import Backplane, create_backplane
+from app.utils.pagination import apply_keyset, set_next_cursor
 import json
 
 router = APIRouter(prefix="/api/v1/notifications", tags=["Notifications"])
 
 # Store active WebSocket connections
 class ConnectionManager:
-    def __init__(self):
+    """Sockets connected to this worker; notifications reach other workers through the backplane"""
+
+    def __init__(self, backplane: Optional[Backplane] = None):
         self.active_connections: Dict[int, List[WebSocket]] = {}
-    
+        self.backplane = backplane or create_backplane()
+        self._started = False
+
+    async def start(self):
+        """Subscribe this worker to the backplane; idempotent"""
+        if not self._started:
+            await self.backplane.start(self.deliver_local)
+            self._started = True
+
+    async def stop(self):
+        await self.backplane.stop()
+        self._started = False
+
     async def connect(self, user_id: int, websocket: WebSocket):
         await websocket.accept()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
-    
+
     async def disconnect(self, user_id: int, websocket: WebSocket):
         if user_id in self.active_connections:
             self.active_connections[user_id].remove(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
-    
+
     async def broadcast_to_user(self, user_id: int, message: dict):
+        """Send a message to every socket of the user, on whichever worker it is connected"""
+        await self.start()
+        await self.backplane.publish(user_id, message)
+
+    async def deliver_local(self, user_id: int, message: dict):
         if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
+            for connection in list(self.active_connections[user_id]):
                 try:
                     await connection.send_json(message)
                 except Exception as e:
@@ -81,9 +102,7 @@ async def get_unread_notification_count(
 ):
     """Get count of unread notifications"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         unread_alerts = db.query(Alert).filter(
             Alert.user_id == user.id,
@@ -99,24 +118,29 @@ async def get_unread_notification_count(
 
 @router.get("/list", response_model=List[Dict[str, Any]])
 async def get_notifications(
+    response: Response,
     limit: int = 20,
     offset: int = 0,
     unread_only: bool = False,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get notifications with pagination"""
+    """Get notifications with offset or keyset-cursor pagination"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         query = db.query(Alert).filter(Alert.user_id == user.id)
         
         if unread_only:
             query = query.filter(Alert.is_read == False)
         
-        alerts = query.order_by(Alert.created_at.desc()).offset(offset).limit(limit).all()
+        query = apply_keyset(query, Alert.created_at, Alert.id, cursor)
+        if not cursor:
+            query = query.offset(offset)
+        
+        alerts = query.limit(limit).all()
+        set_next_cursor(response, alerts, limit, "created_at")
         
         return [
             {
@@ -130,6 +154,8 @@ async def get_notifications(
             }
             for alert in alerts
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -224,9 +250,7 @@ async def get_notifications_by_severity(
 ):
     """Get notifications filtered by severity"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         alerts = db.query(Alert).filter(
             Alert.user_id == user.id,
@@ -254,9 +278,7 @@ async def send_test_notification(
 ):
     """Send a test notification to the user"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = current_user
         
         test_alert = Alert(
             user_id=user.id,
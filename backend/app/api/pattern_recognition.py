@@ -1,9 +1,10 @@
 """API endpoints for pattern recognition and advanced anomaly detection"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api.users import get_current_user
 from app.ml_modules.pattern_recognition import PatternRecognition
+from app.services.recurring_series import RecurringSeriesIndex
 from app.models.user import User
 
 router = APIRouter(prefix="/api/v1/patterns", tags=["Pattern Recognition"])
@@ -88,3 +89,34 @@ async def detect_spending_correlations(
         return correlations
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/recurring")
+async def get_recurring_series(
+    upcoming_days: int = Query(None, ge=1, le=365, description="Only series expected within this many days"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List detected recurring expenses (subscriptions, bills) and when each is next expected"""
+    try:
+        index = RecurringSeriesIndex(db)
+        series = index.upcoming(current_user.id, upcoming_days) if upcoming_days else index.series(current_user.id)
+        return {
+            "status": "success",
+            "series": [
+                {
+                    "id": s.id,
+                    "category": s.category,
+                    "cadence": s.cadence,
+                    "interval_days": s.interval_days,
+                    "typical_amount": s.typical_amount,
+                    "amount_band": [s.amount_min, s.amount_max],
+                    "occurrences": s.occurrences,
+                    "last_seen": s.last_seen.isoformat(),
+                    "next_expected_date": s.next_expected_date.isoformat()
+                }
+                for s in series
+            ],
+            "total_series": len(series)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -59,10 +59,6 @@ async def update_user_profile(
 ):
     """Update user profile"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Store profile data (in production, use a Profile model)
         return {
             "status": "success",
@@ -81,12 +77,8 @@ async def create_financial_challenge(
 ):
     """Create a new financial challenge"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Create challenge (in production, use a Challenge model)
-        challenge_id = hash(f"{user.id}{challenge.title}{datetime.now()}") % 1000000
+        challenge_id = hash(f"{current_user.id}{challenge.title}{datetime.now()}") % 1000000
         
         return {
             "status": "success",
@@ -98,7 +90,7 @@ async def create_financial_challenge(
                 "description": challenge.description,
                 "target_amount": challenge.target_amount,
                 "duration_days": challenge.duration_days,
-                "created_by": user.id,
+                "created_by": current_user.id,
                 "created_at": datetime.now().isoformat(),
                 "participants": 1
             }
@@ -113,10 +105,6 @@ async def list_financial_challenges(
 ):
     """List available financial challenges"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Return sample challenges
         challenges = [
             {
@@ -163,15 +151,11 @@ async def join_challenge(
 ):
     """Join a financial challenge"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         return {
             "status": "success",
             "message": "Successfully joined the challenge",
             "challenge_id": challenge_id,
-            "user_id": user.id,
+            "user_id": current_user.id,
             "joined_at": datetime.now().isoformat()
         }
     except Exception as e:
@@ -186,10 +170,6 @@ async def get_leaderboard(
 ):
     """Get leaderboard for challenges"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Return sample leaderboard
         leaderboard = [
             {
@@ -237,10 +217,6 @@ async def get_friends_list(
 ):
     """Get user's friends list"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         # Return sample friends
         friends = [
             {
@@ -271,10 +247,6 @@ async def add_friend(
 ):
     """Add a friend"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         friend = db.query(User).filter(User.id == friend_id).first()
         if not friend:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Friend not found")
@@ -295,10 +267,6 @@ async def get_achievements(
 ):
     """Get user achievements and badges"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         achievements = [
             {
                 "id": 1,
@@ -346,15 +314,11 @@ async def share_achievement(
 ):
     """Share an achievement on social media"""
     try:
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
         return {
             "status": "success",
             "message": "Achievement shared successfully",
             "achievement_id": achievement_id,
-            "share_url": f"https://fincoach.app/achievements/{achievement_id}?user={user.id}",
+            "share_url": f"https://fincoach.app/achievements/{achievement_id}?user={current_user.id}",
             "shared_at": datetime.now().isoformat()
         }
     except Exception as e:
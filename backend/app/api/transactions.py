@@ -1,107 +1,244 @@
 """Transactions API routes"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from typing import Optional
+from app.core.config import settings
+from app.core.database import get_async_db, AsyncSessionLocal
 from app.models.transaction import Transaction
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
+from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionType, TransactionCategory
 from app.api.users import get_current_user
 from app.models.user import User
+from app.services.transaction_aggregates import TransactionAggregates
+from app.services.monthly_rollup import MonthlyRollup
+from app.services.transaction_events import TransactionEvents
+from app.services.anomaly_stage import anomaly_stage, staged
+from app.services.transaction_fingerprint import DuplicateIndex
+from app.services.bulk_ingest import TransactionBulkWriter, parse_bulk_payload, validate_transaction_rows
+from app.services.transaction_export import EXPORT_MEDIA_TYPES, export_query, stream_export
+from app.utils.pagination import apply_keyset, set_next_cursor
 
 router = APIRouter()
 
+async def _get_user_transaction(db: AsyncSession, transaction_id: int, user_id: int) -> Transaction:
+    """Load a transaction owned by the user or raise 404"""
+    result = await db.execute(
+        select(Transaction).where(
+            (Transaction.id == transaction_id) & (Transaction.user_id == user_id)
+        )
+    )
+    transaction = result.scalar_one_or_none()
+    
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    
+    return transaction
+
+async def _find_by_idempotency_key(db: AsyncSession, user_id: int, key: str) -> Optional[Transaction]:
+    """Load the user's transaction carrying this idempotency key, if any"""
+    result = await db.execute(
+        select(Transaction).where(
+            (Transaction.user_id == user_id) &
+            (Transaction.idempotency_key == key)
+        )
+    )
+    return result.scalar_one_or_none()
+
 @router.post("", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Create a new transaction"""
+    """Create a new transaction; a repeated idempotency key returns the original transaction"""
+    key = transaction_data.idempotency_key
+    if key:
+        existing = await _find_by_idempotency_key(db, current_user.id, key)
+        if existing:
+            return existing
+    
     db_transaction = Transaction(
         user_id=current_user.id,
         amount=transaction_data.amount,
         type=transaction_data.type,
         category=transaction_data.category,
         description=transaction_data.description,
-        transaction_date=transaction_data.transaction_date
+        transaction_date=transaction_data.transaction_date,
+        idempotency_key=key
     )
     
-    db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+    try:
+        db.add(db_transaction)
+        await db.run_sync(lambda session: TransactionEvents(session).added(db_transaction))
+        await db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key committed first; answer with its row
+        await db.rollback()
+        existing = await _find_by_idempotency_key(db, current_user.id, key) if key else None
+        if existing is None:
+            raise
+        return existing
+    await db.refresh(db_transaction)
+    anomaly_stage.submit([staged(db_transaction)])
     
     return db_transaction
 
+@router.post("/bulk", response_model=dict)
+async def bulk_create_transactions(
+    request: Request,
+    skip_duplicates: bool = Query(False, description="Leave out rows that look like duplicates instead of only reporting them"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Bulk-import transactions from a JSON array or an NDJSON body
+    
+    Valid rows are inserted in committed chunks; invalid rows and rows the
+    database rejected are reported by their zero-based index in the payload. Rows that
+    match a stored transaction or an earlier row by fingerprint are listed in ``duplicates``.
+    """
+    body = await request.body()
+    try:
+        rows, errors = parse_bulk_payload(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if len(rows) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ROWS} transactions per request"
+        )
+    
+    valid, validation_errors = await run_in_threadpool(
+        validate_transaction_rows, rows, [error["index"] for error in errors]
+    )
+    user_id = current_user.id
+
+    def write(session):
+        duplicates = DuplicateIndex(session).find_in_batch(user_id, valid)
+        to_insert = valid
+        if skip_duplicates and duplicates:
+            skipped = set(duplicates)
+            to_insert = [(index, transaction) for index, transaction in valid if index not in skipped]
+        writer = TransactionBulkWriter(session)
+        return writer.write(user_id, to_insert), writer.committed, duplicates
+    
+    result, committed, duplicates = await db.run_sync(write)
+    anomaly_stage.submit(committed)
+    
+    errors = sorted(errors + validation_errors + result["errors"], key=lambda error: error["index"])
+    return {
+        "status": "success" if not errors else ("partial" if result["inserted"] else "failed"),
+        "received": len(rows),
+        "inserted": result["inserted"],
+        "failed": len(errors),
+        "duplicates": duplicates,
+        "errors": errors
+    }
+
 @router.get("", response_model=list[TransactionResponse])
 async def list_transactions(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     category: str = Query(None),
     type: str = Query(None),
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; takes precedence over skip"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List user transactions with filtering"""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+    """List user transactions with filtering, paginated by offset or by keyset cursor"""
+    query = select(Transaction).where(Transaction.user_id == current_user.id)
     
     if category:
-        query = query.filter(Transaction.category == category)
+        query = query.where(Transaction.category == category)
     if type:
-        query = query.filter(Transaction.type == type)
+        query = query.where(Transaction.type == type)
     if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
+        query = query.where(Transaction.transaction_date >= start_date)
     if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
+        query = query.where(Transaction.transaction_date <= end_date)
+    
+    query = apply_keyset(query, Transaction.transaction_date, Transaction.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
     
-    transactions = query.order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(query.limit(limit))
+    transactions = result.scalars().all()
+    set_next_cursor(response, transactions, limit, "transaction_date")
     return transactions
 
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    category: Optional[TransactionCategory] = Query(None),
+    type: Optional[TransactionType] = Query(None),
+    start_date: datetime = Query(None),
+    end_date: datetime = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the user's full transaction history as CSV or NDJSON, oldest first
+    
+    Rows come from a server-side cursor in fixed-size batches, so memory use does not
+    grow with the history. The stream uses its own session, which outlives the request handler.
+    """
+    query = export_query(
+        current_user.id,
+        category=category.value if category else None,
+        type=type.value if type else None,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+    async def body():
+        async with AsyncSessionLocal() as db:
+            async for chunk in stream_export(db, query, format):
+                yield chunk
+    
+    filename = f"transactions-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get transaction by ID"""
-    transaction = db.query(Transaction).filter(
-        (Transaction.id == transaction_id) & (Transaction.user_id == current_user.id)
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
-    
-    return transaction
+    return await _get_user_transaction(db, transaction_id, current_user.id)
 
 @router.put("/{transaction_id}", response_model=TransactionResponse)
 async def update_transaction(
     transaction_id: int,
     transaction_update: TransactionUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update transaction"""
-    transaction = db.query(Transaction).filter(
-        (Transaction.id == transaction_id) & (Transaction.user_id == current_user.id)
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
+    transaction = await _get_user_transaction(db, transaction_id, current_user.id)
+    before = MonthlyRollup.snapshot(transaction)
     
     update_data = transaction_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(transaction, field, value)
     
     db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
+    await db.flush()
+    await db.run_sync(lambda session: TransactionEvents(session).updated(before, transaction))
+    await db.commit()
+    await db.refresh(transaction)
     
     return transaction
 
@@ -109,36 +246,29 @@ async def update_transaction(
 async def delete_transaction(
     transaction_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete transaction"""
-    transaction = db.query(Transaction).filter(
-        (Transaction.id == transaction_id) & (Transaction.user_id == current_user.id)
-    ).first()
+    transaction = await _get_user_transaction(db, transaction_id, current_user.id)
+    before = MonthlyRollup.snapshot(transaction)
     
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
-    
-    db.delete(transaction)
-    db.commit()
+    await db.delete(transaction)
+    await db.flush()
+    await db.run_sync(lambda session: TransactionEvents(session).removed(before))
+    await db.commit()
 
 @router.get("/stats/summary", response_model=dict)
 async def get_transaction_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get transaction summary"""
-    transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-    
-    total_income = sum(t.amount for t in transactions if t.type == "income")
-    total_expense = sum(t.amount for t in transactions if t.type == "expense")
+    user_id = current_user.id
+    totals = await db.run_sync(lambda session: TransactionAggregates(session).totals_by_type(user_id))
     
     return {
-        "total_income": total_income,
-        "total_expense": total_expense,
-        "net_balance": total_income - total_expense,
-        "transaction_count": len(transactions)
+        "total_income": totals["income"],
+        "total_expense": totals["expense"],
+        "net_balance": totals["income"] - totals["expense"],
+        "transaction_count": totals["transaction_count"]
     }
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import decode_token
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from fastapi.security import HTTPBearer
@@ -12,8 +13,16 @@ router = APIRouter()
 security = HTTPBearer()
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
-    """Get current authenticated user"""
+    """Get current authenticated user
+    
+    Verified tokens are served from the user cache without a query; FastAPI's
+    per-request dependency cache means each request resolves the user at most once.
+    """
     token = credentials.credentials
+    snapshot = user_cache.get(token)
+    if snapshot is not None:
+        return user_cache.attach(db, snapshot)
+    
     payload = decode_token(token)
     
     if not payload:
@@ -31,6 +40,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="User not found"
         )
     
+    user_cache.put(token, user, payload.get("exp"))
     return user
 
 @router.get("/me", response_model=UserResponse)
@@ -66,6 +76,7 @@ async def update_user_profile(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    user_cache.invalidate_user(current_user.id)
     
     return current_user
 
@@ -77,3 +88,4 @@ async def delete_user_account(
     """Delete user account"""
     db.delete(current_user)
     db.commit()
+    user_cache.invalidate_user(current_user.id)
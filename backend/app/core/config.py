@@ -13,6 +13,51 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./fincoach.db"
+    # Async driver URL; derived from DATABASE_URL (aiosqlite / asyncpg) when left empty
+    ASYNC_DATABASE_URL: str = ""
+    
+    # Password hashing pool: concurrent bcrypt hashes, and how many more may wait
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 4
+    PASSWORD_HASH_MAX_QUEUED: int = 64
+    
+    # Authenticated-user cache (per process); 0 disables it
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Compiled per-user categorization rules kept per process
+    CATEGORY_RULE_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Learned categorizer artifact (python -m app.ml_modules.text_classifier train); empty disables it
+    CATEGORY_MODEL_PATH: str = ""
+    CATEGORY_MODEL_MIN_CONFIDENCE: float = 0.8
+    
+    # Bulk import
+    BULK_IMPORT_MAX_ROWS: int = 200000
+    BULK_INSERT_CHUNK_SIZE: int = 5000
+    # Uploads are spooled to disk and imported in chunks, so this bounds disk, not memory;
+    # multi-year statements run to hundreds of MB. Operators should size it to their spool volume.
+    STATEMENT_IMPORT_MAX_BYTES: int = 1024 * 1024 * 1024
+    SMS_IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    
+    # WebSocket notification fan-out across workers: "memory" (single process) or "database"
+    NOTIFICATION_BACKPLANE: str = "memory"
+    NOTIFICATION_POLL_INTERVAL_SECONDS: float = 0.2
+    NOTIFICATION_EVENT_RETENTION_SECONDS: int = 300
+    
+    # Streaming export: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 2000
+    
+    # Recurring series re-detection for categories new expenses did not extend
+    RECURRING_REFRESH_INTERVAL_SECONDS: float = 30.0
+    RECURRING_REFRESH_BATCH_SIZE: int = 500
+    
+    # Post-commit anomaly stage: live alerts for new expenses
+    ANOMALY_STAGE_ENABLED: bool = True
+    ANOMALY_STAGE_BATCH_SIZE: int = 1000
+    ANOMALY_ALERT_MAX_AGE_DAYS: int = 7
+    ANOMALY_Z_THRESHOLD: float = 2.0
+    ANOMALY_ALERTS_PER_BATCH: int = 5
+    ANOMALY_STAGE_DRAIN_TIMEOUT_SECONDS: float = 5.0
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -25,7 +70,7 @@ class Settings(BaseSettings):
     
     # JWT
     JWT_SECRET_KEY: str = "your-jwt-secret-key"
-    
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,6 +1,7 @@
 """Database configuration and session management"""
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
 
 # Create engine
@@ -15,6 +16,33 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite for SQLite, asyncpg for PostgreSQL)"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    
+    scheme, _, rest = database_url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return database_url
+
+# Create async engine for async routes, so DB round-trips don't block the event loop.
+# aiosqlite runs on SQLAlchemy's NullPool, which takes no sizing options.
+async_database_url = get_async_database_url(settings.DATABASE_URL)
+async_pool_options = {} if async_database_url.startswith("sqlite") else {"pool_size": 10, "max_overflow": 20}
+async_engine = create_async_engine(
+    async_database_url,
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    **async_pool_options
+)
+
+# Create async session factory; objects stay usable after commit for response serialization
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -25,3 +53,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,6 +1,9 @@
 """Security utilities for authentication and authorization"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -16,6 +19,88 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHashPoolBusy(RuntimeError):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHashPool:
+    """Run bcrypt off the event loop on a bounded thread pool
+    
+    bcrypt releases the GIL while hashing, so threads give real parallelism here.
+    At most ``max_in_flight`` hashes run at once and at most ``max_queued`` wait;
+    beyond that callers get PasswordHashPoolBusy instead of piling up.
+    """
+
+    def __init__(self, max_in_flight: int, max_queued: int):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="password-hash")
+
+    async def run(self, func: Callable, *args):
+        """Run a hashing function in the pool and await its result"""
+        with self._lock:
+            if self.queued >= self.max_queued:
+                self.rejected += 1
+                raise PasswordHashPoolBusy("Too many password hashing requests in progress")
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        
+        # [started, abandoned]: settled under the lock so exactly one side leaves the queue count
+        state = [False, False]
+        try:
+            future = self._executor.submit(self._call, func, args, state)
+            return await asyncio.wrap_future(future)
+        finally:
+            with self._lock:
+                if not state[0]:
+                    # Cancelled (e.g. client disconnected) before a thread picked it up; skip the hash
+                    state[1] = True
+                    self.queued -= 1
+
+    def _call(self, func: Callable, args: tuple, state: list):
+        with self._lock:
+            if state[1]:
+                return None
+            state[0] = True
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict:
+        """Get queue depth and throughput counters"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_MAX_IN_FLIGHT, settings.PASSWORD_HASH_MAX_QUEUED)
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hashing pool"""
+    return await password_hash_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
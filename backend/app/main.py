@@ -4,9 +4,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
-from app.api import auth, users, transactions, jars, goals, alerts, agents, ml_modules, analytics, mobile, notifications, social, advanced_analytics, predictive_insights, multi_agent_system, intelligent_recommendations, pattern_recognition
+from app.api import auth, users, transactions, jars, goals, alerts, agents, ml_modules, analytics, mobile, notifications, social, advanced_analytics, predictive_insights, multi_agent_system, intelligent_recommendations, pattern_recognition, imports
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, async_engine, Base
+from app.core.user_cache import user_cache
+from app.core.security import password_hash_pool
+from app.services.anomaly_stage import anomaly_stage
+from app.services.category_rules import compiled_rule_cache
+from app.services.recurring_series import recurring_refresher
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -15,9 +20,16 @@ Base.metadata.create_all(bind=engine)
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 FINCoach AI Backend Starting...")
+    await notifications.manager.start()
+    recurring_refresher.start()
     yield
     # Shutdown
     print("🛑 FINCoach AI Backend Shutting Down...")
+    await anomaly_stage.stop()
+    await recurring_refresher.stop()
+    await notifications.manager.stop()
+    await async_engine.dispose()
+    password_hash_pool.shutdown()
 
 app = FastAPI(
     title="FINCoach AI Backend",
@@ -33,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers - Core Features
@@ -55,6 +68,7 @@ app.include_router(multi_agent_system.router, tags=["Multi-Agent System"])
 # Include routers - New Features (Phase 2)
 app.include_router(analytics.router, tags=["Analytics"])
 app.include_router(mobile.router, tags=["Mobile Integration"])
+app.include_router(imports.router, tags=["Statement Import"])
 app.include_router(notifications.router, tags=["Real-time Notifications"])
 app.include_router(social.router, tags=["Social Features"])
 
@@ -68,7 +82,13 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "FINCoach AI Backend",
-        "version": "1.3.0"
+        "version": "1.3.0",
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "anomaly_stage": anomaly_stage.stats(),
+        "category_rules": compiled_rule_cache.stats(),
+        "recurring_refresh": recurring_refresher.stats(),
+        "notifications": notifications.manager.backplane.stats()
     }
 
 @app.get("/")
@@ -0,0 +1,116 @@
+"""Initial schema: users, transactions, jars, goals, alerts
+
+Existing databases created by ``Base.metadata.create_all`` already match this
+revision; mark them with ``alembic stamp 0001`` before running ``upgrade``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=True),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("phone", sa.String(20), nullable=True),
+        sa.Column("monthly_income", sa.Float(), nullable=True),
+        sa.Column("monthly_budget", sa.Float(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("type", sa.Enum("INCOME", "EXPENSE", name="transactiontype"), nullable=False),
+        sa.Column(
+            "category",
+            sa.Enum(
+                "FOOD", "TRANSPORT", "UTILITIES", "ENTERTAINMENT", "SHOPPING", "HEALTH",
+                "EDUCATION", "SALARY", "INVESTMENT", "SAVINGS", "OTHER",
+                name="transactioncategory"
+            ),
+            nullable=False
+        ),
+        sa.Column("description", sa.String(500), nullable=True),
+        sa.Column("transaction_date", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+    op.create_index("ix_transactions_user_id", "transactions", ["user_id"])
+
+    op.create_table(
+        "jars",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("description", sa.String(500), nullable=True),
+        sa.Column("target_amount", sa.Float(), nullable=False),
+        sa.Column("current_amount", sa.Float(), nullable=True),
+        sa.Column("priority", sa.Enum("LOW", "MEDIUM", "HIGH", name="jarpriority"), nullable=True),
+        sa.Column("color", sa.String(7), nullable=True),
+        sa.Column("is_active", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_jars_id", "jars", ["id"])
+    op.create_index("ix_jars_user_id", "jars", ["user_id"])
+
+    op.create_table(
+        "goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("description", sa.String(500), nullable=True),
+        sa.Column("target_amount", sa.Float(), nullable=False),
+        sa.Column("current_amount", sa.Float(), nullable=True),
+        sa.Column("deadline", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.Enum("ACTIVE", "COMPLETED", "ABANDONED", name="goalstatus"), nullable=True),
+        sa.Column("category", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_goals_id", "goals", ["id"])
+    op.create_index("ix_goals_user_id", "goals", ["user_id"])
+
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("message", sa.String(500), nullable=False),
+        sa.Column("severity", sa.Enum("INFO", "WARNING", "CRITICAL", "ERROR", name="alertseverity"), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_alerts_id", "alerts", ["id"])
+    op.create_index("ix_alerts_user_id", "alerts", ["user_id"])
+
+def downgrade() -> None:
+    op.drop_table("alerts")
+    op.drop_table("goals")
+    op.drop_table("jars")
+    op.drop_table("transactions")
+    op.drop_table("users")
+    for enum_name in ("alertseverity", "goalstatus", "jarpriority", "transactioncategory", "transactiontype"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
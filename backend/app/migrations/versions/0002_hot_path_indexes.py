@@ -0,0 +1,40 @@
+"""Composite indexes for the (user_id, type, transaction_date) hot path and unread alerts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_user_type_date",
+        "transactions",
+        ["user_id", "type", "transaction_date"],
+        postgresql_include=["category", "amount"]
+    )
+    op.create_index(
+        "ix_transactions_user_date_id",
+        "transactions",
+        ["user_id", "transaction_date", "id"]
+    )
+    op.create_index("ix_alerts_user_created", "alerts", ["user_id", "created_at"])
+    op.create_index(
+        "ix_alerts_user_unread",
+        "alerts",
+        ["user_id", "created_at"],
+        postgresql_where=sa.text("is_read = false"),
+        sqlite_where=sa.text("is_read = 0")
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_alerts_user_unread", table_name="alerts")
+    op.drop_index("ix_alerts_user_created", table_name="alerts")
+    op.drop_index("ix_transactions_user_date_id", table_name="transactions")
+    op.drop_index("ix_transactions_user_type_date", table_name="transactions")
@@ -0,0 +1,46 @@
+"""Per-user monthly rollup table
+
+Populate it for existing data with ``python -m app.services.monthly_rollup rebuild``.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "user_monthly_rollup",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("type", postgresql.ENUM(name="transactiontype", create_type=False).with_variant(
+            sa.Enum("INCOME", "EXPENSE", name="transactiontype"), "sqlite"
+        ), nullable=False),
+        sa.Column("category", postgresql.ENUM(name="transactioncategory", create_type=False).with_variant(
+            sa.Enum(
+                "FOOD", "TRANSPORT", "UTILITIES", "ENTERTAINMENT", "SHOPPING", "HEALTH",
+                "EDUCATION", "SALARY", "INVESTMENT", "SAVINGS", "OTHER",
+                name="transactioncategory"
+            ),
+            "sqlite"
+        ), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("min_amount", sa.Float(), nullable=True),
+        sa.Column("max_amount", sa.Float(), nullable=True),
+        sa.Column("sum_of_squares", sa.Float(), nullable=False),
+        sa.UniqueConstraint("user_id", "month", "type", "category", name="uq_user_monthly_rollup_key"),
+    )
+    op.create_index("ix_user_monthly_rollup_id", "user_monthly_rollup", ["id"])
+    op.create_index("ix_user_monthly_rollup_user_id", "user_monthly_rollup", ["user_id"])
+
+def downgrade() -> None:
+    op.drop_table("user_monthly_rollup")
@@ -0,0 +1,27 @@
+"""Client idempotency keys on transactions for retry-safe offline sync
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("idempotency_key", sa.String(length=64), nullable=True))
+    op.create_index(
+        "uq_transactions_user_idempotency_key",
+        "transactions",
+        ["user_id", "idempotency_key"],
+        unique=True
+    )
+
+def downgrade() -> None:
+    op.drop_index("uq_transactions_user_idempotency_key", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch_op:
+        batch_op.drop_column("idempotency_key")
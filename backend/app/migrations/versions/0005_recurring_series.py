@@ -0,0 +1,47 @@
+"""Persistent index of detected recurring expense series
+
+Populate it for existing data with ``python -m app.services.recurring_series rebuild``.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_series",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category", postgresql.ENUM(name="transactioncategory", create_type=False).with_variant(
+            sa.Enum(
+                "FOOD", "TRANSPORT", "UTILITIES", "ENTERTAINMENT", "SHOPPING", "HEALTH",
+                "EDUCATION", "SALARY", "INVESTMENT", "SAVINGS", "OTHER",
+                name="transactioncategory"
+            ),
+            "sqlite"
+        ), nullable=False),
+        sa.Column("cadence", sa.String(length=16), nullable=False),
+        sa.Column("interval_days", sa.Float(), nullable=False),
+        sa.Column("typical_amount", sa.Float(), nullable=False),
+        sa.Column("amount_min", sa.Float(), nullable=False),
+        sa.Column("amount_max", sa.Float(), nullable=False),
+        sa.Column("occurrences", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.DateTime(), nullable=False),
+        sa.Column("last_seen", sa.DateTime(), nullable=False),
+        sa.Column("next_expected_date", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_recurring_series_id", "recurring_series", ["id"])
+    op.create_index("ix_recurring_series_user_id", "recurring_series", ["user_id"])
+    op.create_index("ix_recurring_series_user_next", "recurring_series", ["user_id", "next_expected_date"])
+
+def downgrade() -> None:
+    op.drop_table("recurring_series")
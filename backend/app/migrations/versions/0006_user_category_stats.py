@@ -0,0 +1,41 @@
+"""Running per-user, per-category expense statistics for O(1) anomaly scoring
+
+Populate it for existing data with ``python -m app.services.category_stats rebuild``.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "user_category_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category", postgresql.ENUM(name="transactioncategory", create_type=False).with_variant(
+            sa.Enum(
+                "FOOD", "TRANSPORT", "UTILITIES", "ENTERTAINMENT", "SHOPPING", "HEALTH",
+                "EDUCATION", "SALARY", "INVESTMENT", "SAVINGS", "OTHER",
+                name="transactioncategory"
+            ),
+            "sqlite"
+        ), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("mean", sa.Float(), nullable=False),
+        sa.Column("m2", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "category", name="uq_user_category_stats_key"),
+    )
+    op.create_index("ix_user_category_stats_id", "user_category_stats", ["id"])
+    op.create_index("ix_user_category_stats_user_id", "user_category_stats", ["user_id"])
+
+def downgrade() -> None:
+    op.drop_table("user_category_stats")
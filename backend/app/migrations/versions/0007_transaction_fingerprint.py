@@ -0,0 +1,24 @@
+"""Duplicate-detection fingerprints on transactions
+
+Populate it for existing data with ``python -m app.services.transaction_fingerprint backfill``.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("fingerprint", sa.String(length=32), nullable=True))
+    op.create_index("ix_transactions_fingerprint", "transactions", ["fingerprint"])
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_fingerprint", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch_op:
+        batch_op.drop_column("fingerprint")
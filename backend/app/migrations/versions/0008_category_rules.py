@@ -0,0 +1,36 @@
+"""Per-user custom categorization rules with a version counter per rule set
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "category_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("keyword", sa.String(length=100), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("user_id", "keyword", name="uq_category_rules_user_keyword"),
+    )
+    op.create_index("ix_category_rules_id", "category_rules", ["id"])
+    op.create_index("ix_category_rules_user_id", "category_rules", ["user_id"])
+    op.create_table(
+        "category_rule_sets",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+def downgrade() -> None:
+    op.drop_table("category_rule_sets")
+    op.drop_table("category_rules")
@@ -0,0 +1,36 @@
+"""Categories whose recurring series are re-detected by the background refresh
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_series_dirty",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("category", postgresql.ENUM(name="transactioncategory", create_type=False).with_variant(
+            sa.Enum(
+                "FOOD", "TRANSPORT", "UTILITIES", "ENTERTAINMENT", "SHOPPING", "HEALTH",
+                "EDUCATION", "SALARY", "INVESTMENT", "SAVINGS", "OTHER",
+                name="transactioncategory"
+            ),
+            "sqlite"
+        ), nullable=False),
+        sa.Column("marked_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", "category", name="uq_recurring_series_dirty_key"),
+    )
+    op.create_index("ix_recurring_series_dirty_id", "recurring_series_dirty", ["id"])
+    op.create_index("ix_recurring_series_dirty_marked_at", "recurring_series_dirty", ["marked_at"])
+
+def downgrade() -> None:
+    op.drop_table("recurring_series_dirty")
@@ -3,6 +3,8 @@ from typing import Dict, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models.transaction import Transaction
+from app.services.category_stats import CategoryStats
+from app.services.transaction_fingerprint import DuplicateIndex
 
 class AnomalyDetector:
     """Machine Learning module for detecting anomalous transactions"""
@@ -11,33 +13,21 @@ class AnomalyDetector:
         self.db = db
     
     def detect_unusual_spending(self, user_id: int, transaction_amount: float, category: str) -> Dict:
-        """Detect if a transaction is unusual for the user"""
-        # Get last 3 months of transactions in same category
-        three_months_ago = datetime.utcnow() - timedelta(days=90)
-        category_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.category == category,
-            Transaction.transaction_date >= three_months_ago
-        ).all()
+        """Detect if a transaction is unusual for the user from running category statistics"""
+        stats = CategoryStats(self.db).score(user_id, category, transaction_amount)
         
-        if len(category_transactions) < 5:
+        if stats is None:
             return {
                 "status": "insufficient_data",
                 "is_anomaly": False,
                 "message": "Need more transaction history"
             }
         
-        # Calculate statistics
-        amounts = [t.amount for t in category_transactions]
-        average = sum(amounts) / len(amounts)
-        
-        # Calculate standard deviation
-        variance = sum((x - average) ** 2 for x in amounts) / len(amounts)
-        std_dev = variance ** 0.5
+        average = stats["mean"]
+        std_dev = stats["std_dev"]
         
         # Check if transaction is more than 2 standard deviations from mean
-        z_score = (transaction_amount - average) / std_dev if std_dev > 0 else 0
+        z_score = stats["z_score"]
         
         is_anomaly = abs(z_score) > 2
         
@@ -151,21 +141,14 @@ class AnomalyDetector:
         }
     
     def detect_duplicate_transactions(self, user_id: int, transaction_amount: float, category: str, description: str) -> Dict:
-        """Detect potential duplicate transactions"""
-        # Get transactions from last 24 hours
-        one_day_ago = datetime.utcnow() - timedelta(hours=24)
-        recent_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.amount == transaction_amount,
-            Transaction.category == category,
-            Transaction.transaction_date >= one_day_ago
-        ).all()
+        """Detect potential duplicate transactions through the fingerprint index"""
+        similar = DuplicateIndex(self.db).find(user_id, transaction_amount, category, description, datetime.utcnow())
         
-        if recent_transactions:
+        if similar:
             return {
                 "status": "success",
                 "is_duplicate": True,
-                "similar_transactions": len(recent_transactions),
+                "similar_transactions": similar,
                 "recommendation": "This transaction appears to be a duplicate. Please verify."
             }
         
@@ -1,5 +1,9 @@
 """Transaction Categorizer - ML module for automatic categorization"""
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.utils.keyword_matcher import KeywordMatcher
+from app.services.category_rules import CategoryRules
 
 class TransactionCategorizer:
     """Machine Learning module for automatic transaction categorization"""
@@ -20,20 +24,58 @@ class TransactionCategorizer:
         "investment": ["investment", "stock", "mutual fund", "crypto", "bitcoin", "ethereum"]
     }
     
+    # Built-in keywords compiled once; per-user rules come from CategoryRules
+    _matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+    
+    def __init__(self, db: Optional[Session] = None, user_id: Optional[int] = None):
+        self.db = db
+        self.user_id = user_id
+        self._user_matcher = CategoryRules(db).matcher(user_id) if db is not None and user_id is not None else None
+    
     def categorize_transaction(self, description: str, amount: float = None) -> Dict:
-        """Categorize a transaction based on description"""
-        description_lower = description.lower()
+        """Categorize a transaction: the user's own rules, then the learned model, then keywords"""
+        return self._categorize(description, self._predict([description]))
+    
+    def batch_categorize(self, transactions: List[Dict]) -> List[Dict]:
+        """Categorize multiple transactions, scoring the learned model once for the whole batch"""
+        descriptions = [transaction.get("description", "") for transaction in transactions]
+        predictions = self._predict(descriptions)
         
-        # Find matching category
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in description_lower:
-                    return {
-                        "status": "success",
-                        "category": category,
-                        "confidence": 0.85,
-                        "matched_keyword": keyword
-                    }
+        results = []
+        for position, transaction in enumerate(transactions):
+            categorization = self._categorize(descriptions[position], predictions, position)
+            categorization["transaction_id"] = transaction.get("id")
+            results.append(categorization)
+        
+        return results
+    
+    @staticmethod
+    def _predict(descriptions: List[str]) -> Optional[Tuple[List[str], List[float]]]:
+        from app.ml_modules.text_classifier import get_text_model
+        model = get_text_model()
+        return model.predict(descriptions) if model is not None else None
+    
+    def _categorize(self, description: str, predictions: Optional[Tuple] = None, position: int = 0) -> Dict:
+        match = self._user_matcher.first(description) if self._user_matcher else None
+        if match is None and predictions is not None:
+            label, confidence = predictions[0][position], float(predictions[1][position])
+            if label != "other" and confidence >= settings.CATEGORY_MODEL_MIN_CONFIDENCE:
+                return {
+                    "status": "success",
+                    "category": label,
+                    "confidence": round(confidence, 4),
+                    "matched_keyword": None
+                }
+        
+        match = match or self._matcher.first(description)
+        if match:
+            category, keyword = match
+            return {
+                "status": "success",
+                "category": category,
+                "confidence": 0.85,
+                "matched_keyword": keyword
+            }
         
         # Default category if no match
         return {
@@ -43,52 +85,40 @@ class TransactionCategorizer:
             "matched_keyword": None
         }
     
-    def batch_categorize(self, transactions: List[Dict]) -> List[Dict]:
-        """Categorize multiple transactions"""
-        results = []
-        for transaction in transactions:
-            description = transaction.get("description", "")
-            amount = transaction.get("amount")
-            
-            categorization = self.categorize_transaction(description, amount)
-            categorization["transaction_id"] = transaction.get("id")
-            results.append(categorization)
-        
-        return results
-    
     def get_category_suggestions(self, description: str) -> List[Dict]:
         """Get multiple category suggestions for a transaction"""
-        description_lower = description.lower()
-        suggestions = []
-        
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            confidence = 0
-            matched_keywords = []
-            
-            for keyword in keywords:
-                if keyword in description_lower:
-                    confidence += 0.1
-                    matched_keywords.append(keyword)
-            
-            if confidence > 0:
-                suggestions.append({
-                    "category": category,
-                    "confidence": min(confidence, 1.0),
-                    "matched_keywords": matched_keywords
-                })
+        suggestions = [
+            {
+                "category": category,
+                "confidence": min(0.1 * len(matched_keywords), 1.0),
+                "matched_keywords": matched_keywords
+            }
+            for category, matched_keywords in self._matches(description).items()
+        ]
         
         # Sort by confidence
         suggestions.sort(key=lambda x: x["confidence"], reverse=True)
         
         return suggestions[:3]  # Return top 3 suggestions
     
+    def _matches(self, description: str) -> Dict[str, List[str]]:
+        matched = self._user_matcher.matches(description) if self._user_matcher else {}
+        for category, keywords in self._matcher.matches(description).items():
+            matched.setdefault(category, []).extend(k for k in keywords if k not in matched[category])
+        return matched
+    
     def add_custom_category_rule(self, keyword: str, category: str) -> Dict:
-        """Add custom categorization rule"""
-        if category not in self.CATEGORY_KEYWORDS:
-            self.CATEGORY_KEYWORDS[category] = []
+        """Add a custom categorization rule for this categorizer's user"""
+        if self.db is None or self.user_id is None:
+            return {
+                "status": "error",
+                "message": "Custom rules are stored per user and need a database session"
+            }
         
-        if keyword not in self.CATEGORY_KEYWORDS[category]:
-            self.CATEGORY_KEYWORDS[category].append(keyword.lower())
+        rules = CategoryRules(self.db)
+        rules.add(self.user_id, keyword, category)
+        self.db.commit()
+        self._user_matcher = rules.matcher(self.user_id)
         
         return {
             "status": "success",
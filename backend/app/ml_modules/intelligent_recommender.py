@@ -2,9 +2,13 @@
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.models.transaction import Transaction
+from app.core.config import settings
+from app.models.transaction import Transaction, TransactionType
 from app.models.goal import Goal
+from app.services.transaction_window import TransactionWindow
+import heapq
 import statistics
+import time
 
 class IntelligentRecommender:
     """Machine Learning module for generating intelligent financial recommendations"""
@@ -13,54 +17,77 @@ class IntelligentRecommender:
         self.db = db
     
     def get_personalized_recommendations(self, user_id: int) -> Dict:
-        """Generate personalized recommendations based on user's financial patterns"""
+        """Generate personalized recommendations based on user's financial patterns
+        
+        All analyses share one 90-day transaction fetch and one goals fetch. With
+        DEBUG enabled the response also carries per-stage timings in milliseconds.
+        """
+        timings = {}
+        stage_start = time.perf_counter()
+        
+        def mark(stage: str) -> None:
+            nonlocal stage_start
+            now = time.perf_counter()
+            timings[stage] = round((now - stage_start) * 1000, 3)
+            stage_start = now
+        
+        now = datetime.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
+        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        previous_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+        
+        # 90 days always covers the previous calendar month as well
+        window = TransactionWindow(self.db, user_id, transaction_type=None)
+        transactions = window.between(now - timedelta(days=90))
+        goals = self.db.query(Goal).filter(Goal.user_id == user_id).all()
+        mark("fetch")
+        
+        expenses_90d = [t for t in transactions if t.type == TransactionType.EXPENSE]
+        recent_30d = window.between(thirty_days_ago)
+        expenses_30d = [t for t in recent_30d if t.type == TransactionType.EXPENSE]
+        current_month = [t for t in window.between(current_month_start) if t.type == TransactionType.EXPENSE]
+        previous_month = [t for t in window.between(previous_month_start, current_month_start) if t.type == TransactionType.EXPENSE]
+        mark("slice")
+        
         recommendations = []
         
         # Analyze spending patterns
-        spending_analysis = self._analyze_spending_patterns(user_id)
-        if spending_analysis:
-            recommendations.extend(spending_analysis)
+        recommendations.extend(self._analyze_spending_patterns(expenses_30d))
+        mark("spending_patterns")
         
         # Analyze savings potential
-        savings_analysis = self._analyze_savings_potential(user_id)
-        if savings_analysis:
-            recommendations.extend(savings_analysis)
+        recommendations.extend(self._analyze_savings_potential(expenses_90d))
+        mark("savings_potential")
         
         # Analyze category trends
-        category_analysis = self._analyze_category_trends(user_id)
-        if category_analysis:
-            recommendations.extend(category_analysis)
+        recommendations.extend(self._analyze_category_trends(current_month, previous_month))
+        mark("category_trends")
         
         # Analyze goal progress
-        goal_analysis = self._analyze_goal_progress(user_id)
-        if goal_analysis:
-            recommendations.extend(goal_analysis)
+        recommendations.extend(self._analyze_goal_progress(goals))
+        mark("goal_progress")
         
         # Analyze budget efficiency
-        budget_analysis = self._analyze_budget_efficiency(user_id)
-        if budget_analysis:
-            recommendations.extend(budget_analysis)
+        recommendations.extend(self._analyze_budget_efficiency(recent_30d))
+        mark("budget_efficiency")
         
-        # Sort by priority score
-        recommendations.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+        # Top 10 by priority score without sorting every candidate
+        top_recommendations = heapq.nlargest(10, recommendations, key=lambda x: x.get('priority_score', 0))
+        mark("rank")
         
-        return {
+        result = {
             "status": "success",
             "total_recommendations": len(recommendations),
-            "recommendations": recommendations[:10],  # Top 10 recommendations
+            "recommendations": top_recommendations,
             "generated_at": datetime.utcnow().isoformat()
         }
+        if settings.DEBUG:
+            result["timings_ms"] = timings
+        return result
     
-    def _analyze_spending_patterns(self, user_id: int) -> List[Dict]:
-        """Analyze spending patterns and generate recommendations"""
+    def _analyze_spending_patterns(self, recent_transactions: List) -> List[Dict]:
+        """Analyze the last 30 days of expenses and generate recommendations"""
         recommendations = []
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        
-        recent_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= thirty_days_ago
-        ).all()
         
         if not recent_transactions:
             return recommendations
@@ -104,16 +131,9 @@ class IntelligentRecommender:
         
         return recommendations
     
-    def _analyze_savings_potential(self, user_id: int) -> List[Dict]:
-        """Analyze potential savings opportunities"""
+    def _analyze_savings_potential(self, transactions: List) -> List[Dict]:
+        """Analyze the last 90 days of expenses for savings opportunities"""
         recommendations = []
-        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= ninety_days_ago
-        ).all()
         
         if not transactions:
             return recommendations
@@ -140,7 +160,7 @@ class IntelligentRecommender:
             })
         
         # Check for subscription services
-        subscription_transactions = [t for t in transactions if 'subscription' in t.description.lower() or 'subscription' in t.category.lower()]
+        subscription_transactions = [t for t in transactions if 'subscription' in (t.description or '').lower() or 'subscription' in t.category.lower()]
         if subscription_transactions:
             subscription_total = sum(t.amount for t in subscription_transactions)
             recommendations.append({
@@ -154,27 +174,10 @@ class IntelligentRecommender:
         
         return recommendations
     
-    def _analyze_category_trends(self, user_id: int) -> List[Dict]:
-        """Analyze trends in spending categories"""
+    def _analyze_category_trends(self, current_month_transactions: List, previous_month_transactions: List) -> List[Dict]:
+        """Compare this month's expenses by category against the previous month"""
         recommendations = []
         
-        # Compare last month vs previous month
-        current_month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        previous_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-        
-        current_month_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= current_month_start
-        ).all()
-        
-        previous_month_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= previous_month_start,
-            Transaction.transaction_date < current_month_start
-        ).all()
-        
         if not previous_month_transactions:
             return recommendations
         
@@ -205,12 +208,10 @@ class IntelligentRecommender:
         
         return recommendations
     
-    def _analyze_goal_progress(self, user_id: int) -> List[Dict]:
+    def _analyze_goal_progress(self, goals: List[Goal]) -> List[Dict]:
         """Analyze financial goal progress and provide recommendations"""
         recommendations = []
         
-        goals = self.db.query(Goal).filter(Goal.user_id == user_id).all()
-        
         for goal in goals:
             if goal.status == "active":
                 progress_pct = (goal.current_amount / goal.target_amount * 100) if goal.target_amount > 0 else 0
@@ -219,34 +220,28 @@ class IntelligentRecommender:
                     recommendations.append({
                         "type": "goal_acceleration",
                         "goal_id": goal.id,
-                        "title": f"Accelerate progress on {goal.name}",
+                        "title": f"Accelerate progress on {goal.title}",
                         "description": f"You're only {progress_pct:.1f}% towards your goal of ${goal.target_amount:.2f}. Consider increasing contributions.",
                         "current_progress": round(progress_pct, 1),
                         "priority_score": 8,
-                        "action": f"Increase contributions to {goal.name}"
+                        "action": f"Increase contributions to {goal.title}"
                     })
                 elif progress_pct > 75:
                     recommendations.append({
                         "type": "goal_milestone",
                         "goal_id": goal.id,
-                        "title": f"You're close to achieving {goal.name}",
+                        "title": f"You're close to achieving {goal.title}",
                         "description": f"You've reached {progress_pct:.1f}% of your goal. Keep up the momentum!",
                         "current_progress": round(progress_pct, 1),
                         "priority_score": 5,
-                        "action": f"Maintain contributions to {goal.name}"
+                        "action": f"Maintain contributions to {goal.title}"
                     })
         
         return recommendations
     
-    def _analyze_budget_efficiency(self, user_id: int) -> List[Dict]:
-        """Analyze budget efficiency and provide recommendations"""
+    def _analyze_budget_efficiency(self, transactions: List) -> List[Dict]:
+        """Analyze the last 30 days of income and expenses for budget efficiency"""
         recommendations = []
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_date >= thirty_days_ago
-        ).all()
         
         if not transactions:
             return recommendations
@@ -1,19 +1,33 @@
 """Pattern Recognition - Advanced ML module for detecting financial patterns and anomalies"""
 from typing import Dict, List, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from app.models.transaction import Transaction
+from app.services.transaction_window import TransactionWindow
+from app.services.recurring_series import RecurringSeriesIndex
 import statistics
+import numpy as np
 from collections import defaultdict
 
 class PatternRecognition:
     """Advanced Machine Learning module for pattern recognition and anomaly detection"""
     
+    # Widest look-back used by any detector
+    WINDOW_DAYS = 90
+    
     def __init__(self, db: Session):
         self.db = db
+        self._windows: Dict[int, TransactionWindow] = {}
+    
+    def _expenses(self, user_id: int, days: int) -> List:
+        """Get the user's expense rows for the last ``days`` days from the shared window"""
+        window = self._windows.get(user_id)
+        if window is None:
+            window = self._windows[user_id] = TransactionWindow(self.db, user_id)
+            window.prefetch(self.WINDOW_DAYS)
+        return window.last_days(days)
     
     def detect_all_patterns(self, user_id: int) -> Dict:
-        """Detect all financial patterns for a user"""
+        """Detect all financial patterns for a user from a single transaction query"""
         patterns = {
             "spending_patterns": self._detect_spending_patterns(user_id),
             "temporal_patterns": self._detect_temporal_patterns(user_id),
@@ -31,13 +45,7 @@ class PatternRecognition:
     
     def _detect_spending_patterns(self, user_id: int) -> Dict:
         """Detect spending patterns across categories and time"""
-        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= ninety_days_ago
-        ).all()
+        transactions = self._expenses(user_id, 90)
         
         if not transactions:
             return {"status": "insufficient_data"}
@@ -75,13 +83,7 @@ class PatternRecognition:
     
     def _detect_temporal_patterns(self, user_id: int) -> Dict:
         """Detect temporal patterns (day of week, time of day, etc.)"""
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= thirty_days_ago
-        ).all()
+        transactions = self._expenses(user_id, 30)
         
         if not transactions:
             return {"status": "insufficient_data"}
@@ -130,13 +132,7 @@ class PatternRecognition:
     
     def _detect_behavioral_patterns(self, user_id: int) -> Dict:
         """Detect behavioral patterns in spending"""
-        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= ninety_days_ago
-        ).all()
+        transactions = self._expenses(user_id, 90)
         
         if not transactions:
             return {"status": "insufficient_data"}
@@ -165,8 +161,17 @@ class PatternRecognition:
                 "recommendation": "Monitor large purchases for budget impact"
             })
         
-        # Recurring transaction pattern
-        recurring_patterns = self._detect_recurring_transactions(transactions)
+        # Recurring transaction pattern, read from the maintained recurring series index
+        recurring_patterns = [
+            {
+                "category": series.category,
+                "amount": series.typical_amount,
+                "frequency": series.cadence,
+                "occurrences": series.occurrences,
+                "next_expected_date": series.next_expected_date.isoformat()
+            }
+            for series in RecurringSeriesIndex(self.db).series(user_id)
+        ]
         if recurring_patterns:
             behaviors.append({
                 "behavior": "recurring_transactions",
@@ -194,13 +199,7 @@ class PatternRecognition:
     
     def _detect_advanced_anomalies(self, user_id: int) -> Dict:
         """Detect advanced anomalies using statistical methods"""
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= thirty_days_ago
-        ).all()
+        transactions = self._expenses(user_id, 30)
         
         if not transactions:
             return {"status": "insufficient_data"}
@@ -230,27 +229,21 @@ class PatternRecognition:
                         "description": f"Transaction amount ${t.amount:.2f} is significantly higher than typical"
                     })
         
-        # Duplicate detection
-        transaction_signatures = defaultdict(list)
+        # Duplicate detection: fingerprints (amount, category, description, day) seen more than once
+        duplicate_groups = defaultdict(list)
         for t in transactions:
-            sig = (t.category, round(t.amount, 2))
-            transaction_signatures[sig].append(t)
-        
-        for sig, trans_list in transaction_signatures.items():
-            if len(trans_list) > 2:
-                # Check if they're close in time
-                dates = sorted([t.transaction_date for t in trans_list])
-                for i in range(len(dates) - 1):
-                    if (dates[i+1] - dates[i]).days <= 1:
-                        anomalies.append({
-                            "anomaly_type": "potential_duplicate",
-                            "severity": "medium",
-                            "category": sig[0],
-                            "amount": sig[1],
-                            "count": len(trans_list),
-                            "description": f"Multiple similar transactions detected"
-                        })
-                        break
+            if t.fingerprint:
+                duplicate_groups[(t.fingerprint, t.category)].append(t.amount)
+        for (_, category), group_amounts in duplicate_groups.items():
+            if len(group_amounts) > 1:
+                anomalies.append({
+                    "anomaly_type": "potential_duplicate",
+                    "severity": "medium",
+                    "category": category,
+                    "amount": round(min(group_amounts), 2),
+                    "count": len(group_amounts),
+                    "description": f"Multiple similar transactions detected"
+                })
         
         return {
             "status": "success",
@@ -260,43 +253,45 @@ class PatternRecognition:
     
     def _detect_spending_correlations(self, user_id: int) -> Dict:
         """Detect correlations between spending categories"""
-        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        
-        transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= ninety_days_ago
-        ).all()
+        transactions = self._expenses(user_id, 90)
         
         if not transactions:
             return {"status": "insufficient_data"}
         
-        # Group by week
-        weekly_spending = defaultdict(lambda: defaultdict(float))
-        for t in transactions:
-            week_key = t.transaction_date.isocalendar()[1]
-            weekly_spending[week_key][t.category] += t.amount
+        # Category x week spending matrix; weeks keyed by (ISO year, ISO week)
+        transaction_weeks = [tuple(t.transaction_date.isocalendar()[:2]) for t in transactions]
+        categories = sorted({t.category for t in transactions})
+        weeks = sorted(set(transaction_weeks))
+        category_index = {category: i for i, category in enumerate(categories)}
+        week_index = {week: i for i, week in enumerate(weeks)}
+        
+        weekly_spending = np.zeros((len(categories), len(weeks)))
+        np.add.at(
+            weekly_spending,
+            (
+                np.fromiter((category_index[t.category] for t in transactions), dtype=np.intp, count=len(transactions)),
+                np.fromiter((week_index[week] for week in transaction_weeks), dtype=np.intp, count=len(transactions))
+            ),
+            np.fromiter((t.amount for t in transactions), dtype=float, count=len(transactions))
+        )
         
         correlations = []
-        categories = set(t.category for t in transactions)
-        
-        # Simple correlation detection
-        for cat1 in categories:
-            for cat2 in categories:
-                if cat1 < cat2:  # Avoid duplicates
-                    cat1_values = [weekly_spending[week].get(cat1, 0) for week in weekly_spending]
-                    cat2_values = [weekly_spending[week].get(cat2, 0) for week in weekly_spending]
-                    
-                    if len(cat1_values) > 2 and sum(cat1_values) > 0 and sum(cat2_values) > 0:
-                        correlation = self._calculate_correlation(cat1_values, cat2_values)
-                        if abs(correlation) > 0.6:
-                            correlations.append({
-                                "category_1": cat1,
-                                "category_2": cat2,
-                                "correlation_coefficient": round(correlation, 2),
-                                "relationship": "positive" if correlation > 0 else "negative",
-                                "strength": "strong" if abs(correlation) > 0.8 else "moderate"
-                            })
+        if len(categories) >= 2 and len(weeks) > 2:
+            # All pairwise Pearson coefficients at once; constant rows yield NaN, treated as 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = np.nan_to_num(np.corrcoef(weekly_spending), nan=0.0)
+            
+            first, second = np.triu_indices(len(categories), k=1)
+            coefficients = matrix[first, second]
+            strong = np.abs(coefficients) > 0.6
+            for i, j, correlation in zip(first[strong], second[strong], coefficients[strong]):
+                correlations.append({
+                    "category_1": categories[i],
+                    "category_2": categories[j],
+                    "correlation_coefficient": round(float(correlation), 2),
+                    "relationship": "positive" if correlation > 0 else "negative",
+                    "strength": "strong" if abs(correlation) > 0.8 else "moderate"
+                })
         
         return {
             "status": "success",
@@ -323,57 +318,3 @@ class PatternRecognition:
         coefficient_of_variation = (std_dev / avg) * 100
         consistency = max(0, 100 - coefficient_of_variation)
         return round(min(100, consistency), 1)
-    
-    @staticmethod
-    def _detect_recurring_transactions(transactions: List) -> List[Dict]:
-        """Detect recurring transaction patterns"""
-        recurring = defaultdict(list)
-        
-        for t in transactions:
-            sig = (t.category, round(t.amount, 2))
-            recurring[sig].append(t.transaction_date)
-        
-        patterns = []
-        for sig, dates in recurring.items():
-            if len(dates) >= 3:
-                sorted_dates = sorted(dates)
-                intervals = [(sorted_dates[i+1] - sorted_dates[i]).days for i in range(len(sorted_dates)-1)]
-                
-                if intervals:
-                    avg_interval = statistics.mean(intervals)
-                    if 25 <= avg_interval <= 35:  # Monthly pattern
-                        patterns.append({
-                            "category": sig[0],
-                            "amount": sig[1],
-                            "frequency": "monthly",
-                            "occurrences": len(dates)
-                        })
-                    elif 5 <= avg_interval <= 8:  # Weekly pattern
-                        patterns.append({
-                            "category": sig[0],
-                            "amount": sig[1],
-                            "frequency": "weekly",
-                            "occurrences": len(dates)
-                        })
-        
-        return patterns
-    
-    @staticmethod
-    def _calculate_correlation(x: List[float], y: List[float]) -> float:
-        """Calculate Pearson correlation coefficient"""
-        if len(x) != len(y) or len(x) < 2:
-            return 0
-        
-        mean_x = statistics.mean(x)
-        mean_y = statistics.mean(y)
-        
-        numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(len(x)))
-        denominator = (
-            (sum((xi - mean_x) ** 2 for xi in x) ** 0.5) *
-            (sum((yi - mean_y) ** 2 for yi in y) ** 0.5)
-        )
-        
-        if denominator == 0:
-            return 0
-        
-        return numerator / denominator
@@ -2,7 +2,7 @@
 from typing import Dict, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.models.transaction import Transaction
+from app.services.monthly_rollup import MonthlyRollup
 
 class PredictionEngine:
     """Machine Learning engine for financial predictions"""
@@ -12,27 +12,15 @@ class PredictionEngine:
     
     def predict_next_month_spending(self, user_id: int) -> Dict:
         """Predict next month's spending using historical data"""
-        # Get last 6 months of data
+        # Get last 6 months of monthly totals from the rollup table
         six_months_ago = datetime.utcnow() - timedelta(days=180)
-        historical_data = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.transaction_date >= six_months_ago
-        ).all()
+        monthly_data = MonthlyRollup(self.db).monthly_totals(user_id, "expense", since=six_months_ago)
         
-        if len(historical_data) < 20:
+        if sum(month["count"] for month in monthly_data) < 20:
             return {"status": "insufficient_data", "message": "Need at least 6 months of data"}
         
-        # Calculate monthly totals
-        monthly_data = {}
-        for transaction in historical_data:
-            month_key = transaction.transaction_date.strftime("%Y-%m")
-            if month_key not in monthly_data:
-                monthly_data[month_key] = 0
-            monthly_data[month_key] += transaction.amount
-        
         # Simple exponential smoothing
-        values = sorted(monthly_data.values())
+        values = sorted(month["total"] for month in monthly_data)
         alpha = 0.3  # Smoothing factor
         
         if len(values) < 2:
@@ -53,47 +41,35 @@ class PredictionEngine:
     def predict_category_spending(self, user_id: int, category: str) -> Dict:
         """Predict spending for a specific category"""
         three_months_ago = datetime.utcnow() - timedelta(days=90)
-        category_expenses = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.category == category,
-            Transaction.transaction_date >= three_months_ago
-        ).all()
+        try:
+            monthly_data = MonthlyRollup(self.db).monthly_totals(
+                user_id, "expense", since=three_months_ago, category=category
+            )
+        except ValueError:
+            monthly_data = []
         
-        if not category_expenses:
+        if not monthly_data:
             return {"status": "no_data", "category": category}
         
-        total = sum(t.amount for t in category_expenses)
+        total = sum(month["total"] for month in monthly_data)
         average = total / 3
         
         return {
             "status": "success",
             "category": category,
             "predicted_monthly_spending": round(average, 2),
-            "transaction_count": len(category_expenses)
+            "transaction_count": sum(month["count"] for month in monthly_data)
         }
     
     def predict_income_trend(self, user_id: int) -> Dict:
         """Predict income trend"""
         three_months_ago = datetime.utcnow() - timedelta(days=90)
-        income_transactions = self.db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == "income",
-            Transaction.transaction_date >= three_months_ago
-        ).all()
+        monthly_income = MonthlyRollup(self.db).monthly_totals(user_id, "income", since=three_months_ago)
         
-        if not income_transactions:
+        if not monthly_income:
             return {"status": "no_data"}
         
-        # Calculate monthly income
-        monthly_income = {}
-        for transaction in income_transactions:
-            month_key = transaction.transaction_date.strftime("%Y-%m")
-            if month_key not in monthly_income:
-                monthly_income[month_key] = 0
-            monthly_income[month_key] += transaction.amount
-        
-        values = sorted(monthly_income.values())
+        values = sorted(month["total"] for month in monthly_income)
         average = sum(values) / len(values)
         
         # Detect trend
@@ -0,0 +1,180 @@
+"""Learned transaction categorizer: hashed character n-grams and a linear classifier
+
+The model is trained offline from users' labeled transactions and saved as a
+joblib artifact; each process loads it once (``CATEGORY_MODEL_PATH``) and scores
+whole batches as one sparse matrix product. When no artifact is configured the
+keyword categorizer works exactly as before.
+
+Usage:
+    python -m app.ml_modules.text_classifier train --output models/category.joblib
+    python -m app.ml_modules.text_classifier benchmark [--size 50000]
+"""
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+class TextCategoryModel:
+    """Character n-gram hashing vectorizer feeding a logistic-loss SGD classifier"""
+
+    def __init__(self, n_features: int = 2 ** 18):
+        # Stateless vectorizer: nothing to fit, and unseen merchants still share n-grams
+        self.vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=(2, 4),
+            n_features=n_features,
+            alternate_sign=False,
+            lowercase=True
+        )
+        self.classifier = SGDClassifier(loss="log_loss", alpha=1e-6, max_iter=20, tol=None, random_state=0)
+
+    def fit(self, descriptions: Sequence[str], labels: Sequence[str]) -> "TextCategoryModel":
+        self.classifier.fit(self.vectorizer.transform(descriptions), labels)
+        return self
+
+    def predict(self, descriptions: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """Get the most likely label and its probability for every description in one pass"""
+        if not descriptions:
+            return [], np.zeros(0)
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform([d or "" for d in descriptions]))
+        best = probabilities.argmax(axis=1)
+        return self.classifier.classes_[best].tolist(), probabilities[np.arange(len(best)), best]
+
+    def save(self, path: str) -> None:
+        import joblib
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "TextCategoryModel":
+        import joblib
+        return joblib.load(path)
+
+_model: Optional[TextCategoryModel] = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+def get_text_model() -> Optional[TextCategoryModel]:
+    """Load the configured model artifact once per process; None when none is configured or found"""
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                path = settings.CATEGORY_MODEL_PATH
+                if path and os.path.exists(path):
+                    _model = TextCategoryModel.load(path)
+                _model_loaded = True
+    return _model
+
+def load_training_data(db: Session) -> Tuple[List[str], List[str]]:
+    """Collect (description, category) pairs from users' labeled transactions"""
+    from app.models.transaction import Transaction
+    
+    descriptions, labels = [], []
+    query = db.query(Transaction.description, Transaction.category).filter(
+        Transaction.description.isnot(None),
+        Transaction.description != ""
+    )
+    for description, category in query.yield_per(5000):
+        descriptions.append(description)
+        labels.append(category.value)
+    return descriptions, labels
+
+def synthetic_corpus(size: int, seed: int = 0) -> Tuple[List[str], List[str]]:
+    """Labeled bank-statement style descriptions with merchant typos and reference noise"""
+    rng = np.random.default_rng(seed)
+    merchants = {
+        "food": ["swiggy", "zomato", "dominos pizza", "starbucks", "burger king", "fresh grocery mart", "cafe coffee day", "bakery"],
+        "transport": ["uber trip", "ola cabs", "indian oil fuel", "metro card recharge", "parking charges", "fastag toll", "rapido"],
+        "utilities": ["electricity board", "airtel broadband", "jio recharge", "water bill", "gas cylinder", "bescom"],
+        "entertainment": ["netflix", "spotify", "bookmyshow", "pvr cinemas", "steam games", "hotstar"],
+        "shopping": ["amazon", "flipkart", "myntra", "reliance trends", "dmart", "ikea"],
+        "health": ["apollo pharmacy", "city hospital", "dental clinic", "cult fitness", "medplus", "diagnostics lab"],
+        "education": ["udemy course", "coursera", "school fees", "college tuition", "kindle books"],
+        "investment": ["zerodha", "groww mutual fund", "sip investment", "coinbase crypto", "smallcase"],
+    }
+    prefixes = ["", "pos ", "upi/", "upi-", "neft ", "card txn ", "ach d- "]
+    descriptions, labels = [], []
+    categories = list(merchants)
+    for _ in range(size):
+        category = categories[rng.integers(len(categories))]
+        name = merchants[category][rng.integers(len(merchants[category]))]
+        if rng.random() < 0.3 and len(name) > 4:
+            # Drop one character, as statement truncation and typos do
+            cut = int(rng.integers(1, len(name) - 1))
+            name = name[:cut] + name[cut + 1:]
+        reference = str(rng.integers(10 ** 5, 10 ** 9))
+        descriptions.append(f"{prefixes[rng.integers(len(prefixes))]}{name} {reference}".upper())
+        labels.append(category)
+    return descriptions, labels
+
+def benchmark(size: int) -> None:
+    """Report accuracy and throughput of the model against the categorizer's keyword matcher on a synthetic corpus"""
+    import time
+    from app.ml_modules.categorizer import TransactionCategorizer
+    
+    descriptions, labels = synthetic_corpus(size)
+    split = int(size * 0.8)
+    start = time.perf_counter()
+    model = TextCategoryModel().fit(descriptions[:split], labels[:split])
+    train_seconds = time.perf_counter() - start
+    
+    test_descriptions, test_labels = descriptions[split:], labels[split:]
+    start = time.perf_counter()
+    predicted, _ = model.predict(test_descriptions)
+    model_seconds = time.perf_counter() - start
+    
+    # The keyword path the model replaces, without user rules or a configured model
+    keyword_matcher = TransactionCategorizer._matcher
+    start = time.perf_counter()
+    matches = [keyword_matcher.first(d) for d in test_descriptions]
+    keyword_seconds = time.perf_counter() - start
+    # The keyword table still says "transportation" for the transport category
+    keyword_predicted = [
+        "transport" if match and match[0] == "transportation" else (match[0] if match else "other")
+        for match in matches
+    ]
+
+    def accuracy(values):
+        return sum(p == t for p, t in zip(values, test_labels)) / len(test_labels)
+    
+    n = len(test_descriptions)
+    print(f"train: {split} rows in {train_seconds:.2f}s")
+    print(f"model:   accuracy {accuracy(predicted):.3f}, {n / model_seconds * 60 / 1e6:.2f}M descriptions/min")
+    print(f"keyword: accuracy {accuracy(keyword_predicted):.3f}, {n / keyword_seconds * 60 / 1e6:.2f}M descriptions/min")
+
+def main() -> None:
+    """Command-line entry point for offline training and benchmarking"""
+    import argparse
+    from app.core.database import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Train or benchmark the learned transaction categorizer")
+    parser.add_argument("command", choices=["train", "benchmark"])
+    parser.add_argument("--output", default=settings.CATEGORY_MODEL_PATH or "models/category_model.joblib")
+    parser.add_argument("--min-examples", type=int, default=100)
+    parser.add_argument("--size", type=int, default=50000)
+    args = parser.parse_args()
+    
+    if args.command == "benchmark":
+        benchmark(args.size)
+        return
+    
+    db = SessionLocal()
+    try:
+        descriptions, labels = load_training_data(db)
+    finally:
+        db.close()
+    
+    if len(descriptions) < args.min_examples or len(set(labels)) < 2:
+        print(f"Not enough labeled transactions to train ({len(descriptions)} rows, {len(set(labels))} categories)")
+        raise SystemExit(1)
+    
+    TextCategoryModel().fit(descriptions, labels).save(args.output)
+    print(f"Trained on {len(descriptions)} transactions across {len(set(labels))} categories; saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
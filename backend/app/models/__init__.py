@@ -4,5 +4,11 @@ from app.models.transaction import Transaction
 from app.models.jar import Jar
 from app.models.goal import Goal
 from app.models.alert import Alert
+from app.models.rollup import UserMonthlyRollup
+from app.models.recurring import RecurringSeries, RecurringSeriesDirty
+from app.models.category_stats import UserCategoryStats
+from app.models.category_rule import CategoryRule, CategoryRuleSet
+from app.models.import_job import ImportJob
+from app.models.notification_event import NotificationEvent
 
-__all__ = ["User", "Transaction", "Jar", "Goal", "Alert"]
+__all__ = ["User", "Transaction", "Jar", "Goal", "Alert", "UserMonthlyRollup", "RecurringSeries", "RecurringSeriesDirty", "UserCategoryStats", "CategoryRule", "CategoryRuleSet", "ImportJob", "NotificationEvent"]
@@ -1,5 +1,5 @@
 """Alert database model"""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -15,6 +15,16 @@ class AlertSeverity(str, PyEnum):
 class Alert(Base):
     """Alert model for user notifications"""
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_user_created", "user_id", "created_at"),
+        # Partial index: unread badges and unread-only listings only touch unread rows
+        Index(
+            "ix_alerts_user_unread",
+            "user_id", "created_at",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -0,0 +1,35 @@
+"""Per-user custom categorization rule database models"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class CategoryRule(Base):
+    """A user's keyword -> category rule, applied before the built-in keywords"""
+    __tablename__ = "category_rules"
+    __table_args__ = (
+        UniqueConstraint("user_id", "keyword", name="uq_category_rules_user_keyword"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    keyword = Column(String(100), nullable=False)
+    category = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="category_rules")
+    
+    def __repr__(self):
+        return f"<CategoryRule(user_id={self.user_id}, keyword={self.keyword}, category={self.category})>"
+
+class CategoryRuleSet(Base):
+    """Version counter of a user's rules; bumped on every change so workers know to recompile"""
+    __tablename__ = "category_rule_sets"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CategoryRuleSet(user_id={self.user_id}, version={self.version})>"
@@ -0,0 +1,32 @@
+"""Per-user, per-category running expense statistics database model"""
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+from app.models.transaction import TransactionCategory
+
+class UserCategoryStats(Base):
+    """Welford running count/mean/M2 of expense amounts per (user, category)"""
+    __tablename__ = "user_category_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", name="uq_user_category_stats_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)  # Sum of squared deviations from the mean
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="category_stats")
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the amounts seen so far"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return f"<UserCategoryStats(user_id={self.user_id}, category={self.category}, count={self.count}, mean={self.mean})>"
@@ -0,0 +1,36 @@
+"""Statement import job database model"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from enum import Enum as PyEnum
+from app.core.database import Base
+
+class ImportJobStatus(str, PyEnum):
+    """Import job status enum"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ImportJob(Base):
+    """Progress of a background statement import, updated after every committed chunk"""
+    __tablename__ = "import_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    source_format = Column(String(10), nullable=False)
+    status = Column(Enum(ImportJobStatus), nullable=False, default=ImportJobStatus.PENDING)
+    rows_read = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    user = relationship("User", back_populates="import_jobs")
+
+    def __repr__(self):
+        return f"<ImportJob(id={self.id}, user_id={self.user_id}, status={self.status}, rows_read={self.rows_read})>"
@@ -0,0 +1,16 @@
+"""Notification backplane event database model"""
+from sqlalchemy import Column, Integer, Text, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class NotificationEvent(Base):
+    """A notification published to every worker through the database backplane; pruned after a short retention"""
+    __tablename__ = "notification_events"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<NotificationEvent(id={self.id}, user_id={self.user_id})>"
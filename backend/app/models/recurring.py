@@ -0,0 +1,49 @@
+"""Recurring transaction series database model"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+from app.models.transaction import TransactionCategory
+
+class RecurringSeries(Base):
+    """A detected recurring expense (subscription, bill, rent) and when it is next expected"""
+    __tablename__ = "recurring_series"
+    __table_args__ = (
+        # Bill reminders and cash-flow projection: upcoming series per user
+        Index("ix_recurring_series_user_next", "user_id", "next_expected_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    cadence = Column(String(16), nullable=False)  # weekly, biweekly, monthly
+    interval_days = Column(Float, nullable=False)
+    typical_amount = Column(Float, nullable=False)
+    amount_min = Column(Float, nullable=False)
+    amount_max = Column(Float, nullable=False)
+    occurrences = Column(Integer, nullable=False)
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False)
+    next_expected_date = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="recurring_series")
+
+    def __repr__(self):
+        return f"<RecurringSeries(id={self.id}, user_id={self.user_id}, category={self.category}, cadence={self.cadence}, next={self.next_expected_date})>"
+
+class RecurringSeriesDirty(Base):
+    """A (user, category) whose recurring series need re-detecting by the background refresh"""
+    __tablename__ = "recurring_series_dirty"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", name="uq_recurring_series_dirty_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    marked_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<RecurringSeriesDirty(user_id={self.user_id}, category={self.category}, marked_at={self.marked_at})>"
@@ -0,0 +1,29 @@
+"""Per-user monthly rollup database model"""
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.models.transaction import TransactionType, TransactionCategory
+
+class UserMonthlyRollup(Base):
+    """Incrementally maintained monthly aggregates per (user, month, type, category)"""
+    __tablename__ = "user_monthly_rollup"
+    __table_args__ = (
+        UniqueConstraint("user_id", "month", "type", "category", name="uq_user_monthly_rollup_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    month = Column(Date, nullable=False)  # First day of the calendar month
+    type = Column(Enum(TransactionType), nullable=False)
+    category = Column(Enum(TransactionCategory), nullable=False)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    min_amount = Column(Float, nullable=True)
+    max_amount = Column(Float, nullable=True)
+    sum_of_squares = Column(Float, nullable=False, default=0.0)
+    
+    # Relationships
+    user = relationship("User", back_populates="monthly_rollups")
+    
+    def __repr__(self):
+        return f"<UserMonthlyRollup(user_id={self.user_id}, month={self.month}, type={self.type}, category={self.category}, total={self.total_amount})>"
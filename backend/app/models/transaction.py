@@ -1,5 +1,5 @@
 """Transaction database model"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -27,6 +27,21 @@ class TransactionCategory(str, PyEnum):
 class Transaction(Base):
     """Transaction model"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Hot path for agents, ML modules and summaries: user + type + date window.
+        # On PostgreSQL category/amount ride along so aggregates are index-only.
+        Index(
+            "ix_transactions_user_type_date",
+            "user_id", "type", "transaction_date",
+            postgresql_include=["category", "amount"]
+        ),
+        # Date-ordered listings and (transaction_date, id) keyset seeks
+        Index("ix_transactions_user_date_id", "user_id", "transaction_date", "id"),
+        # Client-generated keys make offline sync retries idempotent
+        Index("uq_transactions_user_idempotency_key", "user_id", "idempotency_key", unique=True),
+        # Duplicate probes: user, amount, category, description and day hashed into one key
+        Index("ix_transactions_fingerprint", "fingerprint"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -35,6 +50,8 @@ class Transaction(Base):
     category = Column(Enum(TransactionCategory), nullable=False)
     description = Column(String(500), nullable=True)
     transaction_date = Column(DateTime, nullable=False)
+    idempotency_key = Column(String(64), nullable=True)
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
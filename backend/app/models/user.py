@@ -26,6 +26,11 @@ class User(Base):
     jars = relationship("Jar", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    monthly_rollups = relationship("UserMonthlyRollup", back_populates="user", cascade="all, delete-orphan")
+    recurring_series = relationship("RecurringSeries", back_populates="user", cascade="all, delete-orphan")
+    category_stats = relationship("UserCategoryStats", back_populates="user", cascade="all, delete-orphan")
+    category_rules = relationship("CategoryRule", back_populates="user", cascade="all, delete-orphan")
+    import_jobs = relationship("ImportJob", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
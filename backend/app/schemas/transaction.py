@@ -1,5 +1,5 @@
 """Transaction Pydantic schemas"""
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -29,7 +29,7 @@ class TransactionBase(BaseModel):
     transaction_date: datetime
 
 class TransactionCreate(TransactionBase):
-    pass
+    idempotency_key: Optional[str] = Field(None, max_length=64)
 
 class TransactionUpdate(BaseModel):
     amount: Optional[float] = None
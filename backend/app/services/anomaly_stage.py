@@ -0,0 +1,270 @@
+"""Post-commit streaming anomaly stage for newly written transactions
+
+Write paths hand committed expenses to ``anomaly_stage.submit``; a background
+worker on the event loop drains them in batches, scores each one (z-score
+against the running category statistics, fingerprint duplicates, and a month-to-date
+spending spike), stores an Alert when a threshold trips and pushes it to the
+user's open WebSocket connections. Nothing here runs on the request path.
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.alert import Alert, AlertSeverity
+from app.models.category_stats import UserCategoryStats
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.services.category_stats import MIN_OBSERVATIONS, remove
+from app.services.monthly_rollup import MonthlyRollup
+from app.services.transaction_fingerprint import DuplicateIndex, candidate_fingerprints
+
+logger = logging.getLogger(__name__)
+
+SPIKE_ALERT_TITLE = "Spending spike this month"
+
+# (user_id, transaction_date, type, category, amount, description): a rollup snapshot plus the description
+StagedTransaction = Tuple[int, datetime, str, str, float, Optional[str]]
+
+def staged(transaction: Transaction) -> StagedTransaction:
+    return MonthlyRollup.snapshot(transaction) + (transaction.description,)
+
+class AnomalyScorer:
+    """Score a batch of new expenses with a few grouped queries per user and create alerts"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def score_batch(self, items: List[StagedTransaction]) -> List[Alert]:
+        """Create (but do not commit) alerts for the anomalous transactions in a batch"""
+        by_user: Dict[int, List[StagedTransaction]] = {}
+        for item in items:
+            by_user.setdefault(item[0], []).append(item)
+        
+        alerts = []
+        for user_id, user_items in by_user.items():
+            user_alerts = self._unusual_amounts(user_id, user_items) + self._duplicates(user_id, user_items)
+            user_alerts = user_alerts[:settings.ANOMALY_ALERTS_PER_BATCH]
+            spike = self._spike(user_id, user_items)
+            if spike is not None:
+                user_alerts.append(spike)
+            alerts.extend(user_alerts)
+        
+        self.db.add_all(alerts)
+        return alerts
+
+    def _unusual_amounts(self, user_id: int, items: List[StagedTransaction]) -> List[Alert]:
+        """Flag amounts far from the category mean, leaving the transaction itself out of the statistics"""
+        categories = {TransactionCategory(getattr(s[3], "value", s[3])) for s in items}
+        stats = {
+            row.category: (row.count, row.mean, row.m2)
+            for row in self.db.query(UserCategoryStats).filter(
+                UserCategoryStats.user_id == user_id,
+                UserCategoryStats.category.in_(categories)
+            )
+        }
+        
+        alerts = []
+        for _, _, _, category, amount, _ in items:
+            category = TransactionCategory(getattr(category, "value", category))
+            if category not in stats:
+                continue
+            count, mean, m2 = remove(stats[category], float(amount))
+            if count < MIN_OBSERVATIONS or m2 <= 0:
+                continue
+            z_score = (float(amount) - mean) / (m2 / count) ** 0.5
+            if z_score > settings.ANOMALY_Z_THRESHOLD:
+                alerts.append(Alert(
+                    user_id=user_id,
+                    title=f"Unusual {category.value} expense",
+                    message=f"${float(amount):.2f} is {z_score:.1f} standard deviations above your usual {category.value} spend of ${mean:.2f}.",
+                    severity=AlertSeverity.CRITICAL if z_score > 3 else AlertSeverity.WARNING
+                ))
+        return alerts
+
+    def _duplicates(self, user_id: int, items: List[StagedTransaction]) -> List[Alert]:
+        """Flag expenses whose fingerprint matches another transaction within 24 hours"""
+        candidates = [
+            candidate_fingerprints(user_id, amount, category, description, transaction_date)
+            for _, transaction_date, _, category, amount, description in items
+        ]
+        duplicates = DuplicateIndex(self.db)
+        found = duplicates.existing(fingerprint for fingerprints in candidates for fingerprint in fingerprints)
+        
+        alerts, reported = [], set()
+        for item, fingerprints in zip(items, candidates):
+            _, transaction_date, _, category, amount, _ = item
+            if fingerprints[1] in reported:
+                continue
+            # The transaction itself is stored too, so a duplicate means at least two matches
+            matches = duplicates.count_within(found, fingerprints, transaction_date)
+            if matches >= 2:
+                reported.add(fingerprints[1])
+                category = TransactionCategory(getattr(category, "value", category))
+                alerts.append(Alert(
+                    user_id=user_id,
+                    title="Possible duplicate transaction",
+                    message=f"{matches} {category.value} expenses of ${float(amount):.2f} within 24 hours. Please verify.",
+                    severity=AlertSeverity.WARNING
+                ))
+        return alerts
+
+    def _spike(self, user_id: int, items: List[StagedTransaction]) -> Optional[Alert]:
+        """Flag month-to-date spending over 120% of the average of up to three previous months, once per month"""
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if not any(s[1] >= month_start for s in items):
+            return None
+        
+        since = month_start
+        for _ in range(3):
+            since = (since - timedelta(days=1)).replace(day=1)
+        totals = {row["month"]: row["total"] for row in MonthlyRollup(self.db).monthly_totals(user_id, "expense", since=since)}
+        current = totals.pop(month_start.date(), 0.0)
+        if not totals:
+            return None
+        
+        historical_average = sum(totals.values()) / len(totals)
+        if historical_average <= 0 or current <= historical_average * 1.2:
+            return None
+        
+        already_alerted = self.db.query(Alert.id).filter(
+            Alert.user_id == user_id,
+            Alert.title == SPIKE_ALERT_TITLE,
+            Alert.created_at >= month_start
+        ).first()
+        if already_alerted:
+            return None
+        
+        increase = (current - historical_average) / historical_average * 100
+        return Alert(
+            user_id=user_id,
+            title=SPIKE_ALERT_TITLE,
+            message=f"You've spent ${current:.2f} so far this month, {increase:.0f}% above your recent monthly average of ${historical_average:.2f}.",
+            severity=AlertSeverity.WARNING
+        )
+
+class AnomalyStage:
+    """Queue committed transactions and score them in batches on a background task"""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.processed = 0
+        self.alerts_created = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, items: Iterable[StagedTransaction]) -> None:
+        """Queue committed transactions for scoring; must be called on the event loop
+        
+        Only recent expenses are scored, so importing old statements does not raise live alerts.
+        """
+        if not settings.ANOMALY_STAGE_ENABLED:
+            return
+        
+        cutoff = datetime.utcnow() - timedelta(days=settings.ANOMALY_ALERT_MAX_AGE_DAYS)
+        items = [
+            s for s in items
+            if TransactionType(getattr(s[2], "value", s[2])) == TransactionType.EXPENSE and s[1] >= cutoff
+        ]
+        if not items:
+            return
+        
+        self._ensure_worker()
+        for item in items:
+            self._queue.put_nowait(item)
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A queue belongs to one event loop; carry anything still pending over to the new one
+            pending = []
+            while self._queue is not None and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+            for item in pending:
+                self._queue.put_nowait(item)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        from app.api.notifications import manager
+        
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                notifications = await run_in_threadpool(self._process, batch)
+                for user_id, message in notifications:
+                    try:
+                        await manager.broadcast_to_user(user_id, message)
+                    except Exception as e:
+                        logger.error(f"Anomaly stage could not deliver an alert to user {user_id}: {e}")
+            except Exception as e:
+                logger.error(f"Anomaly stage error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process(self, batch: List[StagedTransaction]) -> List[Tuple[int, Dict]]:
+        db = SessionLocal()
+        try:
+            alerts = AnomalyScorer(db).score_batch(batch)
+            db.commit()
+            self.processed += len(batch)
+            self.alerts_created += len(alerts)
+            return [
+                (alert.user_id, {
+                    "type": "alert",
+                    "alert": {
+                        "id": alert.id,
+                        "title": alert.title,
+                        "message": alert.message,
+                        "severity": alert.severity.value,
+                        "created_at": alert.created_at.isoformat()
+                    }
+                })
+                for alert in alerts
+            ]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def drain(self) -> None:
+        """Wait until everything queued so far has been scored and its alerts delivered"""
+        if self._worker is not None and not self._worker.done() and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Give queued transactions up to ANOMALY_STAGE_DRAIN_TIMEOUT_SECONDS to be scored, then stop the worker"""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), settings.ANOMALY_STAGE_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Anomaly stage stopped with {self._queue.qsize()} transactions still queued")
+        
+        worker, self._worker = self._worker, None
+        worker.cancel()
+        if self._loop is asyncio.get_running_loop():
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "processed": self.processed,
+            "alerts_created": self.alerts_created
+        }
+
+anomaly_stage = AnomalyStage(settings.ANOMALY_STAGE_BATCH_SIZE)
@@ -0,0 +1,256 @@
+"""Bulk transaction ingestion: one-pass validation and chunked multi-row inserts
+
+Rows are validated together through a Pydantic TypeAdapter, then written in
+chunks with a single executemany (multi-row INSERT) per chunk, or COPY on
+PostgreSQL. Each chunk commits on its own together with its derived-table updates; a
+chunk the database rejects is retried row by row, so only the offending rows fail.
+"""
+import csv
+import io
+import json
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.schemas.transaction import TransactionCreate
+from app.services.transaction_events import TransactionEvents
+from app.services.transaction_fingerprint import transaction_fingerprint
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Columns written by the bulk path, in COPY order
+COPY_COLUMNS = (
+    "user_id", "amount", "type", "category", "description",
+    "transaction_date", "idempotency_key", "fingerprint", "created_at", "updated_at"
+)
+
+_transaction_list_adapter = TypeAdapter(List[TransactionCreate])
+
+# (row index in the payload, validated transaction)
+IndexedTransaction = Tuple[int, TransactionCreate]
+
+def row_error(index: int, messages: Sequence[str]) -> Dict:
+    """Build the per-row error entry returned to clients"""
+    return {"index": index, "errors": list(messages)}
+
+def parse_bulk_payload(body: bytes, content_type: str = "") -> Tuple[List, List[Dict]]:
+    """Decode a JSON array or NDJSON body into raw rows plus per-line decode errors
+    
+    Undecodable NDJSON lines are reported but keep their index, so row indices
+    always match record positions in the payload.
+    """
+    if content_type.split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        rows, errors = [], []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                errors.append(row_error(len(rows), [f"Invalid JSON: {e}"]))
+                rows.append(None)
+        return rows, errors
+    
+    try:
+        rows = json.loads(body)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON body: {e}")
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array of transactions or an NDJSON body")
+    return rows, []
+
+def validate_transaction_rows(rows: List, skip: Iterable[int] = ()) -> Tuple[List[IndexedTransaction], List[Dict]]:
+    """Validate raw rows in one TypeAdapter pass and split them into valid rows and errors"""
+    skipped = set(skip)
+    candidates = [(index, row) for index, row in enumerate(rows) if index not in skipped]
+    
+    try:
+        validated = _transaction_list_adapter.validate_python([row for _, row in candidates])
+        return [(index, item) for (index, _), item in zip(candidates, validated)], []
+    except ValidationError as e:
+        failures: Dict[int, List[str]] = {}
+        for error in e.errors():
+            position, *field = error["loc"]
+            location = ".".join(str(part) for part in field)
+            failures.setdefault(position, []).append(f"{location}: {error['msg']}" if location else error["msg"])
+    
+    # Only the failing positions are known; revalidate the rest in a second single pass
+    good = [candidate for position, candidate in enumerate(candidates) if position not in failures]
+    validated = _transaction_list_adapter.validate_python([row for _, row in good])
+    errors = [row_error(candidates[position][0], messages) for position, messages in sorted(failures.items())]
+    return [(index, item) for (index, _), item in zip(good, validated)], errors
+
+class TransactionBulkWriter:
+    """Write validated transactions in committed chunks and keep derived tables in step"""
+
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        # Snapshot plus description of every committed row, for the post-commit anomaly stage
+        self.committed: List[Tuple] = []
+
+    def write(self, user_id: int, transactions: Sequence[IndexedTransaction]) -> Dict:
+        """Insert transactions chunk by chunk; returns counts and per-row errors for rejected rows
+        
+        A chunk the database rejects is retried one row at a time, so only the offending
+        rows (e.g. a repeated idempotency key) are reported and the rest are still inserted.
+        """
+        inserted, errors = 0, []
+        for offset in range(0, len(transactions), self.chunk_size):
+            chunk = transactions[offset:offset + self.chunk_size]
+            try:
+                self._commit_chunk(user_id, chunk)
+                inserted += len(chunk)
+                continue
+            except SQLAlchemyError:
+                self.db.rollback()
+            
+            for index, transaction in chunk:
+                try:
+                    self._commit_chunk(user_id, [(index, transaction)])
+                    inserted += 1
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    errors.append(row_error(index, [str(getattr(e, "orig", None) or e)]))
+        
+        return {"inserted": inserted, "errors": errors}
+
+    def _commit_chunk(self, user_id: int, chunk: Sequence[IndexedTransaction]) -> None:
+        """Insert one chunk, update the derived tables and commit"""
+        rows = [self._row(user_id, transaction) for _, transaction in chunk]
+        self._insert(rows)
+        snapshots = [
+            (row["user_id"], row["transaction_date"], row["type"], row["category"], row["amount"])
+            for row in rows
+        ]
+        TransactionEvents(self.db).added_many(snapshots)
+        self.db.commit()
+        self.committed.extend(
+            snapshot + (row["description"],) for snapshot, row in zip(snapshots, rows)
+        )
+
+    def write_idempotent(self, user_id: int, transactions: Sequence[IndexedTransaction]) -> Dict:
+        """Insert transactions, skipping idempotency keys the user has already synced
+        
+        Each chunk is one batched ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` plus,
+        only when some keys were already present, one lookup of their existing IDs. Rows
+        without a key get a server-generated one. Returns ``{"results", "errors"}``: one
+        result per written row, ``{"index", "idempotency_key", "id", "status"}`` with status
+        ``created`` or ``duplicate``, and per-row errors for chunks that failed.
+        """
+        table = Transaction.__table__
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        results, errors = [], []
+        
+        for offset in range(0, len(transactions), self.chunk_size):
+            chunk = transactions[offset:offset + self.chunk_size]
+            rows: Dict[str, Dict] = {}
+            indices: Dict[str, List[int]] = {}
+            for index, transaction in chunk:
+                row = self._row(user_id, transaction)
+                row["idempotency_key"] = row["idempotency_key"] or uuid.uuid4().hex
+                rows.setdefault(row["idempotency_key"], row)
+                indices.setdefault(row["idempotency_key"], []).append(index)
+            
+            try:
+                stmt = insert(table).on_conflict_do_nothing(
+                    index_elements=["user_id", "idempotency_key"]
+                ).returning(table.c.id, table.c.idempotency_key)
+                created = {key: transaction_id for transaction_id, key in self.db.execute(stmt, list(rows.values()))}
+                
+                seen = {}
+                missing = [key for key in rows if key not in created]
+                if missing:
+                    seen = dict(self.db.query(Transaction.idempotency_key, Transaction.id).filter(
+                        Transaction.user_id == user_id,
+                        Transaction.idempotency_key.in_(missing)
+                    ).all())
+                
+                new_rows = [row for key, row in rows.items() if key in created]
+                snapshots = [
+                    (row["user_id"], row["transaction_date"], row["type"], row["category"], row["amount"])
+                    for row in new_rows
+                ]
+                TransactionEvents(self.db).added_many(snapshots)
+                self.db.commit()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                message = str(getattr(e, "orig", None) or e)
+                errors.extend(row_error(index, [message]) for index, _ in chunk)
+                continue
+            
+            self.committed.extend(
+                snapshot + (row["description"],) for snapshot, row in zip(snapshots, new_rows)
+            )
+            for key, positions in indices.items():
+                for position, index in enumerate(positions):
+                    is_new = key in created and position == 0
+                    results.append({
+                        "index": index,
+                        "idempotency_key": key,
+                        "id": created[key] if key in created else seen.get(key),
+                        "status": "created" if is_new else "duplicate"
+                    })
+        
+        return {"results": sorted(results, key=lambda result: result["index"]), "errors": errors}
+
+    @staticmethod
+    def _row(user_id: int, transaction: TransactionCreate) -> Dict:
+        now = datetime.utcnow()
+        return {
+            "user_id": user_id,
+            "amount": transaction.amount,
+            "type": TransactionType(transaction.type.value),
+            "category": TransactionCategory(transaction.category.value),
+            "description": transaction.description,
+            "transaction_date": transaction.transaction_date,
+            "idempotency_key": transaction.idempotency_key,
+            "fingerprint": transaction_fingerprint(
+                user_id, transaction.amount, transaction.category,
+                transaction.description, transaction.transaction_date
+            ),
+            "created_at": now,
+            "updated_at": now
+        }
+
+    def _insert(self, rows: List[Dict]) -> None:
+        """Insert one chunk with COPY on PostgreSQL, otherwise a single executemany"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            self._copy(rows)
+        else:
+            self.db.execute(Transaction.__table__.insert(), rows)
+
+    def _copy(self, rows: List[Dict]) -> None:
+        """Stream a chunk through COPY using whichever driver backs the session"""
+        records = [
+            tuple(
+                row[column].name if column in ("type", "category") else row[column]
+                for column in COPY_COLUMNS
+            )
+            for row in rows
+        ]
+        driver_connection = self.db.connection().connection.driver_connection
+        
+        if hasattr(driver_connection, "copy_records_to_table"):
+            # asyncpg, reached through AsyncSession.run_sync's greenlet
+            from sqlalchemy.util import await_only
+            await_only(driver_connection.copy_records_to_table(
+                Transaction.__tablename__, records=records, columns=list(COPY_COLUMNS)
+            ))
+            return
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerow(["\\N" if value is None else value for value in record])
+        buffer.seek(0)
+        with driver_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {Transaction.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
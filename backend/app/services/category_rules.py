@@ -0,0 +1,121 @@
+"""Per-user custom categorization rules and their compiled matchers
+
+Rules live in category_rules; every change bumps the user's version in
+category_rule_sets in the same transaction. Each worker keeps compiled
+KeywordMatchers in a per-process LRU keyed by user and recompiles only when the
+stored version differs from the cached one, so all workers converge on the same
+rules while categorization itself never rebuilds anything.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.category_rule import CategoryRule, CategoryRuleSet
+from app.models.transaction import TransactionCategory
+from app.utils.keyword_matcher import KeywordMatcher, tokenize
+
+class CompiledRuleCache:
+    """Per-process LRU of user id -> (rule-set version, compiled matcher)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[int, KeywordMatcher]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, version: int) -> Optional[KeywordMatcher]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id: int, version: int, matcher: KeywordMatcher) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, matcher)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+compiled_rule_cache = CompiledRuleCache(settings.CATEGORY_RULE_CACHE_MAX_ENTRIES)
+
+class CategoryRules:
+    """Maintain a user's custom rules and hand out their compiled matcher"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def version(self, user_id: int) -> int:
+        """Current rule-set version of a user; 0 when they never had rules"""
+        version = self.db.query(CategoryRuleSet.version).filter(CategoryRuleSet.user_id == user_id).scalar()
+        return version or 0
+
+    def list(self, user_id: int) -> List[CategoryRule]:
+        return self.db.query(CategoryRule).filter(CategoryRule.user_id == user_id).order_by(CategoryRule.id).all()
+
+    def add(self, user_id: int, keyword: str, category: str) -> CategoryRule:
+        """Create or re-point a rule and bump the version; the caller commits"""
+        keyword = " ".join(tokenize(keyword))
+        if not keyword:
+            raise ValueError("Keyword must contain letters or digits")
+        # Raises ValueError for anything that is not a transaction category
+        category = TransactionCategory(getattr(category, "value", category).lower()).value
+        
+        rule = self.db.query(CategoryRule).filter(
+            CategoryRule.user_id == user_id,
+            CategoryRule.keyword == keyword
+        ).first()
+        if rule is None:
+            rule = CategoryRule(user_id=user_id, keyword=keyword, category=category)
+            self.db.add(rule)
+        else:
+            rule.category = category
+        self._bump(user_id)
+        return rule
+
+    def remove(self, user_id: int, rule_id: int) -> bool:
+        """Delete a rule and bump the version; the caller commits"""
+        deleted = self.db.query(CategoryRule).filter(
+            CategoryRule.user_id == user_id,
+            CategoryRule.id == rule_id
+        ).delete(synchronize_session=False)
+        if deleted:
+            self._bump(user_id)
+        return bool(deleted)
+
+    def _bump(self, user_id: int) -> None:
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        self.db.execute(
+            insert(CategoryRuleSet.__table__).on_conflict_do_nothing(index_elements=["user_id"]),
+            {"user_id": user_id, "version": 0}
+        )
+        self.db.execute(
+            update(CategoryRuleSet).where(CategoryRuleSet.user_id == user_id).values(version=CategoryRuleSet.version + 1)
+        )
+
+    def matcher(self, user_id: int) -> Optional[KeywordMatcher]:
+        """Get the compiled matcher of a user's rules, recompiling only after a version change"""
+        # Read the version before the rules: a concurrent change can only make the cache look stale
+        version = self.version(user_id)
+        if version == 0:
+            return None
+        
+        matcher = compiled_rule_cache.get(user_id, version)
+        if matcher is None:
+            table: Dict[str, List[str]] = {}
+            for rule in self.list(user_id):
+                table.setdefault(rule.category, []).append(rule.keyword)
+            matcher = KeywordMatcher(table)
+            compiled_rule_cache.put(user_id, version, matcher)
+        return matcher
@@ -0,0 +1,222 @@
+"""Running per-(user, category) expense statistics for O(1) anomaly scoring
+
+Every transaction write folds the expense amount into a Welford count/mean/M2
+row (batches are merged with Chan's parallel update, removals are the exact
+inverse), so scoring a new amount is a single-row lookup instead of a scan.
+
+Usage:
+    python -m app.services.category_stats rebuild [--user-id ID]
+    python -m app.services.category_stats check [--user-id ID]
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.models.category_stats import UserCategoryStats
+from app.services.monthly_rollup import TransactionSnapshot
+
+# Fewer observations than this are not enough to call anything unusual
+MIN_OBSERVATIONS = 5
+
+def welford(amounts: Iterable[float]) -> Tuple[int, float, float]:
+    """Compute (count, mean, M2) of amounts in one pass"""
+    count, mean, m2 = 0, 0.0, 0.0
+    for amount in amounts:
+        count += 1
+        delta = amount - mean
+        mean += delta / count
+        m2 += delta * (amount - mean)
+    return count, mean, m2
+
+def merge(a: Tuple[int, float, float], b: Tuple[int, float, float]) -> Tuple[int, float, float]:
+    """Combine two (count, mean, M2) summaries (Chan et al.)"""
+    count_a, mean_a, m2_a = a
+    count_b, mean_b, m2_b = b
+    count = count_a + count_b
+    if count == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return count, mean_a + delta * count_b / count, m2_a + m2_b + delta * delta * count_a * count_b / count
+
+def remove(stats: Tuple[int, float, float], amount: float) -> Tuple[int, float, float]:
+    """Take one amount back out of a (count, mean, M2) summary"""
+    count, mean, m2 = stats
+    if count <= 1:
+        return 0, 0.0, 0.0
+    new_mean = (count * mean - amount) / (count - 1)
+    return count - 1, new_mean, max(0.0, m2 - (amount - mean) * (amount - new_mean))
+
+class CategoryStats:
+    """Maintain and query the user_category_stats table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _expense_key(snapshot: TransactionSnapshot) -> Optional[Tuple[int, TransactionCategory]]:
+        user_id, _, transaction_type, category, _ = snapshot
+        if TransactionType(getattr(transaction_type, "value", transaction_type)) != TransactionType.EXPENSE:
+            return None
+        return user_id, TransactionCategory(getattr(category, "value", category))
+
+    def _lock_rows(self, keys: List[Tuple[int, TransactionCategory]]) -> Dict[Tuple, UserCategoryStats]:
+        """Make sure a stats row exists for every key and load them locked for update"""
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        self.db.execute(
+            insert(UserCategoryStats.__table__).on_conflict_do_nothing(index_elements=["user_id", "category"]),
+            [
+                {"user_id": user_id, "category": category, "count": 0, "mean": 0.0, "m2": 0.0, "updated_at": datetime.utcnow()}
+                for user_id, category in keys
+            ]
+        )
+        
+        rows = {}
+        for user_id in {user_id for user_id, _ in keys}:
+            categories = [category for uid, category in keys if uid == user_id]
+            for row in self.db.query(UserCategoryStats).filter(
+                UserCategoryStats.user_id == user_id,
+                UserCategoryStats.category.in_(categories)
+            ).with_for_update().populate_existing():
+                rows[(row.user_id, row.category)] = row
+        return rows
+
+    def record_added_many(self, snapshots: Iterable[TransactionSnapshot]) -> None:
+        """Fold a batch of new expenses into their (user, category) statistics"""
+        batches: Dict[Tuple, List[float]] = {}
+        for snapshot in snapshots:
+            key = self._expense_key(snapshot)
+            if key is not None:
+                batches.setdefault(key, []).append(float(snapshot[4]))
+        
+        if not batches:
+            return
+        
+        rows = self._lock_rows(list(batches))
+        for key, amounts in batches.items():
+            row = rows[key]
+            row.count, row.mean, row.m2 = merge((row.count, row.mean, row.m2), welford(amounts))
+        self.db.flush()
+
+    def record_removed(self, snapshot: TransactionSnapshot) -> None:
+        """Take a deleted (or pre-update) expense out of its statistics"""
+        key = self._expense_key(snapshot)
+        if key is None:
+            return
+        
+        row = self.db.query(UserCategoryStats).filter(
+            UserCategoryStats.user_id == key[0],
+            UserCategoryStats.category == key[1]
+        ).with_for_update().populate_existing().first()
+        if row:
+            row.count, row.mean, row.m2 = remove((row.count, row.mean, row.m2), float(snapshot[4]))
+            self.db.flush()
+
+    def get(self, user_id: int, category: str) -> Optional[UserCategoryStats]:
+        """Single-row lookup of a user's statistics for one category; None for unknown categories"""
+        try:
+            category = TransactionCategory(getattr(category, "value", category))
+        except ValueError:
+            return None
+        return self.db.query(UserCategoryStats).filter(
+            UserCategoryStats.user_id == user_id,
+            UserCategoryStats.category == category
+        ).first()
+
+    def score(self, user_id: int, category: str, amount: float) -> Optional[Dict]:
+        """Get the z-score of an amount against the category's history; None with too little data"""
+        stats = self.get(user_id, category)
+        if stats is None or stats.count < MIN_OBSERVATIONS:
+            return None
+        
+        std_dev = stats.variance ** 0.5
+        return {
+            "mean": stats.mean,
+            "std_dev": std_dev,
+            "count": stats.count,
+            "z_score": (amount - stats.mean) / std_dev if std_dev > 0 else 0
+        }
+
+    def _batch_stats(self, user_id: Optional[int] = None) -> Dict[Tuple, Tuple[int, float, float]]:
+        """Recompute statistics from raw transactions, streaming rows per (user, category)"""
+        query = self.db.query(Transaction.user_id, Transaction.category, Transaction.amount).filter(
+            Transaction.type == TransactionType.EXPENSE
+        )
+        if user_id is not None:
+            query = query.filter(Transaction.user_id == user_id)
+        
+        stats: Dict[Tuple, Tuple[int, float, float]] = {}
+        for uid, category, amount in query.yield_per(5000):
+            stats[(uid, category)] = merge(stats.get((uid, category), (0, 0.0, 0.0)), (1, amount, 0.0))
+        return stats
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """Backfill or rebuild statistics from raw transactions; returns the number of rows written"""
+        stats = self._batch_stats(user_id)
+        
+        stmt = delete(UserCategoryStats)
+        if user_id is not None:
+            stmt = stmt.where(UserCategoryStats.user_id == user_id)
+        self.db.execute(stmt)
+        
+        if stats:
+            now = datetime.utcnow()
+            self.db.execute(UserCategoryStats.__table__.insert(), [
+                {"user_id": uid, "category": category, "count": count, "mean": mean, "m2": m2, "updated_at": now}
+                for (uid, category), (count, mean, m2) in stats.items()
+            ])
+        self.db.commit()
+        return len(stats)
+
+    def check_consistency(self, user_id: Optional[int] = None, tolerance: float = 1e-6) -> Dict:
+        """Compare the running statistics against a batch computation over raw transactions"""
+        expected = self._batch_stats(user_id)
+        
+        query = self.db.query(UserCategoryStats).filter(UserCategoryStats.count > 0)
+        if user_id is not None:
+            query = query.filter(UserCategoryStats.user_id == user_id)
+        actual = {(r.user_id, r.category): (r.count, r.mean, r.m2) for r in query.all()}
+        
+        mismatches = []
+        for key in expected.keys() | actual.keys():
+            want, have = expected.get(key), actual.get(key)
+            if want is None or have is None or want[0] != have[0] or any(
+                abs(w - h) > tolerance * max(1.0, abs(w)) for w, h in zip(want[1:], have[1:])
+            ):
+                mismatches.append({"key": key, "expected": want, "actual": have})
+        
+        return {
+            "status": "consistent" if not mismatches else "inconsistent",
+            "keys_checked": len(expected),
+            "mismatches": mismatches
+        }
+
+def main() -> None:
+    """Command-line entry point for statistics backfill and equivalence checks"""
+    import argparse
+    from app.core.database import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Maintain the user_category_stats table")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        stats = CategoryStats(db)
+        if args.command == "rebuild":
+            written = stats.rebuild(args.user_id)
+            print(f"Rebuilt {written} category statistics rows")
+        else:
+            report = stats.check_consistency(args.user_id)
+            print(f"{report['status']}: {report['keys_checked']} keys checked, {len(report['mismatches'])} mismatches")
+            for mismatch in report["mismatches"][:20]:
+                print(f"  {mismatch}")
+            if report["mismatches"]:
+                raise SystemExit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
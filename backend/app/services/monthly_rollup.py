@@ -0,0 +1,328 @@
+"""Incrementally maintained per-user monthly rollups of transactions
+
+Every transaction write path calls into MonthlyRollup inside the same database
+transaction, so readers (prediction, risk and advisor agents) can work from a few
+dozen (user, month, type, category) rows instead of scanning raw history.
+
+Usage:
+    python -m app.services.monthly_rollup rebuild [--user-id ID]
+    python -m app.services.monthly_rollup check [--user-id ID]
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, date
+from sqlalchemy import func, case, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.models.rollup import UserMonthlyRollup
+from app.services.transaction_aggregates import TransactionAggregates
+
+# (user_id, transaction_date, type, category, amount)
+TransactionSnapshot = Tuple[int, datetime, str, str, float]
+
+class MonthlyRollup:
+    """Maintain and query the user_monthly_rollup table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def snapshot(transaction: Transaction) -> TransactionSnapshot:
+        """Capture the fields a rollup depends on, e.g. before an update or delete"""
+        return (
+            transaction.user_id,
+            transaction.transaction_date,
+            transaction.type,
+            transaction.category,
+            transaction.amount
+        )
+
+    @staticmethod
+    def month_of(value: datetime) -> date:
+        """Get the rollup month (first day of the calendar month) for a timestamp"""
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def _key(snapshot: TransactionSnapshot) -> Tuple:
+        user_id, transaction_date, transaction_type, category, _ = snapshot
+        return (
+            user_id,
+            MonthlyRollup.month_of(transaction_date),
+            TransactionType(getattr(transaction_type, "value", transaction_type)),
+            TransactionCategory(getattr(category, "value", category))
+        )
+
+    def record_added(self, transaction: Transaction) -> None:
+        """Fold a newly created transaction into its rollup bucket"""
+        self.record_added_many([self.snapshot(transaction)])
+
+    def record_added_many(self, snapshots: Iterable[TransactionSnapshot]) -> None:
+        """Fold a batch of new transactions into their buckets with one multi-row upsert"""
+        buckets: Dict[Tuple, Dict] = {}
+        for snapshot in snapshots:
+            amount = float(snapshot[4])
+            key = self._key(snapshot)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {
+                    "total_amount": amount,
+                    "transaction_count": 1,
+                    "min_amount": amount,
+                    "max_amount": amount,
+                    "sum_of_squares": amount * amount
+                }
+            else:
+                bucket["total_amount"] += amount
+                bucket["transaction_count"] += 1
+                bucket["min_amount"] = min(bucket["min_amount"], amount)
+                bucket["max_amount"] = max(bucket["max_amount"], amount)
+                bucket["sum_of_squares"] += amount * amount
+        
+        if not buckets:
+            return
+        
+        rows = [
+            {"user_id": user_id, "month": month, "type": transaction_type, "category": category, **stats}
+            for (user_id, month, transaction_type, category), stats in buckets.items()
+        ]
+        self._upsert(rows)
+
+    def record_removed(self, snapshot: TransactionSnapshot) -> None:
+        """Take a deleted (or pre-update) transaction out of its rollup bucket
+        
+        The transaction row must already be flushed away, since min/max are
+        recomputed from the remaining transactions when the removed amount was an extreme.
+        """
+        user_id, month, transaction_type, category = self._key(snapshot)
+        amount = float(snapshot[4])
+        
+        rollup = self.db.query(UserMonthlyRollup).filter(
+            UserMonthlyRollup.user_id == user_id,
+            UserMonthlyRollup.month == month,
+            UserMonthlyRollup.type == transaction_type,
+            UserMonthlyRollup.category == category
+        ).with_for_update().populate_existing().first()
+        
+        if not rollup:
+            return
+        
+        if rollup.transaction_count <= 1:
+            self.db.delete(rollup)
+            self.db.flush()
+            return
+        
+        rollup.total_amount -= amount
+        rollup.transaction_count -= 1
+        rollup.sum_of_squares -= amount * amount
+        
+        if amount <= rollup.min_amount or amount >= rollup.max_amount:
+            next_month = date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+            rollup.min_amount, rollup.max_amount = self.db.query(
+                func.min(Transaction.amount),
+                func.max(Transaction.amount)
+            ).filter(
+                Transaction.user_id == user_id,
+                Transaction.type == transaction_type,
+                Transaction.category == category,
+                Transaction.transaction_date >= datetime.combine(month, datetime.min.time()),
+                Transaction.transaction_date < datetime.combine(next_month, datetime.min.time())
+            ).one()
+        
+        self.db.flush()
+
+    def record_updated(self, before: TransactionSnapshot, transaction: Transaction) -> None:
+        """Move an updated (and flushed) transaction between rollup buckets"""
+        after = self.snapshot(transaction)
+        if self._key(before) == self._key(after) and float(before[4]) == float(after[4]):
+            return
+        
+        self.record_removed(before)
+        self.record_added(transaction)
+
+    def _upsert(self, rows: List[Dict]) -> None:
+        """Insert rollup rows or merge them into existing buckets atomically"""
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        table = UserMonthlyRollup.__table__
+        
+        stmt = insert(table).values(rows)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "month", "type", "category"],
+            set_={
+                "total_amount": table.c.total_amount + excluded.total_amount,
+                "transaction_count": table.c.transaction_count + excluded.transaction_count,
+                "sum_of_squares": table.c.sum_of_squares + excluded.sum_of_squares,
+                "min_amount": case(
+                    (table.c.min_amount <= excluded.min_amount, table.c.min_amount),
+                    else_=excluded.min_amount
+                ),
+                "max_amount": case(
+                    (table.c.max_amount >= excluded.max_amount, table.c.max_amount),
+                    else_=excluded.max_amount
+                )
+            }
+        )
+        self.db.execute(stmt)
+
+    def monthly_totals(
+        self,
+        user_id: int,
+        transaction_type: str = "expense",
+        since: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """Get per-month totals (summed over categories) ordered by month"""
+        query = self.db.query(
+            UserMonthlyRollup.month,
+            func.sum(UserMonthlyRollup.total_amount),
+            func.sum(UserMonthlyRollup.transaction_count)
+        ).filter(
+            UserMonthlyRollup.user_id == user_id,
+            UserMonthlyRollup.type == TransactionType(transaction_type)
+        )
+        if since:
+            query = query.filter(UserMonthlyRollup.month >= self.month_of(since))
+        if category:
+            query = query.filter(UserMonthlyRollup.category == TransactionCategory(category))
+        
+        rows = query.group_by(UserMonthlyRollup.month).order_by(UserMonthlyRollup.month).all()
+        return [
+            {"month": month, "total": float(total), "count": int(count)}
+            for month, total, count in rows
+        ]
+
+    def category_totals(
+        self,
+        user_id: int,
+        transaction_type: str = "expense",
+        since: Optional[datetime] = None
+    ) -> Dict[str, Dict]:
+        """Get per-category totals (summed over months)"""
+        query = self.db.query(
+            UserMonthlyRollup.category,
+            func.sum(UserMonthlyRollup.total_amount),
+            func.sum(UserMonthlyRollup.transaction_count)
+        ).filter(
+            UserMonthlyRollup.user_id == user_id,
+            UserMonthlyRollup.type == TransactionType(transaction_type)
+        )
+        if since:
+            query = query.filter(UserMonthlyRollup.month >= self.month_of(since))
+        
+        rows = query.group_by(UserMonthlyRollup.category).all()
+        return {
+            category.value: {"total": float(total), "count": int(count)}
+            for category, total, count in rows
+        }
+
+    def _aggregate_from_transactions(self, user_id: Optional[int] = None):
+        """Compute rollup rows straight from the transactions table with one GROUP BY"""
+        month = TransactionAggregates(self.db).bucket_expression("month").label("month")
+        query = self.db.query(
+            Transaction.user_id,
+            month,
+            Transaction.type,
+            Transaction.category,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.min(Transaction.amount),
+            func.max(Transaction.amount),
+            func.sum(Transaction.amount * Transaction.amount)
+        )
+        if user_id is not None:
+            query = query.filter(Transaction.user_id == user_id)
+        
+        for row in query.group_by(Transaction.user_id, month, Transaction.type, Transaction.category):
+            user, bucket, transaction_type, category, total, count, min_amount, max_amount, sum_squares = row
+            bucket_date = bucket.date() if isinstance(bucket, datetime) else date.fromisoformat(str(bucket)[:10])
+            yield {
+                "user_id": user,
+                "month": bucket_date,
+                "type": transaction_type,
+                "category": category,
+                "total_amount": float(total),
+                "transaction_count": count,
+                "min_amount": float(min_amount),
+                "max_amount": float(max_amount),
+                "sum_of_squares": float(sum_squares)
+            }
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """Backfill or rebuild rollups from raw transactions; returns the number of rows written"""
+        stmt = delete(UserMonthlyRollup)
+        if user_id is not None:
+            stmt = stmt.where(UserMonthlyRollup.user_id == user_id)
+        self.db.execute(stmt)
+        
+        rows = list(self._aggregate_from_transactions(user_id))
+        if rows:
+            self.db.execute(UserMonthlyRollup.__table__.insert(), rows)
+        self.db.commit()
+        return len(rows)
+
+    def check_consistency(self, user_id: Optional[int] = None, tolerance: float = 1e-6) -> Dict:
+        """Compare rollups against a fresh aggregation of raw transactions"""
+        def key(row):
+            return (row["user_id"], row["month"], TransactionType(row["type"]), TransactionCategory(row["category"]))
+        
+        expected = {key(row): row for row in self._aggregate_from_transactions(user_id)}
+        
+        query = self.db.query(UserMonthlyRollup)
+        if user_id is not None:
+            query = query.filter(UserMonthlyRollup.user_id == user_id)
+        actual = {
+            (r.user_id, r.month, r.type, r.category): {
+                "total_amount": r.total_amount,
+                "transaction_count": r.transaction_count,
+                "min_amount": r.min_amount,
+                "max_amount": r.max_amount,
+                "sum_of_squares": r.sum_of_squares
+            }
+            for r in query.all()
+        }
+        
+        mismatches = []
+        for bucket in expected.keys() | actual.keys():
+            want, have = expected.get(bucket), actual.get(bucket)
+            if want is None or have is None:
+                mismatches.append({"bucket": bucket, "expected": want, "actual": have})
+                continue
+            for field, have_value in have.items():
+                if abs((want[field] or 0) - (have_value or 0)) > tolerance * max(1.0, abs(want[field] or 0)):
+                    mismatches.append({"bucket": bucket, "field": field, "expected": want[field], "actual": have_value})
+        
+        return {
+            "status": "consistent" if not mismatches else "inconsistent",
+            "buckets_checked": len(expected),
+            "mismatches": mismatches
+        }
+
+def main() -> None:
+    """Command-line entry point for rollup backfill and consistency checks"""
+    import argparse
+    from app.core.database import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Maintain the user_monthly_rollup table")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        rollup = MonthlyRollup(db)
+        if args.command == "rebuild":
+            written = rollup.rebuild(args.user_id)
+            print(f"Rebuilt {written} rollup rows")
+        else:
+            report = rollup.check_consistency(args.user_id)
+            print(f"{report['status']}: {report['buckets_checked']} buckets checked, {len(report['mismatches'])} mismatches")
+            for mismatch in report["mismatches"][:20]:
+                print(f"  {mismatch}")
+            if report["mismatches"]:
+                raise SystemExit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
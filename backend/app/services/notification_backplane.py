@@ -0,0 +1,153 @@
+"""Pub/sub backplane that fans WebSocket notifications out across workers
+
+ConnectionManager publishes every notification to the backplane and each worker
+subscribes once, delivering to whichever of its own sockets belong to the user.
+
+``memory`` (default) delivers in-process and suits a single worker. ``database``
+writes each notification to the notification_events outbox and every worker
+polls it for new rows, so any number of uvicorn workers sharing the database
+(a SQLite file or PostgreSQL) reach all sockets. Old events are pruned after
+``NOTIFICATION_EVENT_RETENTION_SECONDS``.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from app.core.config import settings
+from app.core.database import async_engine
+from app.models.notification_event import NotificationEvent
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[int, Dict], Awaitable[None]]
+
+class Backplane(ABC):
+    """Carries notifications between workers; subclasses implement publish and the subscription"""
+    
+    name = ""
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None:
+        """Subscribe this worker; ``deliver`` sends a message to the worker's local sockets of a user"""
+
+    @abstractmethod
+    async def publish(self, user_id: int, message: Dict) -> None:
+        """Send a message to every worker's sockets of a user"""
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> Dict:
+        return {"backplane": self.name}
+
+class InMemoryBackplane(Backplane):
+    """Single-process backplane: publishing delivers straight to the local sockets"""
+    
+    name = "memory"
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, user_id: int, message: Dict) -> None:
+        if self._deliver is not None:
+            await self._deliver(user_id, message)
+
+class DatabaseBackplane(Backplane):
+    """Multi-process backplane over the notification_events outbox, polled by every worker"""
+    
+    name = "database"
+    
+    # Ids are re-read this far behind the newest seen, since concurrent inserts can commit out of order
+    ID_LOOKBACK = 100
+    PRUNE_EVERY_POLLS = 50
+
+    def __init__(self, poll_interval: float, retention_seconds: int):
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.published = 0
+        self.delivered = 0
+        self._last_id = 0
+        self._floor = 0
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        async with async_engine.connect() as connection:
+            # Only events published from now on; older ones were for sockets that are gone
+            self._floor = self._last_id = (await connection.execute(select(func.max(NotificationEvent.id)))).scalar() or 0
+        self._task = asyncio.get_running_loop().create_task(self._poll(deliver))
+
+    async def publish(self, user_id: int, message: Dict) -> None:
+        async with async_engine.begin() as connection:
+            await connection.execute(insert(NotificationEvent).values(
+                user_id=user_id,
+                payload=json.dumps(message, default=str),
+                created_at=datetime.utcnow()
+            ))
+        self.published += 1
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _poll(self, deliver: Deliver) -> None:
+        polls = 0
+        while True:
+            try:
+                for event_id, user_id, payload in await self._fetch():
+                    await deliver(user_id, json.loads(payload))
+                    self.delivered += 1
+                polls += 1
+                if polls % self.PRUNE_EVERY_POLLS == 0:
+                    await self._prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification backplane error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _fetch(self):
+        query = select(NotificationEvent.id, NotificationEvent.user_id, NotificationEvent.payload).where(
+            NotificationEvent.id > max(self._last_id - self.ID_LOOKBACK, self._floor)
+        ).order_by(NotificationEvent.id)
+        async with async_engine.connect() as connection:
+            rows = (await connection.execute(query)).all()
+        
+        fresh = [row for row in rows if row[0] not in self._seen]
+        for event_id, _, _ in fresh:
+            self._seen[event_id] = None
+            self._last_id = max(self._last_id, event_id)
+        while len(self._seen) > self.ID_LOOKBACK * 10:
+            self._seen.popitem(last=False)
+        return fresh
+
+    async def _prune(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        async with async_engine.begin() as connection:
+            await connection.execute(delete(NotificationEvent).where(NotificationEvent.created_at < cutoff))
+
+    def stats(self) -> Dict:
+        return {"backplane": self.name, "published": self.published, "delivered": self.delivered, "last_event_id": self._last_id}
+
+def create_backplane(kind: Optional[str] = None) -> Backplane:
+    """Build the backplane selected by ``NOTIFICATION_BACKPLANE``"""
+    kind = kind or settings.NOTIFICATION_BACKPLANE
+    if kind == "memory":
+        return InMemoryBackplane()
+    if kind == "database":
+        return DatabaseBackplane(settings.NOTIFICATION_POLL_INTERVAL_SECONDS, settings.NOTIFICATION_EVENT_RETENTION_SECONDS)
+    raise ValueError(f"Unknown notification backplane: {kind}")
@@ -0,0 +1,349 @@
+"""Vectorized recurring-series detection and the persisted recurring_series index
+
+Series are found per (user, category) by clustering amounts that differ by less
+than AMOUNT_TOLERANCE, ordering each cluster by date and checking what share of
+the gaps between occurrences fits a cadence. Results are stored in
+recurring_series, so subscription audits, cash-flow projection and bill
+reminders read the index instead of rescanning history.
+
+Writes only extend a series a new expense fits; any other change marks its
+(user, category) in recurring_series_dirty, and RecurringRefresher re-detects
+marked categories in the background every RECURRING_REFRESH_INTERVAL_SECONDS.
+
+Usage:
+    python -m app.services.recurring_series rebuild [--user-id ID]
+    python -m app.services.recurring_series refresh-dirty
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.models.recurring import RecurringSeries, RecurringSeriesDirty
+
+logger = logging.getLogger(__name__)
+
+# (name, nominal interval in days, tolerance in days)
+CADENCES = (
+    ("weekly", 7.0, 2.0),
+    ("biweekly", 14.0, 2.0),
+    ("monthly", 30.4, 5.0),
+)
+AMOUNT_TOLERANCE = 0.1  # relative amount jitter tolerated within one series
+AMOUNT_ABS_TOLERANCE = 1.0  # absolute jitter floor for small amounts
+MIN_OCCURRENCES = 3
+MIN_CADENCE_SHARE = 0.75  # share of gaps that must match the cadence
+LOOKBACK_DAYS = 400
+
+def _to_days(value: datetime) -> float:
+    return value.toordinal() + (value.hour * 3600 + value.minute * 60 + value.second) / 86400.0
+
+def _from_days(value: float) -> datetime:
+    whole = int(np.floor(value))
+    return datetime.fromordinal(whole) + timedelta(seconds=round((value - whole) * 86400))
+
+def detect_recurring_series(rows: Sequence[Tuple]) -> List[Dict]:
+    """Detect recurring series in (category, amount, transaction_date) rows with array operations"""
+    if len(rows) < MIN_OCCURRENCES:
+        return []
+    
+    categories = sorted({row[0] for row in rows})
+    code = {category: i for i, category in enumerate(categories)}
+    cat = np.fromiter((code[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+    amount = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+    days = np.fromiter((_to_days(row[2]) for row in rows), dtype=float, count=len(rows))
+    
+    # Cluster amounts within each category: a new cluster starts at a category change or a jump in amount
+    order = np.lexsort((amount, cat))
+    cat, amount, days = cat[order], amount[order], days[order]
+    jump = np.diff(amount) > np.maximum(AMOUNT_ABS_TOLERANCE, AMOUNT_TOLERANCE * amount[:-1])
+    cluster = np.cumsum(np.concatenate(([True], (np.diff(cat) != 0) | jump))) - 1
+    
+    # Order each cluster by date and measure the gaps between consecutive occurrences
+    order = np.lexsort((days, cluster))
+    cluster, cat, amount, days = cluster[order], cat[order], amount[order], days[order]
+    clusters = int(cluster[-1]) + 1
+    same = cluster[1:] == cluster[:-1]
+    gaps = np.diff(days)[same]
+    gap_cluster = cluster[1:][same]
+    gap_counts = np.bincount(gap_cluster, minlength=clusters)
+    
+    cadence = np.full(clusters, -1)
+    best_share = np.zeros(clusters)
+    interval = np.zeros(clusters)
+    for index, (_, nominal, tolerance) in enumerate(CADENCES):
+        hit = np.abs(gaps - nominal) <= tolerance
+        hits = np.bincount(gap_cluster, weights=hit, minlength=clusters)
+        hit_days = np.bincount(gap_cluster, weights=gaps * hit, minlength=clusters)
+        share = np.divide(hits, gap_counts, out=np.zeros(clusters), where=gap_counts > 0)
+        better = share > best_share
+        cadence[better] = index
+        best_share[better] = share[better]
+        interval[better] = hit_days[better] / hits[better]
+    
+    starts = np.flatnonzero(np.concatenate(([True], cluster[1:] != cluster[:-1])))
+    counts = np.bincount(cluster, minlength=clusters)
+    totals = np.bincount(cluster, weights=amount, minlength=clusters)
+    amount_min = np.minimum.reduceat(amount, starts)
+    amount_max = np.maximum.reduceat(amount, starts)
+    first_seen = days[starts]
+    last_seen = np.maximum.reduceat(days, starts)
+    
+    keep = np.flatnonzero((counts >= MIN_OCCURRENCES) & (best_share >= MIN_CADENCE_SHARE))
+    return [
+        {
+            "category": categories[cat[starts[i]]],
+            "cadence": CADENCES[cadence[i]][0],
+            "interval_days": round(float(interval[i]), 2),
+            "typical_amount": round(float(totals[i] / counts[i]), 2),
+            "amount_min": float(amount_min[i]),
+            "amount_max": float(amount_max[i]),
+            "occurrences": int(counts[i]),
+            "first_seen": _from_days(first_seen[i]),
+            "last_seen": _from_days(last_seen[i]),
+            "next_expected_date": _from_days(last_seen[i] + interval[i])
+        }
+        for i in keep
+    ]
+
+class RecurringSeriesIndex:
+    """Maintain and query the recurring_series table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def series(self, user_id: int) -> List[RecurringSeries]:
+        """Get a user's recurring series ordered by next expected date"""
+        return self.db.query(RecurringSeries).filter(
+            RecurringSeries.user_id == user_id
+        ).order_by(RecurringSeries.next_expected_date).all()
+
+    def upcoming(self, user_id: int, within_days: int = 30) -> List[RecurringSeries]:
+        """Get series expected within the next ``within_days`` days, e.g. for bill reminders"""
+        return self.db.query(RecurringSeries).filter(
+            RecurringSeries.user_id == user_id,
+            RecurringSeries.next_expected_date <= datetime.utcnow() + timedelta(days=within_days)
+        ).order_by(RecurringSeries.next_expected_date).all()
+
+    def refresh(self, user_id: int, categories: Optional[Iterable] = None) -> int:
+        """Re-detect a user's series (optionally only some categories) from recent transactions"""
+        self.db.flush()
+        categories = [TransactionCategory(getattr(c, "value", c)) for c in categories] if categories is not None else None
+        
+        query = self.db.query(
+            Transaction.category,
+            Transaction.amount,
+            Transaction.transaction_date
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.type == TransactionType.EXPENSE,
+            Transaction.transaction_date >= datetime.utcnow() - timedelta(days=LOOKBACK_DAYS)
+        )
+        existing = self.db.query(RecurringSeries).filter(RecurringSeries.user_id == user_id)
+        if categories is not None:
+            query = query.filter(Transaction.category.in_(categories))
+            existing = existing.filter(RecurringSeries.category.in_(categories))
+        
+        detected = detect_recurring_series(query.all())
+        existing.delete(synchronize_session=False)
+        if detected:
+            now = datetime.utcnow()
+            self.db.execute(
+                RecurringSeries.__table__.insert(),
+                [{"user_id": user_id, "updated_at": now, **series} for series in detected]
+            )
+        return len(detected)
+
+    def mark_dirty(self, user_id: int, categories: Iterable) -> None:
+        """Queue categories of a user for re-detection by the background refresh"""
+        now = datetime.utcnow()
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        rows = [
+            {"user_id": user_id, "category": TransactionCategory(getattr(c, "value", c)), "marked_at": now}
+            for c in set(categories)
+        ]
+        if rows:
+            statement = insert(RecurringSeriesDirty.__table__)
+            self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["user_id", "category"],
+                    set_={"marked_at": statement.excluded.marked_at}
+                ),
+                rows
+            )
+
+    def record_added_many(self, snapshots: Iterable[Tuple]) -> None:
+        """Extend matching series with new expenses; mark categories where nothing matched as dirty
+        
+        A new expense extends a series when it is in the same category, within the
+        series' amount band (plus tolerance) and close to its next expected date.
+        """
+        by_user: Dict[int, List[Tuple]] = {}
+        for snapshot in snapshots:
+            if TransactionType(getattr(snapshot[2], "value", snapshot[2])) == TransactionType.EXPENSE:
+                by_user.setdefault(snapshot[0], []).append(snapshot)
+        
+        for user_id, user_snapshots in by_user.items():
+            series = self.series(user_id)
+            stale = set()
+            for _, transaction_date, _, category, amount in sorted(user_snapshots, key=lambda s: s[1]):
+                category = TransactionCategory(getattr(category, "value", category))
+                match = next((s for s in series if self._matches(s, category, float(amount), transaction_date)), None)
+                if match is None:
+                    stale.add(category)
+                else:
+                    self._extend(match, float(amount), transaction_date)
+            
+            self.mark_dirty(user_id, stale)
+
+    def record_added(self, transaction: Transaction) -> None:
+        self.record_added_many([(
+            transaction.user_id, transaction.transaction_date, transaction.type,
+            transaction.category, transaction.amount
+        )])
+
+    def record_removed(self, snapshot: Tuple) -> None:
+        """Mark the category of a deleted (or pre-update) expense as dirty"""
+        user_id, _, transaction_type, category, _ = snapshot
+        if TransactionType(getattr(transaction_type, "value", transaction_type)) == TransactionType.EXPENSE:
+            self.mark_dirty(user_id, [category])
+
+    def refresh_dirty(self, limit: Optional[int] = None) -> int:
+        """Re-detect the oldest dirty categories, committing per user; returns how many were refreshed
+        
+        A category marked again while it is being refreshed keeps its mark for the next run.
+        """
+        dirty = self.db.query(RecurringSeriesDirty).order_by(RecurringSeriesDirty.marked_at).limit(
+            limit or settings.RECURRING_REFRESH_BATCH_SIZE
+        ).all()
+        by_user: Dict[int, List[RecurringSeriesDirty]] = {}
+        for mark in dirty:
+            by_user.setdefault(mark.user_id, []).append(mark)
+        
+        for user_id, marks in by_user.items():
+            self.refresh(user_id, [mark.category for mark in marks])
+            self.db.execute(delete(RecurringSeriesDirty).where(or_(*(
+                and_(RecurringSeriesDirty.id == mark.id, RecurringSeriesDirty.marked_at == mark.marked_at)
+                for mark in marks
+            ))))
+            self.db.commit()
+        return len(dirty)
+
+    @staticmethod
+    def _matches(series: RecurringSeries, category: TransactionCategory, amount: float, when: datetime) -> bool:
+        if series.category != category:
+            return False
+        slack = max(AMOUNT_ABS_TOLERANCE, AMOUNT_TOLERANCE * series.typical_amount)
+        if not series.amount_min - slack <= amount <= series.amount_max + slack:
+            return False
+        tolerance = next(t for name, _, t in CADENCES if name == series.cadence)
+        return abs((when - series.next_expected_date).total_seconds()) <= tolerance * 86400
+
+    @staticmethod
+    def _extend(series: RecurringSeries, amount: float, when: datetime) -> None:
+        gap = (when - series.last_seen).total_seconds() / 86400
+        gaps = series.occurrences - 1
+        series.interval_days = round((series.interval_days * gaps + gap) / (gaps + 1), 2)
+        series.typical_amount = round((series.typical_amount * series.occurrences + amount) / (series.occurrences + 1), 2)
+        series.amount_min = min(series.amount_min, amount)
+        series.amount_max = max(series.amount_max, amount)
+        series.occurrences += 1
+        series.last_seen = when
+        series.next_expected_date = when + timedelta(days=series.interval_days)
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """Re-detect every user's series (or one user's); returns the number of series written"""
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = [row[0] for row in self.db.query(Transaction.user_id).distinct()]
+            self.db.query(RecurringSeries).delete(synchronize_session=False)
+        
+        written = sum(self.refresh(uid) for uid in user_ids)
+        self.db.commit()
+        return written
+
+class RecurringRefresher:
+    """Background task that periodically re-detects dirty recurring series categories"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.refreshed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.refreshed += await run_in_threadpool(self.refresh_once)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Recurring series refresh error: {e}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def refresh_once() -> int:
+        from app.core.database import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            return RecurringSeriesIndex(db).refresh_dirty()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> Dict:
+        return {"refreshed": self.refreshed, "running": self._task is not None and not self._task.done()}
+
+recurring_refresher = RecurringRefresher(settings.RECURRING_REFRESH_INTERVAL_SECONDS)
+
+def main() -> None:
+    """Command-line entry point for rebuilding the recurring series index"""
+    import argparse
+    from app.core.database import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Maintain the recurring_series table")
+    parser.add_argument("command", choices=["rebuild", "refresh-dirty"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        if args.command == "refresh-dirty":
+            refreshed = 0
+            while True:
+                batch = RecurringSeriesIndex(db).refresh_dirty()
+                if not batch:
+                    break
+                refreshed += batch
+            print(f"Refreshed {refreshed} dirty categories")
+            return
+        
+        written = RecurringSeriesIndex(db).rebuild(args.user_id)
+        print(f"Rebuilt {written} recurring series")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
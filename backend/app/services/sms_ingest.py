@@ -0,0 +1,155 @@
+"""Batch ingestion of exported SMS inboxes into transactions
+
+Records (NDJSON or CSV with a ``body``/``text``/``message`` column and an
+optional ``date``) are streamed in chunks, parsed with SMSParser's precompiled
+bank templates, keyed for deduplication by UPI reference (or by a hash of the
+message when there is none) and written through TransactionBulkWriter's
+idempotent path, so re-importing the same dump inserts nothing twice. With
+``workers > 1`` parsing fans out to a process pool for multi-year dumps.
+
+Usage:
+    python -m app.services.sms_ingest inbox.ndjson --user-id ID [--format csv] [--workers 8]
+"""
+import csv
+import hashlib
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.utils.chunking import chunks
+from app.utils.sms_parser import SMSParser
+from app.services.bulk_ingest import TransactionBulkWriter, validate_transaction_rows
+
+BODY_FIELDS = ("body", "text", "message", "sms")
+DATE_FIELDS = ("date", "received_at", "timestamp", "time")
+SENDER_FIELDS = ("sender", "address", "from")
+
+def iter_sms_records(stream: IO[str], format: str = "ndjson") -> Iterator[Optional[Dict]]:
+    """Stream records from an NDJSON or CSV export; undecodable NDJSON lines yield None"""
+    if format == "csv":
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+def _first(record: Dict, fields) -> Optional[str]:
+    return next((record[field] for field in fields if record.get(field) not in (None, "")), None)
+
+def _parse_date(value) -> Optional[datetime]:
+    """Accept epoch seconds or milliseconds (Android exports) and ISO 8601 strings"""
+    if value in (None, ""):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return datetime.utcfromtimestamp(number / 1000 if number > 1e11 else number)
+
+def parse_sms_records(records: List[Optional[Dict]]) -> List[Optional[Dict]]:
+    """Parse a chunk of export records into transaction rows; None where no transaction was found
+
+    Module-level so that it can run in a worker process.
+    """
+    rows = []
+    for record in records:
+        body = _first(record, BODY_FIELDS) if record else None
+        parsed = SMSParser.parse_upi_sms(body, _parse_date(_first(record, DATE_FIELDS))) if body else None
+        if parsed is None:
+            rows.append(None)
+            continue
+
+        if parsed["upi_ref"]:
+            key = f"upi:{parsed['upi_ref']}"
+        else:
+            sender = _first(record, SENDER_FIELDS) or ""
+            digest = hashlib.blake2b(f"{sender}|{parsed['transaction_date'].isoformat()}|{body}".encode(), digest_size=16)
+            key = f"sms:{digest.hexdigest()}"
+
+        rows.append({
+            "amount": parsed["amount"],
+            "type": parsed["type"],
+            "category": parsed["category"],
+            "description": parsed["description"],
+            "transaction_date": parsed["transaction_date"],
+            "idempotency_key": key
+        })
+    return rows
+
+class SMSIngestor:
+    """Parse, deduplicate, categorize and bulk-insert SMS export records for one user"""
+
+    def __init__(self, db: Session, workers: int = 1, chunk_size: Optional[int] = None):
+        self.db = db
+        self.workers = workers
+        self.chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        self.writer = TransactionBulkWriter(db, self.chunk_size)
+
+    def _parsed_chunks(self, records: Iterable[Optional[Dict]]) -> Iterator[List[Optional[Dict]]]:
+        if self.workers <= 1:
+            for chunk in chunks(records, self.chunk_size):
+                yield parse_sms_records(chunk)
+            return
+
+        # Keep a bounded number of chunks in flight so huge dumps never sit in memory at once
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for chunk in chunks(records, self.chunk_size):
+                pending.append(pool.submit(parse_sms_records, chunk))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def ingest(self, user_id: int, records: Iterable[Optional[Dict]]) -> Dict:
+        """Ingest records chunk by chunk; returns counts of what was parsed, inserted and skipped"""
+        stats = {"received": 0, "parsed": 0, "not_transactions": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+        for parsed in self._parsed_chunks(records):
+            stats["received"] += len(parsed)
+            rows = [row for row in parsed if row is not None]
+            stats["parsed"] += len(rows)
+            stats["not_transactions"] += len(parsed) - len(rows)
+
+            valid, errors = validate_transaction_rows(rows)
+            stats["invalid"] += len(errors)
+            written = self.writer.write_idempotent(user_id, valid)
+            for result in written["results"]:
+                stats["inserted" if result["status"] == "created" else "duplicates"] += 1
+            stats["failed"] += len(written["errors"])
+        return stats
+
+def main() -> None:
+    """Command-line entry point for importing an SMS inbox export"""
+    import argparse
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import transactions from an exported SMS inbox")
+    parser.add_argument("path")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8") as stream:
+            stats = SMSIngestor(db, workers=args.workers).ingest(args.user_id, iter_sms_records(stream, format))
+        print(", ".join(f"{key}: {value}" for key, value in stats.items()))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""SQL-side aggregates over transactions, alerts, jars and goals"""
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, date, timedelta
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction, TransactionType
+from app.models.alert import Alert, AlertSeverity
+from app.models.goal import Goal
+from app.models.jar import Jar
+
+class TransactionAggregates:
+    """Summary queries that return a handful of grouped rows instead of full ORM objects"""
+    
+    GRANULARITIES = ("day", "week", "month")
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _window(self, query, user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Apply the user/date-window filter shared by all transaction aggregates"""
+        query = query.filter(Transaction.user_id == user_id)
+        if start_date:
+            query = query.filter(Transaction.transaction_date >= start_date)
+        if end_date:
+            query = query.filter(Transaction.transaction_date <= end_date)
+        return query
+
+    def totals_by_type(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict:
+        """Get income/expense totals and counts with a single GROUP BY type"""
+        query = self.db.query(
+            Transaction.type,
+            func.coalesce(func.sum(Transaction.amount), 0.0),
+            func.count(Transaction.id)
+        )
+        rows = self._window(query, user_id, start_date, end_date).group_by(Transaction.type).all()
+        
+        totals = {
+            "income": 0.0,
+            "expense": 0.0,
+            "income_count": 0,
+            "expense_count": 0,
+            "transaction_count": 0
+        }
+        for transaction_type, total, count in rows:
+            key = TransactionType(transaction_type).value
+            totals[key] = float(total)
+            totals[f"{key}_count"] = count
+            totals["transaction_count"] += count
+        
+        return totals
+
+    def expense_by_category(
+        self,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Dict]:
+        """Get per-category expense totals and counts with a single GROUP BY category"""
+        query = self.db.query(
+            Transaction.category,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).filter(Transaction.type == TransactionType.EXPENSE)
+        rows = self._window(query, user_id, start_date, end_date).group_by(Transaction.category).all()
+        
+        return {
+            getattr(category, "value", category): {"total": float(total), "count": count}
+            for category, total, count in rows
+        }
+
+    def expense_trend(self, user_id: int, granularity: str = "month", periods: int = 6) -> List[Dict]:
+        """Get expense totals for the last N calendar buckets with a single GROUP BY bucket
+        
+        Buckets are days, ISO weeks (starting Monday) or calendar months. Empty buckets are
+        filled with zeros so the result always has exactly ``periods`` entries, oldest first.
+        """
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(self.GRANULARITIES)}")
+        
+        current_start = self.bucket_start(date.today(), granularity)
+        bucket_starts = [current_start]
+        for _ in range(periods - 1):
+            bucket_starts.append(self.bucket_start(bucket_starts[-1] - timedelta(days=1), granularity))
+        bucket_starts.reverse()
+        
+        bucket = self.bucket_expression(granularity).label("bucket")
+        rows = self.db.query(
+            bucket,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.type == TransactionType.EXPENSE,
+            Transaction.transaction_date >= datetime.combine(bucket_starts[0], datetime.min.time())
+        ).group_by(bucket).all()
+        
+        buckets = {}
+        for value, total, count in rows:
+            bucket_date = value.date() if isinstance(value, datetime) else date.fromisoformat(str(value)[:10])
+            buckets[bucket_date] = (float(total), count)
+        
+        return [
+            {
+                "period_start": start,
+                "total": buckets.get(start, (0.0, 0))[0],
+                "count": buckets.get(start, (0.0, 0))[1]
+            }
+            for start in bucket_starts
+        ]
+
+    def bucket_expression(self, granularity: str):
+        """Build the dialect-specific expression that truncates transaction_date to a bucket start"""
+        column = Transaction.transaction_date
+        if self.db.get_bind().dialect.name == "postgresql":
+            return func.date_trunc(granularity, column)
+        if granularity == "month":
+            return func.strftime("%Y-%m-01", column)
+        if granularity == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.date(column)
+
+    @staticmethod
+    def bucket_start(day: date, granularity: str) -> date:
+        """Get the first day of the bucket containing ``day``"""
+        if granularity == "month":
+            return day.replace(day=1)
+        if granularity == "week":
+            return day - timedelta(days=day.weekday())
+        return day
+
+    def alert_counts(self, user_id: int) -> Dict:
+        """Get total/unread/critical/warning alert counts in one scan"""
+        total, unread, critical, warning = self.db.query(
+            func.count(Alert.id),
+            func.coalesce(func.sum(case((Alert.is_read == False, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Alert.severity == AlertSeverity.CRITICAL, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Alert.severity == AlertSeverity.WARNING, 1), else_=0)), 0)
+        ).filter(Alert.user_id == user_id).one()
+        
+        return {
+            "total": total,
+            "unread": int(unread),
+            "critical": int(critical),
+            "warning": int(warning)
+        }
+
+    def jar_totals(self, user_id: int) -> Dict:
+        """Get total saved across jars and the number of jars"""
+        total_saved, jars_count = self.db.query(
+            func.coalesce(func.sum(Jar.current_amount), 0.0),
+            func.count(Jar.id)
+        ).filter(Jar.user_id == user_id).one()
+        
+        return {"total_saved": float(total_saved), "jars_count": jars_count}
+
+    def goal_counts(self, user_id: int) -> Dict:
+        """Get the number of goals and how many have reached their target"""
+        total, completed = self.db.query(
+            func.count(Goal.id),
+            func.coalesce(func.sum(case((Goal.current_amount >= Goal.target_amount, 1), else_=0)), 0)
+        ).filter(Goal.user_id == user_id).one()
+        
+        return {"total": total, "completed": int(completed)}
+
+def benchmark(
+    sizes: Tuple[int, ...] = (1000, 10000, 100000, 1000000),
+    full_fetch_max_rows: int = 100000,
+    repeat: int = 10
+) -> None:
+    """Time the summary aggregates as one user's history grows, against fetching full rows
+    
+    Runs on an in-memory SQLite database built from the models, so it needs no server.
+    Rows are added backwards from now, one every 30 minutes, so the current month holds
+    the same rows at every size while the all-time history keeps growing.
+    """
+    import statistics
+    import time
+    from sqlalchemy import create_engine, insert
+    import app.models
+    from app.core.database import Base
+    from app.models.user import User
+    from app.models.transaction import TransactionCategory
+    
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    categories = list(TransactionCategory)
+    now = datetime.utcnow()
+    month_start = datetime(now.year, now.month, 1)
+    with Session(engine) as db:
+        db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "username": "bench", "hashed_password": "x"}])
+        aggregates = TransactionAggregates(db)
+
+        def median_ms(run) -> float:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings)
+
+        def full_fetch() -> None:
+            totals = {"income": 0.0, "expense": 0.0}
+            for transaction in db.query(Transaction).filter(Transaction.user_id == 1).all():
+                totals[TransactionType(transaction.type).value] += transaction.amount
+        
+        print(f"summary latency for one user's history (median of {repeat})")
+        seeded = 0
+        for size in sizes:
+            db.execute(insert(Transaction), [
+                {
+                    "user_id": 1,
+                    "amount": 1.0 + i % 100,
+                    "type": TransactionType.INCOME if i % 10 == 0 else TransactionType.EXPENSE,
+                    "category": categories[i % len(categories)],
+                    "transaction_date": now - timedelta(minutes=30 * i)
+                }
+                for i in range(seeded, size)
+            ])
+            db.commit()
+            seeded = size
+            
+            all_time_ms = median_ms(lambda: aggregates.totals_by_type(1))
+            month_ms = median_ms(lambda: (
+                aggregates.totals_by_type(1, month_start),
+                aggregates.expense_by_category(1, month_start)
+            ))
+            line = f"{size:>8} rows: all-time totals {all_time_ms:8.3f} ms, current month {month_ms:7.3f} ms"
+            if size <= full_fetch_max_rows:
+                line += f", full-row fetch {median_ms(full_fetch):9.3f} ms"
+            print(line)
+
+def main() -> None:
+    """Command-line entry point for the summary aggregate benchmark"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Time summary aggregates from 1k to 1M transactions")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--max-rows", type=int, default=1000000)
+    parser.add_argument("--full-fetch-max-rows", type=int, default=100000)
+    args = parser.parse_args()
+    sizes = tuple(size for size in (1000, 10000, 100000, 1000000) if size <= args.max_rows)
+    benchmark(sizes, args.full_fetch_max_rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Single entry point that keeps transaction-derived tables in step with writes
+
+Every transaction write path reports what it changed here, inside its own
+database transaction, instead of calling each derived-table maintainer itself.
+"""
+from typing import Iterable
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
+from app.services.monthly_rollup import MonthlyRollup, TransactionSnapshot
+from app.services.recurring_series import RecurringSeriesIndex
+from app.services.category_stats import CategoryStats
+from app.services.transaction_fingerprint import fingerprint_of
+
+class TransactionEvents:
+    """Fingerprint transactions and fan writes out to the monthly rollups, category statistics and recurring series index"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def added(self, transaction: Transaction) -> None:
+        """Record a newly created transaction"""
+        transaction.fingerprint = fingerprint_of(transaction)
+        self.added_many([MonthlyRollup.snapshot(transaction)])
+
+    def added_many(self, snapshots: Iterable[TransactionSnapshot]) -> None:
+        """Record a batch of newly created transactions"""
+        snapshots = list(snapshots)
+        MonthlyRollup(self.db).record_added_many(snapshots)
+        CategoryStats(self.db).record_added_many(snapshots)
+        RecurringSeriesIndex(self.db).record_added_many(snapshots)
+
+    def removed(self, snapshot: TransactionSnapshot) -> None:
+        """Record a deleted transaction; the delete must already be flushed"""
+        MonthlyRollup(self.db).record_removed(snapshot)
+        CategoryStats(self.db).record_removed(snapshot)
+        RecurringSeriesIndex(self.db).record_removed(snapshot)
+
+    def updated(self, before: TransactionSnapshot, transaction: Transaction) -> None:
+        """Record an updated (and flushed) transaction"""
+        after = MonthlyRollup.snapshot(transaction)
+        transaction.fingerprint = fingerprint_of(transaction)
+        MonthlyRollup(self.db).record_updated(before, transaction)
+        if before != after:
+            CategoryStats(self.db).record_removed(before)
+            CategoryStats(self.db).record_added_many([after])
+            RecurringSeriesIndex(self.db).record_removed(before)
+            RecurringSeriesIndex(self.db).record_added_many([after])
@@ -0,0 +1,73 @@
+"""Streaming export of a user's transactions
+
+Rows are read as plain column tuples (no ORM hydration) from a server-side
+cursor in ``yield_per`` partitions and serialized one partition at a time, so
+memory stays constant however long the history is.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Optional, Sequence
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+
+EXPORT_COLUMNS = (
+    Transaction.id, Transaction.transaction_date, Transaction.type, Transaction.category,
+    Transaction.amount, Transaction.description, Transaction.created_at
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_query(
+    user_id: int,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Select the export columns of a user's transactions, oldest first, with optional filters"""
+    query = select(*EXPORT_COLUMNS).where(Transaction.user_id == user_id)
+    if category:
+        query = query.where(Transaction.category == TransactionCategory(category))
+    if type:
+        query = query.where(Transaction.type == TransactionType(type))
+    if start_date:
+        query = query.where(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.where(Transaction.transaction_date <= end_date)
+    return query.order_by(Transaction.transaction_date, Transaction.id)
+
+def _plain(row: Sequence) -> List:
+    """Column values as CSV/JSON-friendly scalars: enum values and ISO timestamps"""
+    return [
+        value.value if hasattr(value, "value") else value.isoformat() if isinstance(value, datetime) else value
+        for value in row
+    ]
+
+def csv_chunk(rows: Sequence[Sequence], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(_plain(row) for row in rows)
+    return buffer.getvalue()
+
+def ndjson_chunk(rows: Sequence[Sequence]) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_FIELDS, _plain(row)))) + "\n" for row in rows)
+
+async def stream_partitions(db: AsyncSession, query, batch_size: Optional[int] = None) -> AsyncIterator[Sequence]:
+    """Yield the rows of an export query in partitions of ``batch_size`` from a server-side cursor"""
+    result = await db.stream(query.execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
+
+async def stream_export(db: AsyncSession, query, format: str = "csv") -> AsyncIterator[str]:
+    """Serialize an export query one partition at a time; CSV starts with a header row"""
+    if format == "csv":
+        yield csv_chunk([], header=True)
+    async for partition in stream_partitions(db, query):
+        yield csv_chunk(partition) if format == "csv" else ndjson_chunk(partition)
@@ -0,0 +1,189 @@
+"""Duplicate-transaction fingerprints and indexed duplicate lookups
+
+A fingerprint hashes (user, amount in minor units, category, normalized
+description, day) into one indexed column, so "is there a transaction like this
+within a day of it" is a probe of the fingerprints for the day before, the day
+of and the day after instead of a float-equality scan. Large imports first check
+a Bloom filter of the user's fingerprints over the import's date span and only
+probe the database for rows that might be duplicates.
+
+Usage:
+    python -m app.services.transaction_fingerprint backfill [--user-id ID]
+"""
+import hashlib
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
+
+DUPLICATE_WINDOW = timedelta(hours=24)
+BLOOM_MIN_ROWS = 1000  # smaller imports probe the index directly
+BLOOM_ERROR_RATE = 0.01
+PROBE_CHUNK_SIZE = 500  # fingerprints per IN (...) probe
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def normalize_description(description: Optional[str]) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return _NON_WORD.sub(" ", (description or "").lower()).strip()
+
+def transaction_fingerprint(
+    user_id: int,
+    amount: float,
+    category,
+    description: Optional[str],
+    transaction_date: datetime,
+    day_offset: int = 0
+) -> str:
+    """Hash the fields two duplicate transactions share into a 32-character key"""
+    key = "|".join((
+        str(user_id),
+        str(int(round(float(amount) * 100))),
+        getattr(category, "value", category),
+        normalize_description(description),
+        str(transaction_date.toordinal() + day_offset)
+    ))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+def fingerprint_of(transaction: Transaction) -> str:
+    return transaction_fingerprint(
+        transaction.user_id, transaction.amount, transaction.category,
+        transaction.description, transaction.transaction_date
+    )
+
+def candidate_fingerprints(user_id: int, amount: float, category, description: Optional[str], transaction_date: datetime) -> Tuple[str, ...]:
+    """Fingerprints of the day before, the day of and the day after; any duplicate carries one of them"""
+    return tuple(
+        transaction_fingerprint(user_id, amount, category, description, transaction_date, offset)
+        for offset in (-1, 0, 1)
+    )
+
+class BloomFilter:
+    """Fixed-size Bloom filter over fingerprint hex strings (already uniformly distributed)"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fingerprint: str):
+        # Double hashing from the two halves of the fingerprint
+        first, second = int(fingerprint[:16], 16), int(fingerprint[16:], 16) | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, fingerprint: str) -> None:
+        for position in self._positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+class DuplicateIndex:
+    """Look up likely duplicates through the transactions.fingerprint index"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def existing(self, fingerprints: Iterable[str]) -> Dict[str, List[datetime]]:
+        """Map each stored fingerprint among ``fingerprints`` to the dates of its transactions"""
+        fingerprints = list(set(fingerprints))
+        found: Dict[str, List[datetime]] = {}
+        for offset in range(0, len(fingerprints), PROBE_CHUNK_SIZE):
+            for fingerprint, transaction_date in self.db.query(Transaction.fingerprint, Transaction.transaction_date).filter(
+                Transaction.fingerprint.in_(fingerprints[offset:offset + PROBE_CHUNK_SIZE])
+            ):
+                found.setdefault(fingerprint, []).append(transaction_date)
+        return found
+
+    @staticmethod
+    def count_within(found: Dict[str, List[datetime]], candidates: Sequence[str], when: datetime) -> int:
+        """Count stored transactions under ``candidates`` dated within DUPLICATE_WINDOW of ``when``"""
+        return sum(
+            1
+            for fingerprint in candidates
+            for transaction_date in found.get(fingerprint, ())
+            if abs(transaction_date - when) <= DUPLICATE_WINDOW
+        )
+
+    def find(self, user_id: int, amount: float, category, description: Optional[str], when: datetime) -> int:
+        """Count stored transactions that look like a duplicate of the given one"""
+        candidates = candidate_fingerprints(user_id, amount, category, description, when)
+        return self.count_within(self.existing(candidates), candidates, when)
+
+    def find_in_batch(self, user_id: int, transactions: Sequence[Tuple[int, object]]) -> List[int]:
+        """Get the indices of (index, TransactionCreate) rows that duplicate a stored transaction or an earlier row
+        
+        Imports of BLOOM_MIN_ROWS rows or more load the user's fingerprints over the
+        import's date span into a Bloom filter once; only rows it cannot rule out are
+        probed in the index.
+        """
+        if not transactions:
+            return []
+        
+        candidates = {
+            index: candidate_fingerprints(user_id, t.amount, t.category, t.description, t.transaction_date)
+            for index, t in transactions
+        }
+        to_probe = [fingerprint for fingerprints in candidates.values() for fingerprint in fingerprints]
+        
+        if len(transactions) >= BLOOM_MIN_ROWS:
+            dates = [t.transaction_date for _, t in transactions]
+            stored = self.db.query(Transaction.fingerprint).filter(
+                Transaction.user_id == user_id,
+                Transaction.transaction_date >= min(dates) - DUPLICATE_WINDOW,
+                Transaction.transaction_date <= max(dates) + DUPLICATE_WINDOW,
+                Transaction.fingerprint.isnot(None)
+            )
+            bloom = BloomFilter(stored.count())
+            for (fingerprint,) in stored.yield_per(5000):
+                bloom.add(fingerprint)
+            to_probe = [fingerprint for fingerprint in to_probe if fingerprint in bloom]
+        
+        found = self.existing(to_probe)
+        duplicates = []
+        for index, t in transactions:
+            if self.count_within(found, candidates[index], t.transaction_date):
+                duplicates.append(index)
+            # Later rows of the same import are compared against this one too
+            own = candidates[index][1]
+            found.setdefault(own, []).append(t.transaction_date)
+        return duplicates
+
+    def backfill(self, user_id: Optional[int] = None, batch_size: int = 5000) -> int:
+        """Compute fingerprints for transactions that have none; returns the number updated"""
+        updated = 0
+        while True:
+            query = self.db.query(Transaction).filter(Transaction.fingerprint.is_(None))
+            if user_id is not None:
+                query = query.filter(Transaction.user_id == user_id)
+            batch = query.order_by(Transaction.id).limit(batch_size).all()
+            if not batch:
+                return updated
+            for transaction in batch:
+                transaction.fingerprint = fingerprint_of(transaction)
+            self.db.commit()
+            updated += len(batch)
+
+def main() -> None:
+    """Command-line entry point for fingerprint backfill"""
+    import argparse
+    from app.core.database import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Maintain transactions.fingerprint")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        updated = DuplicateIndex(db).backfill(args.user_id)
+        print(f"Fingerprinted {updated} transactions")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
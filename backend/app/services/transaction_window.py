@@ -0,0 +1,58 @@
+"""Request-scoped, in-memory window over a user's recent transactions"""
+from bisect import bisect_left
+from typing import List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction, TransactionType
+
+class TransactionWindow:
+    """Fetch the widest look-back a request needs once, as column tuples, and slice it in memory
+    
+    Rows are SQLAlchemy ``Row`` tuples exposing ``id``, ``amount``, ``type``, ``category``,
+    ``description``, ``transaction_date`` and ``fingerprint`` as attributes, ordered by transaction_date. Create one per
+    request (it is never invalidated) and call ``prefetch`` with the largest window
+    first so that narrower windows never trigger another query.
+    """
+
+    def __init__(self, db: Session, user_id: int, transaction_type: Optional[str] = "expense"):
+        self.db = db
+        self.user_id = user_id
+        self.transaction_type = TransactionType(transaction_type) if transaction_type else None
+        self._loaded_since: Optional[datetime] = None
+        self._rows: List = []
+        self._dates: List[datetime] = []
+
+    def prefetch(self, days: int) -> None:
+        """Load the widest window up front"""
+        self.last_days(days)
+
+    def last_days(self, days: int) -> List:
+        """Get the transactions of the last ``days`` days, oldest first"""
+        return self.between(datetime.utcnow() - timedelta(days=days))
+
+    def between(self, start: datetime, end: Optional[datetime] = None) -> List:
+        """Get the transactions dated in ``[start, end)``, oldest first"""
+        if self._loaded_since is None or start < self._loaded_since:
+            self._load(start)
+        stop = bisect_left(self._dates, end) if end is not None else len(self._rows)
+        return self._rows[bisect_left(self._dates, start):stop]
+
+    def _load(self, since: datetime) -> None:
+        query = self.db.query(
+            Transaction.id,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.category,
+            Transaction.description,
+            Transaction.transaction_date,
+            Transaction.fingerprint
+        ).filter(
+            Transaction.user_id == self.user_id,
+            Transaction.transaction_date >= since
+        )
+        if self.transaction_type is not None:
+            query = query.filter(Transaction.type == self.transaction_type)
+        
+        self._rows = query.order_by(Transaction.transaction_date).all()
+        self._dates = [row.transaction_date for row in self._rows]
+        self._loaded_since = since
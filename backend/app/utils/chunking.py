@@ -0,0 +1,13 @@
+"""Fixed-size chunking for streamed imports"""
+from typing import Iterable, Iterator, List
+
+def chunks(records: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of ``size`` items (the last may be shorter) without materializing it"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
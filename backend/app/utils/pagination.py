@@ -0,0 +1,109 @@
+"""Opaque keyset (cursor) pagination helpers"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the (timestamp, id) position of the last row on a page as an opaque token"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor token back into its (timestamp, id) position"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str]):
+    """Order newest-first by (sort_column, id) and seek past the cursor position if one is given"""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+def set_next_cursor(response: Response, rows: list, limit: int, sort_attr: str) -> None:
+    """Expose the cursor for the following page in a response header when the page is full"""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, sort_attr), last.id)
+
+def benchmark(rows: int, page_size: int, pages: Tuple[int, ...] = (1, 1000), repeat: int = 20) -> None:
+    """Time OFFSET against keyset seeks for early and deep pages of one user's transactions
+    
+    Runs on an in-memory SQLite database built from the models, so it needs no server.
+    """
+    import statistics
+    import time
+    from datetime import timedelta
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session
+    import app.models
+    from app.core.database import Base
+    from app.models.user import User
+    from app.models.transaction import Transaction, TransactionType, TransactionCategory
+    
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start_date = datetime(2015, 1, 1)
+    with Session(engine) as db:
+        db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "username": "bench", "hashed_password": "x"}])
+        db.execute(insert(Transaction), [
+            {
+                "user_id": 1,
+                "amount": 1.0 + i % 100,
+                "type": TransactionType.EXPENSE,
+                "category": TransactionCategory.FOOD,
+                "transaction_date": start_date + timedelta(minutes=i)
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+        
+        base = select(Transaction.id, Transaction.transaction_date).where(Transaction.user_id == 1)
+        ordered = base.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+
+        def median_ms(query) -> float:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                db.execute(query).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings)
+        
+        print(f"{rows} transactions, {page_size} per page (median of {repeat})")
+        for page in pages:
+            offset = (page - 1) * page_size
+            if offset >= rows:
+                continue
+            cursor = None
+            if offset:
+                last_id, last_date = db.execute(ordered.offset(offset - 1).limit(1)).one()
+                cursor = encode_cursor(last_date, last_id)
+            offset_ms = median_ms(ordered.offset(offset).limit(page_size))
+            keyset_ms = median_ms(apply_keyset(base, Transaction.transaction_date, Transaction.id, cursor).limit(page_size))
+            print(f"page {page:>5}: offset {offset_ms:7.3f} ms, keyset {keyset_ms:7.3f} ms")
+
+def main() -> None:
+    """Command-line entry point for the pagination benchmark"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compare OFFSET and keyset pagination on deep pages")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    benchmark(args.rows, args.page_size)
+
+if __name__ == "__main__":
+    main()
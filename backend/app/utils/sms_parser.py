@@ -2,6 +2,7 @@
 import re
 from typing import Optional, Dict
 from datetime import datetime
+from app.utils.keyword_matcher import KeywordMatcher
 
 class SMSParser:
     """Parse UPI transaction SMS from Indian banks"""
@@ -15,44 +16,104 @@ class SMSParser:
         'Kotak': r'Kotak Bank|Kotak'
     }
     
+    # Category keywords, checked in order
+    CATEGORY_KEYWORDS = {
+        'food': ['restaurant', 'cafe', 'food', 'pizza', 'burger', 'swiggy', 'zomato'],
+        'transport': ['uber', 'ola', 'taxi', 'fuel', 'petrol', 'gas', 'parking'],
+        'utilities': ['electricity', 'water', 'internet', 'phone', 'bill'],
+        'entertainment': ['movie', 'cinema', 'game', 'spotify', 'netflix'],
+        'shopping': ['amazon', 'flipkart', 'mall', 'store', 'shop'],
+        'health': ['hospital', 'doctor', 'medicine', 'pharmacy', 'health'],
+        'education': ['school', 'college', 'course', 'book', 'education'],
+        'salary': ['salary', 'payment', 'transfer'],
+        'investment': ['investment', 'mutual', 'stock', 'crypto'],
+        'savings': ['savings', 'deposit', 'transfer']
+    }
+    CATEGORY_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS)
+    
+    # All bank patterns in one case-sensitive alternation of whole words, matched against
+    # the upper-cased text (much cheaper than IGNORECASE); BANK_PATTERNS order breaks ties
+    BANK_PATTERN = re.compile(
+        r'\b(?:' + '|'.join(f'(?P<{bank}>{pattern.upper()})' for bank, pattern in BANK_PATTERNS.items()) + r')\b'
+    )
+    BANK_PRIORITY = {bank: rank for rank, bank in enumerate(BANK_PATTERNS)}
+    
+    # Field templates compiled once; a bank's pattern is tried before the generic one where its format differs
+    _AMOUNT = r'([0-9][0-9,]*(?:\.[0-9]{1,2})?)'
+    GENERIC_TEMPLATE = {
+        'amount': re.compile(r'(?:Rs\.?|INR|₹)\s*' + _AMOUNT, re.IGNORECASE),
+        'upi_ref': re.compile(r'(?:UPI[\s:/-]*Ref(?:erence)?(?:\s*No)?|Ref(?:\s*No)?|UPI)[\s.:#/-]*([0-9]{12})\b', re.IGNORECASE),
+        'vpa': re.compile(r'\b([a-z0-9][a-z0-9.\-_]+@[a-z][a-z0-9]+)\b', re.IGNORECASE),
+        'merchant': re.compile(r'\bto\s+(?!VPA\b|a/?c\b)([A-Za-z][A-Za-z0-9&.\- ]{1,40}?)(?=\s+on\b|\s+Ref|\s*\(|\.\s|$)', re.IGNORECASE),
+        'balance': re.compile(r'(?:Avl\.?\s*Bal(?:ance)?|Available\s+Bal(?:ance)?|Bal)\s*(?:is|:)?\s*(?:Rs\.?|INR|₹)?\s*' + _AMOUNT, re.IGNORECASE)
+    }
+    BANK_TEMPLATES = {
+        'SBI': {
+            'amount': re.compile(r'(?:debited|credited)\s+by\s*(?:Rs\.?|INR|₹)?\s*' + _AMOUNT, re.IGNORECASE),
+            'upi_ref': re.compile(r'Ref\s*no\.?\s*([0-9]{12})\b', re.IGNORECASE),
+            'merchant': re.compile(r'\btrf\s+to\s+([A-Za-z][A-Za-z0-9&.\- ]{1,40}?)(?=\s+Ref|\.|$)', re.IGNORECASE)
+        },
+        'ICICI': {
+            'merchant': re.compile(r';\s*([A-Za-z][A-Za-z0-9&.\- ]{1,40}?)\s+credited', re.IGNORECASE)
+        },
+        'Axis': {
+            'upi_ref': re.compile(r'UPI/[A-Z0-9]+/([0-9]{12})/', re.IGNORECASE),
+            'merchant': re.compile(r'UPI/[A-Z0-9]+/[0-9]{12}/([A-Za-z][A-Za-z0-9&.\- ]{1,40}?)(?=\s+Not\b|\s*$|/)', re.IGNORECASE)
+        }
+    }
+    # The earliest direction word decides; "debited ... Zomato credited" is an expense
+    DIRECTION_PATTERN = re.compile(r'\b(debited|sent|paid|spent|withdrawn|credited|received|deposited)\b', re.IGNORECASE)
+    INCOME_WORDS = frozenset(['credited', 'received', 'deposited'])
+    
     @staticmethod
-    def parse_upi_sms(sms_text: str) -> Optional[Dict]:
+    def parse_upi_sms(sms_text: str, received_at: Optional[datetime] = None) -> Optional[Dict]:
         """
         Parse UPI transaction SMS
         
         Returns:
-            Dict with transaction details or None if parsing fails
+            Dict with transaction details (amount, type, description, bank, merchant,
+            vpa, upi_ref, balance, category) or None if parsing fails
         """
         try:
-            # Extract amount
-            amount_match = re.search(r'Rs\.?\s*([0-9,]+(?:\.[0-9]{2})?)', sms_text)
-            if not amount_match:
+            banks = {match.lastgroup for match in SMSParser.BANK_PATTERN.finditer(sms_text.upper())}
+            bank = min(banks, key=SMSParser.BANK_PRIORITY.get) if banks else 'Unknown'
+            bank_template = SMSParser.BANK_TEMPLATES.get(bank, {})
+            
+            def field(name):
+                # The bank's own format first, then the generic one for its other message types
+                for pattern in (bank_template.get(name), SMSParser.GENERIC_TEMPLATE[name]):
+                    match = pattern.search(sms_text) if pattern is not None else None
+                    if match:
+                        return match.group(1).strip()
                 return None
             
-            amount = float(amount_match.group(1).replace(',', ''))
+            # Extract amount
+            amount = field('amount')
+            if amount is None:
+                return None
+            amount = float(amount.replace(',', ''))
             
             # Determine transaction type
-            transaction_type = 'expense'
-            if any(word in sms_text.lower() for word in ['credited', 'received', 'deposited']):
-                transaction_type = 'income'
+            direction = SMSParser.DIRECTION_PATTERN.search(sms_text)
+            transaction_type = 'income' if direction and direction.group(1).lower() in SMSParser.INCOME_WORDS else 'expense'
             
-            # Extract description/merchant
-            description = sms_text[:100]  # First 100 chars as description
+            merchant, vpa = field('merchant'), field('vpa')
+            balance = field('balance')
             
-            # Identify bank
-            bank = 'Unknown'
-            for bank_name, pattern in SMSParser.BANK_PATTERNS.items():
-                if re.search(pattern, sms_text, re.IGNORECASE):
-                    bank = bank_name
-                    break
+            # Merchant or VPA when found, otherwise the first 100 chars
+            description = (merchant or vpa or sms_text)[:100]
             
             return {
                 'amount': amount,
                 'type': transaction_type,
                 'description': description,
                 'bank': bank,
-                'transaction_date': datetime.utcnow(),
-                'category': 'other'
+                'merchant': merchant,
+                'vpa': vpa,
+                'upi_ref': field('upi_ref'),
+                'balance': float(balance.replace(',', '')) if balance else None,
+                'transaction_date': received_at or datetime.utcnow(),
+                'category': SMSParser.categorize_transaction(description, amount)
             }
         except Exception as e:
             print(f"Error parsing SMS: {e}")
@@ -61,23 +122,5 @@ class SMSParser:
     @staticmethod
     def categorize_transaction(description: str, amount: float) -> str:
         """Categorize transaction based on description"""
-        description_lower = description.lower()
-        
-        categories = {
-            'food': ['restaurant', 'cafe', 'food', 'pizza', 'burger', 'swiggy', 'zomato'],
-            'transport': ['uber', 'ola', 'taxi', 'fuel', 'petrol', 'gas', 'parking'],
-            'utilities': ['electricity', 'water', 'internet', 'phone', 'bill'],
-            'entertainment': ['movie', 'cinema', 'game', 'spotify', 'netflix'],
-            'shopping': ['amazon', 'flipkart', 'mall', 'store', 'shop'],
-            'health': ['hospital', 'doctor', 'medicine', 'pharmacy', 'health'],
-            'education': ['school', 'college', 'course', 'book', 'education'],
-            'salary': ['salary', 'payment', 'transfer'],
-            'investment': ['investment', 'mutual', 'stock', 'crypto'],
-            'savings': ['savings', 'deposit', 'transfer']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        match = SMSParser.CATEGORY_MATCHER.first(description)
+        return match[0] if match else 'other'
@@ -0,0 +1,195 @@
+"""Async vs sync throughput: concurrent list requests against one uvicorn worker
+
+Starts a single uvicorn worker on a throwaway database and fires ``--requests`` list
+requests, ``--concurrency`` at a time, at the async transaction and alert routes
+(AsyncSession on the event loop) and at sync twins of the same queries (Session from
+get_db, run in the threadpool like the routes before the async port). Reports
+requests per second and latency percentiles for each path.
+
+Usage:
+    python -m benchmarks.async_throughput benchmark [--requests 2000] [--concurrency 50]
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+PATHS = {
+    "async transactions": "/api/v1/transactions?limit=50",
+    "sync transactions": "/benchmark/sync/transactions?limit=50",
+    "async alerts": "/api/v1/alerts?limit=50",
+    "sync alerts": "/benchmark/sync/alerts?limit=50"
+}
+
+def create_app():
+    """The API plus sync-session twins of the transaction and alert list routes"""
+    from fastapi import Depends, Query
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from app.main import app
+    from app.api.users import get_current_user
+    from app.core.database import get_db
+    from app.models.alert import Alert
+    from app.models.transaction import Transaction
+    from app.models.user import User
+    from app.schemas.alert import AlertResponse
+    from app.schemas.transaction import TransactionResponse
+
+    @app.get("/benchmark/sync/transactions", response_model=list[TransactionResponse], include_in_schema=False)
+    def list_transactions_sync(
+        limit: int = Query(10, ge=1, le=100),
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ):
+        query = select(Transaction).where(Transaction.user_id == current_user.id)
+        query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+        return db.execute(query.limit(limit)).scalars().all()
+
+    @app.get("/benchmark/sync/alerts", response_model=list[AlertResponse], include_in_schema=False)
+    def list_alerts_sync(
+        limit: int = Query(10, ge=1, le=100),
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ):
+        query = select(Alert).where(Alert.user_id == current_user.id)
+        query = query.order_by(Alert.created_at.desc(), Alert.id.desc())
+        return db.execute(query.limit(limit)).scalars().all()
+    
+    return app
+
+def seed(transactions: int, alerts: int) -> str:
+    """Create one user with history; returns a bearer token for them"""
+    from sqlalchemy import insert
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.models.alert import Alert, AlertSeverity
+    from app.models.transaction import Transaction, TransactionType, TransactionCategory
+    from app.models.user import User
+    
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "username": "bench", "hashed_password": "x"}])
+        db.execute(insert(Transaction), [
+            {
+                "user_id": 1,
+                "amount": 1.0 + i % 100,
+                "type": TransactionType.EXPENSE,
+                "category": TransactionCategory.FOOD,
+                "transaction_date": now - timedelta(hours=i)
+            }
+            for i in range(transactions)
+        ])
+        db.execute(insert(Alert), [
+            {
+                "user_id": 1,
+                "title": f"Alert {i}",
+                "message": "Benchmark alert",
+                "severity": AlertSeverity.INFO,
+                "is_read": False,
+                "created_at": now - timedelta(hours=i)
+            }
+            for i in range(alerts)
+        ])
+        db.commit()
+    return create_access_token(data={"sub": "1"})
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def load(base_url: str, path: str, token: str, requests: int, concurrency: int) -> Dict:
+    """Fire ``requests`` GETs with at most ``concurrency`` in flight; returns throughput and latencies"""
+    import httpx
+    
+    latencies, failures = [], 0
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Bearer {token}"}, limits=limits, timeout=60) as client:
+        for _ in range(concurrency):
+            await client.get(path)
+
+        async def worker():
+            nonlocal failures
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                failures += response.status_code != 200
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "failed": failures
+    }
+
+def wait_until_healthy(base_url: str, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    import httpx
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not become healthy in time")
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def benchmark(requests: int, concurrency: int, transactions: int = 5000, alerts: int = 500) -> None:
+    """Run every path in PATHS against one uvicorn worker on a throwaway database"""
+    from benchmarks import throwaway_database
+    
+    with throwaway_database():
+        token = seed(transactions, alerts)
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "benchmarks.async_throughput:create_app", "--factory",
+                "--host", "127.0.0.1", "--port", str(port), "--workers", "1", "--log-level", "warning"
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.DEVNULL
+        )
+        try:
+            wait_until_healthy(base_url, server)
+            print(f"{requests} requests, {concurrency} concurrent, one uvicorn worker")
+            for label, path in PATHS.items():
+                result = asyncio.run(load(base_url, path, token, requests, concurrency))
+                print(
+                    f"{label:20} {result['requests_per_second']:8.1f} req/s, "
+                    f"p50 {result['p50_ms']:7.1f} ms, p99 {result['p99_ms']:7.1f} ms, {result['failed']} failed"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+def main() -> None:
+    """Command-line entry point for the async vs sync throughput benchmark"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compare async and sync route throughput on one worker")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    benchmark(args.requests, args.concurrency)
+
+if __name__ == "__main__":
+    main()
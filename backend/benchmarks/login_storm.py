@@ -0,0 +1,107 @@
+"""Login-storm benchmark: latency of unrelated requests during a burst of logins
+
+Registers a throwaway user, fires ``--logins`` concurrent logins through the ASGI
+app and probes ``/health`` every 10 ms for as long as they run, once with bcrypt verified on
+the event loop (the behaviour before PasswordHashPool) and once through the pool.
+The /health p99 shows how much a login burst stalls everything else. Runs on a
+throwaway database, so the storm users never reach the configured one.
+
+Usage:
+    python -m benchmarks.login_storm benchmark [--logins 50]
+"""
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+PROBE_INTERVAL_SECONDS = 0.01
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def login_storm(logins: int, inline: bool = False) -> Dict:
+    """Run one storm; returns /health and login latencies in milliseconds plus login outcomes"""
+    import httpx
+    from app.main import app
+    from app.api import auth
+    from app.core.security import verify_password
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        name = f"storm-{uuid.uuid4().hex[:10]}"
+        credentials = {"email": f"{name}@example.com", "password": "storm-password"}
+        await client.post("/api/v1/auth/register", json={**credentials, "username": name, "full_name": "Login Storm"})
+        
+        original = auth.verify_password_async
+        if inline:
+            async def verify_on_loop(plain_password, hashed_password):
+                return verify_password(plain_password, hashed_password)
+            auth.verify_password_async = verify_on_loop
+        
+        probes, login_times, statuses = [], [], []
+        storm_over = asyncio.Event()
+
+        async def probe():
+            # Timed from when each probe was due, so a stalled loop counts against it
+            due = time.perf_counter()
+            while not storm_over.is_set():
+                await client.get("/health")
+                probes.append(time.perf_counter() - due)
+                due = max(due + PROBE_INTERVAL_SECONDS, time.perf_counter())
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+        async def login():
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", json=credentials)
+            login_times.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+        
+        prober = asyncio.create_task(probe())
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.gather(*(login() for _ in range(logins)))
+        finally:
+            storm_over.set()
+            await prober
+            auth.verify_password_async = original
+    
+    return {
+        "health_p50_ms": percentile(probes, 0.5) * 1000,
+        "health_p99_ms": percentile(probes, 0.99) * 1000,
+        "health_max_ms": max(probes) * 1000,
+        "login_p50_ms": statistics.median(login_times) * 1000,
+        "ok": statuses.count(200),
+        "rejected": statuses.count(503)
+    }
+
+def main() -> None:
+    """Command-line entry point for the login-storm benchmark"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Measure /health latency while a burst of logins is verified")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+    
+    from benchmarks import throwaway_database
+    with throwaway_database():
+        from app.core.security import password_hash_pool
+
+        async def run():
+            for inline in (True, False):
+                result = await login_storm(args.logins, inline)
+                label = "hash on event loop" if inline else "password hash pool"
+                print(
+                    f"{label:20} /health p50 {result['health_p50_ms']:7.1f} ms, p99 {result['health_p99_ms']:7.1f} ms, "
+                    f"max {result['health_max_ms']:7.1f} ms | login p50 {result['login_p50_ms']:7.1f} ms, "
+                    f"{result['ok']} ok, {result['rejected']} rejected"
+                )
+        
+        try:
+            asyncio.run(run())
+        finally:
+            password_hash_pool.shutdown()
+
+if __name__ == "__main__":
+    main()
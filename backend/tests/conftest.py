@@ -0,0 +1,71 @@
+"""Shared fixtures: the app runs against a throwaway SQLite file"""
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fincoach-tests-'), 'test.db')}"
+os.environ.setdefault("NOTIFICATION_BACKPLANE", "memory")
+# Tests run the recurring series refresh themselves
+os.environ.setdefault("RECURRING_REFRESH_INTERVAL_SECONDS", "3600")
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import app
+    return app
+
+@pytest.fixture(scope="session")
+def client(app):
+    """One client for the whole run: shutdown stops process-wide pools that startup does not recreate"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def register(client):
+    """Register and log in a fresh user; returns (user id, auth headers)"""
+    def make(monthly_income: float = 5000):
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        client.post("/api/v1/auth/register", json={
+            "email": email, "username": email.split("@")[0], "password": "pw123456", "monthly_income": monthly_income
+        })
+        token = client.post("/api/v1/auth/login", json={"email": email, "password": "pw123456"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        return client.get("/api/v1/users/me", headers=headers).json()["id"], headers
+    return make
+
+@pytest.fixture
+def db():
+    from app.core.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def captured_queries():
+    """Context manager collecting (statement, parameters) of every SELECT run by either engine"""
+    from sqlalchemy import event
+    from app.core.database import engine, async_engine
+
+    @contextmanager
+    def capture_selects():
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+        
+        engines = [engine, async_engine.sync_engine]
+        for target in engines:
+            event.listen(target, "before_cursor_execute", capture)
+        try:
+            yield statements
+        finally:
+            for target in engines:
+                event.remove(target, "before_cursor_execute", capture)
+    
+    return capture_selects
@@ -0,0 +1,67 @@
+"""The anomaly stage worker survives failures and keeps its queue"""
+import asyncio
+from datetime import datetime
+import pytest
+from app.api import notifications
+from app.services.anomaly_stage import AnomalyStage
+
+def staged_expense(amount):
+    return (1, datetime.utcnow(), "expense", "food", amount, "lunch")
+
+@pytest.fixture
+def stage(monkeypatch):
+    """A stage whose scoring raises one alert per transaction without touching the database"""
+    stage = AnomalyStage(batch_size=2)
+
+    def process(batch):
+        stage.processed += len(batch)
+        return [(user_id, {"type": "alert", "amount": amount}) for user_id, _, _, _, amount, _ in batch]
+    
+    monkeypatch.setattr(stage, "_process", process)
+    return stage
+
+def test_failed_delivery_does_not_kill_the_worker(stage, monkeypatch):
+    delivered = []
+
+    async def broadcast(user_id, message):
+        if message["amount"] == 1:
+            raise ConnectionError("backplane down")
+        delivered.append(message["amount"])
+    
+    monkeypatch.setattr(notifications.manager, "broadcast_to_user", broadcast)
+
+    async def scenario():
+        stage.submit([staged_expense(1), staged_expense(2), staged_expense(3)])
+        worker = stage._worker
+        await stage.drain()
+        stage.submit([staged_expense(4)])
+        await stage.drain()
+        assert stage._worker is worker and not worker.done()
+        await stage.stop()
+    
+    asyncio.run(scenario())
+    assert delivered == [2, 3, 4]
+    assert stage.processed == 4
+
+def test_restarted_worker_keeps_the_queue_and_stop_drains_it(stage, monkeypatch):
+    delivered = []
+
+    async def broadcast(user_id, message):
+        delivered.append(message["amount"])
+    
+    monkeypatch.setattr(notifications.manager, "broadcast_to_user", broadcast)
+
+    async def scenario():
+        stage.submit([staged_expense(1), staged_expense(2)])
+        queue = stage._queue
+        stage._worker.cancel()
+        await asyncio.sleep(0)
+        assert stage._worker.done()
+        
+        stage.submit([staged_expense(3)])
+        assert stage._queue is queue
+        await stage.stop()
+        assert stage._worker is None
+    
+    asyncio.run(scenario())
+    assert sorted(delivered) == [1, 2, 3]
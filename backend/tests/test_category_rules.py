@@ -0,0 +1,18 @@
+"""Custom categorization rules only accept real transaction categories"""
+
+def test_rule_with_unknown_category_is_rejected(client, register):
+    _, headers = register()
+    response = client.post("/api/v1/ml/categorize/rules", json={"keyword": "dmart", "category": "groceries"}, headers=headers)
+    assert response.status_code == 422
+    assert client.get("/api/v1/ml/categorize/rules", headers=headers).json()["rules"] == []
+
+def test_rule_applies_to_categorization(client, register):
+    _, headers = register()
+    response = client.post("/api/v1/ml/categorize/rules", json={"keyword": "DMart", "category": "food"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["message"] == "Added 'DMart' to 'food' category"
+    
+    rules = client.get("/api/v1/ml/categorize/rules", headers=headers).json()["rules"]
+    assert [(rule["keyword"], rule["category"]) for rule in rules] == [("dmart", "food")]
+    result = client.post("/api/v1/ml/categorize", json={"description": "POS DMART 4410"}, headers=headers).json()
+    assert result["category"] == "food"
@@ -0,0 +1,105 @@
+"""Running category statistics stay equal to a batch mean/variance through every write path"""
+import statistics
+from datetime import datetime, timedelta
+import pytest
+from app.ml_modules.anomaly_detector import AnomalyDetector
+from app.models.category_stats import UserCategoryStats
+
+def row(amount, category="food", type="expense", days_ago=3):
+    when = datetime.utcnow().replace(microsecond=0) - timedelta(days=days_ago)
+    return {"amount": amount, "type": type, "category": category, "description": f"{category} {amount}", "transaction_date": when.isoformat()}
+
+def assert_matches_batch(db, user_id, expected):
+    """Compare every stats row with statistics.fmean/pvariance over the amounts we expect to be left"""
+    db.expire_all()
+    stored = {
+        r.category.value: r
+        for r in db.query(UserCategoryStats).filter(UserCategoryStats.user_id == user_id, UserCategoryStats.count > 0)
+    }
+    assert set(stored) == {category for category, amounts in expected.items() if amounts}
+    for category, amounts in expected.items():
+        if amounts:
+            stats = stored[category]
+            assert stats.count == len(amounts)
+            assert stats.mean == pytest.approx(statistics.fmean(amounts))
+            assert stats.variance == pytest.approx(statistics.pvariance(amounts), abs=1e-9)
+
+def test_stats_follow_create_update_delete_and_bulk(client, register, db):
+    user_id, headers = register()
+    expected = {"food": [], "transport": [], "shopping": []}
+    
+    bulk = [row(12.5), row(40), row(7.25), row(19, "transport"), row(3000, "salary", "income"), row(55, "transport")]
+    assert client.post("/api/v1/transactions/bulk", json=bulk, headers=headers).status_code == 200
+    expected["food"] += [12.5, 40, 7.25]
+    expected["transport"] += [19, 55]
+    assert_matches_batch(db, user_id, expected)
+    
+    created = client.post("/api/v1/transactions", json=row(23), headers=headers).json()
+    other = client.post("/api/v1/transactions", json=row(61, "transport"), headers=headers).json()
+    expected["food"].append(23)
+    expected["transport"].append(61)
+    assert_matches_batch(db, user_id, expected)
+    
+    # Amount change, then a category change, then expense -> income
+    assert client.put(f"/api/v1/transactions/{created['id']}", json={"amount": 31}, headers=headers).status_code == 200
+    expected["food"][expected["food"].index(23)] = 31
+    assert_matches_batch(db, user_id, expected)
+    
+    assert client.put(f"/api/v1/transactions/{created['id']}", json={"category": "shopping"}, headers=headers).status_code == 200
+    expected["food"].remove(31)
+    expected["shopping"].append(31)
+    assert_matches_batch(db, user_id, expected)
+    
+    assert client.put(f"/api/v1/transactions/{other['id']}", json={"type": "income"}, headers=headers).status_code == 200
+    expected["transport"].remove(61)
+    assert_matches_batch(db, user_id, expected)
+    
+    assert client.delete(f"/api/v1/transactions/{created['id']}", headers=headers).status_code == 204
+    expected["shopping"].remove(31)
+    assert_matches_batch(db, user_id, expected)
+    
+    # A second bulk batch merges into the existing rows
+    assert client.post("/api/v1/transactions/bulk", json=[row(9.99), row(120), row(14, "transport")], headers=headers).status_code == 200
+    expected["food"] += [9.99, 120]
+    expected["transport"].append(14)
+    assert_matches_batch(db, user_id, expected)
+
+def test_unusual_spending_scores_against_the_whole_history(client, register):
+    """z = (amount - mean) / population std dev over every stored expense of the category, however old"""
+    _, headers = register()
+
+    def check(amount):
+        return client.post(
+            "/api/v1/ml/anomaly/detect-unusual-spending",
+            json={"transaction_amount": amount, "category": "food"},
+            headers=headers
+        ).json()
+    
+    history = [20, 22, 18, 25]
+    client.post("/api/v1/transactions/bulk", json=[row(a) for a in history], headers=headers)
+    assert check(100)["status"] == "insufficient_data"
+    
+    # Two years old: outside any look-back window, still part of the statistics
+    history.append(30)
+    client.post("/api/v1/transactions/bulk", json=[row(30, days_ago=730)], headers=headers)
+    result = check(45)
+    
+    mean, std_dev = statistics.fmean(history), statistics.pstdev(history)
+    assert result["status"] == "success"
+    assert result["category_average"] == round(mean, 2)
+    assert result["category_std_dev"] == round(std_dev, 2)
+    assert result["z_score"] == round((45 - mean) / std_dev, 2)
+    assert result["is_anomaly"] is True and result["severity"] == "critical"
+    assert check(mean)["is_anomaly"] is False
+
+def test_unknown_category_is_rejected_not_a_server_error(client, register, db):
+    user_id, headers = register()
+    response = client.post(
+        "/api/v1/ml/anomaly/detect-unusual-spending",
+        json={"transaction_amount": 50, "category": "groceries"},
+        headers=headers
+    )
+    assert response.status_code == 422
+    
+    # Internal callers passing free-form categories get no statistics rather than an error
+    assert AnomalyDetector(db).detect_unusual_spending(user_id, 50, "groceries")["status"] == "insufficient_data"
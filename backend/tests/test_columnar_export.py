@@ -0,0 +1,56 @@
+"""Columnar snapshots: Parquet and Arrow IPC round trips, partitions and stale months"""
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+from app.models.transaction import Transaction
+from app.services.columnar_export import write_snapshot
+
+ROWS = [
+    {"amount": 12.5, "type": "expense", "category": "food", "description": "lunch", "transaction_date": "2025-12-30T12:00:00"},
+    {"amount": 3000, "type": "income", "category": "salary", "description": "salary", "transaction_date": "2026-01-31T09:00:00"},
+    {"amount": 40, "type": "expense", "category": "transport", "description": "fuel", "transaction_date": "2026-02-10T18:30:00"}
+]
+
+@pytest.fixture
+def user_id(client, register):
+    user_id, headers = register()
+    _, other_headers = register()
+    client.post("/api/v1/transactions/bulk", json=ROWS, headers=headers)
+    client.post("/api/v1/transactions/bulk", json=[{**ROWS[0], "description": "someone else"}], headers=other_headers)
+    return user_id
+
+def partitions(output):
+    return sorted(
+        f"{year.name}/{month.name}" for year in output.iterdir() for month in year.iterdir()
+    )
+
+@pytest.mark.parametrize("format, dataset_format", [("parquet", "parquet"), ("arrow", "ipc")])
+def test_snapshot_round_trips_with_dictionary_columns(db, user_id, tmp_path, format, dataset_format):
+    output = tmp_path / format
+    assert write_snapshot(db, str(output), user_id, format) == len(ROWS)
+    assert partitions(output) == ["year=2025/month=12", "year=2026/month=1", "year=2026/month=2"]
+    
+    dataset = ds.dataset(str(output), format=dataset_format, partitioning="hive")
+    table = dataset.to_table().sort_by("transaction_date")
+    assert table.schema.field("type").type == pa.dictionary(pa.int8(), pa.string())
+    assert table.schema.field("category").type == pa.dictionary(pa.int8(), pa.string())
+    assert set(table.column("user_id").to_pylist()) == {user_id}
+    assert table.column("description").to_pylist() == ["lunch", "salary", "fuel"]
+    assert table.column("type").to_pylist() == ["expense", "income", "expense"]
+    assert table.column("category").to_pylist() == ["food", "salary", "transport"]
+    assert table.column("month").to_pylist() == [12, 1, 2]
+
+def test_rewriting_drops_months_without_transactions(db, user_id, tmp_path):
+    output = tmp_path / "snapshot"
+    write_snapshot(db, str(output), user_id)
+    db.query(Transaction).filter(Transaction.user_id == user_id, Transaction.description == "fuel").delete()
+    db.commit()
+    
+    assert write_snapshot(db, str(output), user_id) == 2
+    assert partitions(output) == ["year=2025/month=12", "year=2026/month=1"]
+
+def test_refuses_to_clear_a_directory_that_is_not_a_snapshot(db, user_id, tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(ValueError):
+        write_snapshot(db, str(tmp_path), user_id)
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
@@ -0,0 +1,93 @@
+"""Idempotent transaction writes: retries return the original row, failed chunks are reported"""
+from sqlalchemy.exc import OperationalError
+from app.api import transactions as transactions_api
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate
+from app.services import bulk_ingest
+from app.services.bulk_ingest import TransactionBulkWriter
+
+def transaction(key=None, amount=12.5):
+    return {
+        "amount": amount,
+        "type": "expense",
+        "category": "food",
+        "description": "lunch",
+        "transaction_date": "2026-10-01T12:00:00",
+        "idempotency_key": key
+    }
+
+def test_retry_returns_the_original_transaction(client, register):
+    _, headers = register()
+    first = client.post("/api/v1/transactions", json=transaction("retry-1"), headers=headers)
+    second = client.post("/api/v1/transactions", json=transaction("retry-1", amount=99), headers=headers)
+    assert second.json()["id"] == first.json()["id"]
+    assert second.json()["amount"] == 12.5
+
+def test_concurrent_retry_that_loses_the_insert_race(client, register, monkeypatch):
+    _, headers = register()
+    first = client.post("/api/v1/transactions", json=transaction("race-1"), headers=headers).json()
+    
+    # The losing request checked for the key before the winner committed
+    lookup = transactions_api._find_by_idempotency_key
+    calls = []
+    async def stale_then_fresh(db, user_id, key):
+        calls.append(key)
+        return None if len(calls) == 1 else await lookup(db, user_id, key)
+    monkeypatch.setattr(transactions_api, "_find_by_idempotency_key", stale_then_fresh)
+    
+    response = client.post("/api/v1/transactions", json=transaction("race-1"), headers=headers)
+    assert response.status_code == 201
+    assert response.json()["id"] == first["id"]
+    assert len(calls) == 2
+
+def test_failed_chunk_is_reported_per_row(register, db, monkeypatch):
+    user_id, _ = register()
+    added_many = bulk_ingest.TransactionEvents.added_many
+    calls = []
+    def fail_second_chunk(self, snapshots):
+        calls.append(len(snapshots))
+        if len(calls) == 2:
+            raise OperationalError("UPDATE user_monthly_rollup", {}, Exception("database is locked"))
+        return added_many(self, snapshots)
+    monkeypatch.setattr(bulk_ingest.TransactionEvents, "added_many", fail_second_chunk)
+    
+    rows = [
+        (index, TransactionCreate(**transaction(f"chunk-{user_id}-{index}", amount=index + 1)))
+        for index in range(5)
+    ]
+    written = TransactionBulkWriter(db, chunk_size=2).write_idempotent(user_id, rows)
+    
+    assert [result["index"] for result in written["results"]] == [0, 1, 4]
+    assert all(result["status"] == "created" for result in written["results"])
+    assert [error["index"] for error in written["errors"]] == [2, 3]
+    assert "database is locked" in written["errors"][0]["errors"][0]
+    
+    stored = {key for key, in db.query(Transaction.idempotency_key).filter(Transaction.user_id == user_id)}
+    assert stored == {f"chunk-{user_id}-{index}" for index in (0, 1, 4)}
+
+def test_conflicting_row_fails_alone_in_a_bulk_chunk(client, register, db):
+    user_id, headers = register()
+    rows = [transaction(f"bulk-{user_id}-{index}", amount=index + 1) for index in range(6)]
+    rows[4]["idempotency_key"] = rows[1]["idempotency_key"]
+    
+    body = client.post("/api/v1/transactions/bulk", json=rows, headers=headers).json()
+    
+    assert body["status"] == "partial"
+    assert body["inserted"] == 5
+    assert [error["index"] for error in body["errors"]] == [4]
+    amounts = sorted(amount for amount, in db.query(Transaction.amount).filter(Transaction.user_id == user_id))
+    assert amounts == [1, 2, 3, 4, 6]
+
+def test_offline_sync_message_follows_the_status(client, register):
+    _, headers = register()
+    clean = client.post("/api/v1/mobile/sync-offline-data", json={"transactions": [transaction()]}, headers=headers).json()
+    assert clean["status"] == "success"
+    assert clean["message"] == "Offline data synced successfully"
+    
+    partial = client.post(
+        "/api/v1/mobile/sync-offline-data",
+        json={"transactions": [transaction(), {**transaction(), "amount": "lots"}]},
+        headers=headers
+    ).json()
+    assert partial["status"] == "partial"
+    assert partial["message"] == "Offline data partially synced; 1 item(s) failed"
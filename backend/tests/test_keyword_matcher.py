@@ -0,0 +1,23 @@
+"""The compiled keyword matcher agrees with the substring loop it replaced on whole-word keywords"""
+import pytest
+from app.ml_modules.categorizer import TransactionCategorizer
+from app.utils.keyword_matcher import KeywordMatcher, substring_first
+
+TABLE = TransactionCategorizer.CATEGORY_KEYWORDS
+
+@pytest.mark.parametrize("text", [
+    "UPI/SWIGGY ORDER 8812",
+    "POS Netflix subscription",
+    "monthly mutual fund SIP",
+    "neft ref 99120 salary oct",
+    "txn 1234 no keyword here",
+    "Uber trip then Starbucks coffee",
+])
+def test_same_first_match_as_substring_loop(text):
+    assert KeywordMatcher(TABLE).first(text) == substring_first(TABLE, text)
+
+def test_keywords_match_whole_words_only():
+    matcher = KeywordMatcher({"transport": ["gas", "bus"], "shopping": ["shop"]})
+    assert matcher.first("Las Vegas business trip") is None
+    assert matcher.first("GAS station") == ("transport", "gas")
+    assert matcher.matches("two shops and a bus") == {"transport": ["bus"], "shopping": ["shop"]}
@@ -0,0 +1,102 @@
+"""Notifications reach every socket across worker processes sharing the database backplane"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from app.services.notification_backplane import Backplane
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKERS = 3
+SOCKETS_PER_WORKER = 2
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+@pytest.fixture
+def workers(tmp_path):
+    """Start WORKERS uvicorn processes, each on its own port, over one SQLite file; yields their base URLs"""
+    from app.core.database import Base
+    import app.models  # registers every table on Base.metadata
+    
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    
+    env = dict(os.environ, DATABASE_URL=url, NOTIFICATION_BACKPLANE="database", NOTIFICATION_POLL_INTERVAL_SECONDS="0.05")
+    ports = [free_port() for _ in range(WORKERS)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for port in ports
+    ]
+    try:
+        bases = [f"http://127.0.0.1:{port}" for port in ports]
+        deadline = time.monotonic() + 90
+        for base in bases:
+            # uvicorn only accepts connections once startup (and the backplane subscription) is done
+            while True:
+                try:
+                    httpx.get(f"{base}/health", timeout=1)
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        pytest.fail(f"Worker at {base} did not start")
+                    time.sleep(0.2)
+        yield bases
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+def test_notification_reaches_every_socket_on_every_worker(workers):
+    websockets = pytest.importorskip("websockets")
+    credentials = {"email": "fanout@example.com", "password": "pw123456"}
+    httpx.post(f"{workers[0]}/api/v1/auth/register", json={**credentials, "username": "fanout", "monthly_income": 5000})
+    token = httpx.post(f"{workers[0]}/api/v1/auth/login", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = httpx.get(f"{workers[0]}/api/v1/users/me", headers=headers).json()["id"]
+
+    async def scenario():
+        sockets = []
+        try:
+            for base in workers:
+                for _ in range(SOCKETS_PER_WORKER):
+                    connection = await websockets.connect(f"{base.replace('http', 'ws', 1)}/api/v1/notifications/ws/{user_id}")
+                    sockets.append(connection)
+                    assert json.loads(await connection.recv())["type"] == "connection"
+            
+            # Published on the last worker; the others only see it through the outbox
+            async with httpx.AsyncClient() as client:
+                response = await client.post(f"{workers[-1]}/api/v1/notifications/send-test-notification", headers=headers)
+            assert response.status_code == 200
+            return [json.loads(await asyncio.wait_for(connection.recv(), 10)) for connection in sockets]
+        finally:
+            for connection in sockets:
+                await connection.close()
+    
+    messages = asyncio.run(scenario())
+    assert len(messages) == WORKERS * SOCKETS_PER_WORKER
+    assert {message["type"] for message in messages} == {"notification"}
+    assert len({message["id"] for message in messages}) == 1
+
+def test_backplanes_must_implement_start_and_publish():
+    class SubscribeOnly(Backplane):
+        async def start(self, deliver):
+            pass
+    
+    with pytest.raises(TypeError):
+        Backplane()
+    with pytest.raises(TypeError):
+        SubscribeOnly()
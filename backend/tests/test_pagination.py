@@ -0,0 +1,33 @@
+"""Keyset cursor pagination on the list endpoints"""
+import pytest
+
+LISTS = ["/api/v1/transactions", "/api/v1/alerts", "/api/v1/notifications/list"]
+
+@pytest.mark.parametrize("path", LISTS)
+def test_invalid_cursor_is_a_bad_request(client, register, path):
+    _, headers = register()
+    response = client.get(path, params={"cursor": "garbage"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+def test_cursor_walk_returns_every_row_once(client, register):
+    _, headers = register()
+    # Shared timestamps make the id tiebreaker matter
+    rows = [
+        {"amount": i + 1, "type": "expense", "category": "food", "transaction_date": f"2026-05-0{1 + i % 3}T09:00:00"}
+        for i in range(25)
+    ]
+    client.post("/api/v1/transactions/bulk", json=rows, headers=headers)
+    
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/transactions", params=params, headers=headers)
+        seen.extend(transaction["id"] for transaction in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    
+    by_offset = client.get("/api/v1/transactions", params={"limit": 100}, headers=headers).json()
+    assert seen == [transaction["id"] for transaction in by_offset]
+    assert len(set(seen)) == 25
@@ -0,0 +1,39 @@
+"""Queue accounting of the password hashing pool"""
+import asyncio
+import threading
+import pytest
+from app.core.security import PasswordHashPool, PasswordHashPoolBusy
+
+def test_cancelled_waits_release_their_queue_slots():
+    pool = PasswordHashPool(max_in_flight=1, max_queued=3)
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        waiting = [asyncio.ensure_future(pool.run(lambda: "never")) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.queued == 2
+        
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+        assert pool.queued == 0
+        
+        # The freed slots are usable again while the worker is still busy
+        more = [asyncio.ensure_future(pool.run(lambda: "ok")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHashPoolBusy):
+            await pool.run(lambda: "rejected")
+        
+        release.set()
+        assert await blocker is True
+        assert await asyncio.gather(*more) == ["ok"] * 3
+    
+    try:
+        asyncio.run(scenario())
+        assert pool.queued == 0 and pool.in_flight == 0
+        assert pool.completed == 4
+    finally:
+        release.set()
+        pool.shutdown()
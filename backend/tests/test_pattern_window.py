@@ -0,0 +1,34 @@
+"""/patterns/all runs every detector off one shared transaction window"""
+from datetime import datetime, timedelta
+from app.core.config import settings
+
+def test_all_patterns_reads_transactions_once(client, register, captured_queries, monkeypatch):
+    # Background scoring of the seed rows would run its own queries during the capture
+    monkeypatch.setattr(settings, "ANOMALY_STAGE_ENABLED", False)
+    _, headers = register()
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    categories = ["food", "transport", "shopping", "entertainment"]
+    rows = [
+        {
+            "amount": 50 + (i % 7) * 20 + (900 if i == 40 else 0),
+            "type": "expense",
+            "category": categories[i % len(categories)],
+            "description": f"purchase {i}",
+            "transaction_date": (today - timedelta(days=i % 85, hours=i % 9)).isoformat()
+        }
+        for i in range(120)
+    ]
+    # The same purchase entered twice
+    rows += [{"amount": 42.5, "type": "expense", "category": "food", "description": "Cafe Mocha", "transaction_date": (today - timedelta(days=2)).isoformat()}] * 2
+    assert client.post("/api/v1/transactions/bulk", json=rows, headers=headers).json()["failed"] == 0
+    
+    with captured_queries() as statements:
+        response = client.get("/api/v1/patterns/all", headers=headers)
+    
+    assert response.status_code == 200
+    patterns = response.json()["patterns"]
+    assert patterns["spending_patterns"] != {"status": "insufficient_data"}
+    duplicates = [a for a in patterns["anomalies"]["anomalies"] if a["anomaly_type"] == "potential_duplicate"]
+    assert [(d["category"], d["amount"], d["count"]) for d in duplicates] == [("food", 42.5, 2)]
+    transaction_queries = [statement for statement, _ in statements if "FROM transactions" in statement]
+    assert len(transaction_queries) == 1, "\n\n".join(transaction_queries)
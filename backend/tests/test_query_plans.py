@@ -0,0 +1,47 @@
+"""Hot read paths must stay on their indexes: no full scans of transactions or alerts"""
+import sqlite3
+import pytest
+from app.core.config import settings
+
+HOT_PATHS = [
+    "/api/v1/transactions/stats/summary",
+    "/api/v1/transactions?limit=20",
+    "/api/v1/notifications/unread-count",
+    "/api/v1/notifications/list?limit=20",
+]
+
+def query_plan(statement, parameters):
+    connection = sqlite3.connect(settings.DATABASE_URL.removeprefix("sqlite:///"))
+    try:
+        return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())]
+    finally:
+        connection.close()
+
+@pytest.fixture
+def seeded_headers(client, register):
+    _, headers = register()
+    rows = [
+        {
+            "amount": 10 + i,
+            "type": "expense" if i % 4 else "income",
+            "category": "food",
+            "description": f"row {i}",
+            "transaction_date": f"2026-0{1 + i % 9}-1{i % 9}T10:00:00"
+        }
+        for i in range(200)
+    ]
+    assert client.post("/api/v1/transactions/bulk", json=rows, headers=headers).status_code == 200
+    client.post("/api/v1/notifications/send-test-notification", headers=headers)
+    return headers
+
+@pytest.mark.parametrize("path", HOT_PATHS)
+def test_hot_query_uses_an_index(client, seeded_headers, captured_queries, path):
+    with captured_queries() as statements:
+        assert client.get(path, headers=seeded_headers).status_code == 200
+
+    hot = [(s, p) for s, p in statements if " transactions" in s or " alerts" in s]
+    assert hot, f"{path} ran no query against transactions or alerts"
+    for statement, parameters in hot:
+        plan = query_plan(statement, parameters)
+        scans = [step for step in plan if step.startswith(("SCAN transactions", "SCAN alerts"))]
+        assert not scans, f"{path} scans a table:\n{statement}\n{plan}"
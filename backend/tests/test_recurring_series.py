@@ -0,0 +1,37 @@
+"""Writes only extend recurring series; everything else is re-detected by the background refresh"""
+from datetime import datetime, timedelta
+from app.models.recurring import RecurringSeries, RecurringSeriesDirty
+from app.services.recurring_series import RecurringSeriesIndex
+
+def expense(amount, when, category="utilities", description="Broadband"):
+    return {"amount": amount, "type": "expense", "category": category, "description": description, "transaction_date": when.isoformat()}
+
+def test_unmatched_expenses_are_marked_dirty_and_refreshed_in_batch(client, register, db):
+    user_id, headers = register()
+    start = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) - timedelta(days=120)
+    bills = [expense(49.99, start + timedelta(days=30 * i)) for i in range(4)]
+    assert client.post("/api/v1/transactions/bulk", json=bills, headers=headers).status_code == 200
+    
+    # Nothing was re-detected on the request path, only marked
+    assert db.query(RecurringSeries).filter(RecurringSeries.user_id == user_id).count() == 0
+    marks = db.query(RecurringSeriesDirty).filter(RecurringSeriesDirty.user_id == user_id).all()
+    assert [mark.category.value for mark in marks] == ["utilities"]
+    
+    assert RecurringSeriesIndex(db).refresh_dirty() >= 1
+    assert db.query(RecurringSeriesDirty).filter(RecurringSeriesDirty.user_id == user_id).count() == 0
+    series = client.get("/api/v1/patterns/recurring", headers=headers).json()["series"]
+    assert [(s["category"], s["cadence"], s["occurrences"]) for s in series] == [("utilities", "monthly", 4)]
+    
+    # The next bill extends the series inline and leaves nothing to refresh
+    next_bill = expense(49.99, start + timedelta(days=120))
+    assert client.post("/api/v1/transactions", json=next_bill, headers=headers).status_code in (200, 201)
+    assert db.query(RecurringSeriesDirty).filter(RecurringSeriesDirty.user_id == user_id).count() == 0
+    series = client.get("/api/v1/patterns/recurring", headers=headers).json()["series"]
+    assert series[0]["occurrences"] == 5
+    
+    # A one-off expense in the category only marks it again
+    one_off = expense(300, start + timedelta(days=100), description="Router")
+    assert client.post("/api/v1/transactions", json=one_off, headers=headers).status_code in (200, 201)
+    db.expire_all()
+    assert db.query(RecurringSeriesDirty).filter(RecurringSeriesDirty.user_id == user_id).count() == 1
+    assert client.get("/api/v1/patterns/recurring", headers=headers).json()["series"][0]["occurrences"] == 5
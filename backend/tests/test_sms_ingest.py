@@ -0,0 +1,69 @@
+"""SMS inbox ingestion: UPI-reference and hash dedupe keys, the worker pool and the upload limit"""
+import json
+import pytest
+from app.core.config import settings
+from app.models.transaction import Transaction
+from app.services.sms_ingest import SMSIngestor, parse_sms_records
+
+SBI = "Dear Customer, your A/c X1234 is debited by Rs.250.00 on 12Oct26 trf to SWIGGY Ref no 512345678901. If not done by you, call 1800111109 -SBI"
+ICICI = "ICICI Bank Acct XX345 debited for Rs 1,499.00 on 03-Oct-26; Netflix credited. UPI:612345678901. Call 18002662 for dispute."
+ATM = "Rs 300 withdrawn at ATM. SBI"
+OTP = "Your SBI OTP is 482913. Do not share it with anyone."
+
+def inbox():
+    return [
+        {"body": SBI, "date": 1792000000000, "sender": "SBIINB"},
+        {"body": ICICI, "date": 1792100000000, "sender": "ICICIB"},
+        {"body": ATM, "date": 1792200000000, "sender": "SBIINB"},
+        {"body": OTP, "date": 1792300000000, "sender": "SBIINB"},
+        None
+    ]
+
+def stored_keys(db, user_id):
+    return sorted(key for key, in db.query(Transaction.idempotency_key).filter(Transaction.user_id == user_id))
+
+def test_reimport_is_deduplicated_by_upi_reference(register, db):
+    user_id, _ = register()
+    first = SMSIngestor(db).ingest(user_id, inbox())
+    assert (first["received"], first["parsed"], first["not_transactions"], first["inserted"]) == (5, 3, 2, 3)
+    
+    # The same transfer forwarded again, reworded and later: same UPI reference, same transaction
+    again = inbox() + [{"body": SBI.replace("Dear Customer, your", "Your"), "date": 1792400000000}]
+    second = SMSIngestor(db).ingest(user_id, again)
+    assert (second["inserted"], second["duplicates"]) == (0, 4)
+    assert stored_keys(db, user_id) == sorted(
+        ["upi:512345678901", "upi:612345678901", parse_sms_records([inbox()[2]])[0]["idempotency_key"]]
+    )
+
+def test_messages_without_a_reference_are_keyed_by_a_hash():
+    atm, same, other_sender, later = parse_sms_records([
+        {"body": ATM, "date": 1792200000000, "sender": "SBIINB"},
+        {"body": ATM, "date": 1792200000000, "sender": "SBIINB"},
+        {"body": ATM, "date": 1792200000000, "sender": "SBIATM"},
+        {"body": ATM, "date": 1792286400000, "sender": "SBIINB"}
+    ])
+    assert atm["idempotency_key"].startswith("sms:")
+    assert same["idempotency_key"] == atm["idempotency_key"]
+    assert len({atm["idempotency_key"], other_sender["idempotency_key"], later["idempotency_key"]}) == 3
+
+def test_worker_pool_gives_the_same_result_as_inline_parsing(register, db):
+    inline_user, _ = register()
+    pooled_user, _ = register()
+    records = inbox() * 3
+    
+    inline = SMSIngestor(db, workers=1, chunk_size=2).ingest(inline_user, records)
+    pooled = SMSIngestor(db, workers=2, chunk_size=2).ingest(pooled_user, records)
+    assert pooled == inline
+    assert (inline["inserted"], inline["duplicates"]) == (3, 6)
+    assert stored_keys(db, pooled_user) == stored_keys(db, inline_user)
+
+@pytest.mark.parametrize("chunked", [False, True], ids=["content-length", "chunked"])
+def test_oversized_inbox_is_rejected_with_413(client, register, monkeypatch, chunked):
+    monkeypatch.setattr(settings, "SMS_IMPORT_MAX_BYTES", 64)
+    _, headers = register()
+    body = "\n".join(json.dumps(record) for record in inbox()).encode()
+    content = (body[i:i + 16] for i in range(0, len(body), 16)) if chunked else body
+    
+    response = client.post("/api/v1/mobile/sms/import", content=content, headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert response.status_code == 413
+    assert client.get("/api/v1/transactions", headers=headers).json() == []
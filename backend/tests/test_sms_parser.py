@@ -0,0 +1,40 @@
+"""SMSParser bank templates and the generic fallback"""
+import pytest
+from app.utils.sms_parser import SMSParser
+
+FIELDS = ("amount", "type", "bank", "merchant", "vpa", "upi_ref", "balance", "category")
+
+@pytest.mark.parametrize("sms, expected", [
+    (
+        "Dear Customer, your A/c X1234 is debited by Rs.250.00 on 12Oct26 trf to SWIGGY Ref no 512345678901. If not done by you, call 1800111109 -SBI",
+        (250.0, "expense", "SBI", "SWIGGY", None, "512345678901", None, "food")
+    ),
+    (
+        "ICICI Bank Acct XX345 debited for Rs 1,499.00 on 03-Oct-26; Netflix credited. UPI:612345678901. Call 18002662 for dispute.",
+        (1499.0, "expense", "ICICI", "Netflix", None, "612345678901", None, "entertainment")
+    ),
+    (
+        "INR 820.50 debited from A/c no. XX7788 on 05-10-26 UPI/P2M/712345678901/Uber India Not you? SMS BLOCK to 919951860002 - Axis Bank",
+        (820.5, "expense", "Axis", "Uber India", None, "712345678901", None, "transport")
+    ),
+    (
+        "Rs.2,000.00 sent from HDFC Bank A/c **4321 to VPA ravi@okhdfc on 10-10-26 Ref 412345678901. Avl Bal: Rs 15,230.45",
+        (2000.0, "expense", "HDFC", None, "ravi@okhdfc", "412345678901", 15230.45, "other")
+    ),
+], ids=["sbi", "icici", "axis", "generic"])
+def test_bank_templates(sms, expected):
+    parsed = SMSParser.parse_upi_sms(sms)
+    assert tuple(parsed[field] for field in FIELDS) == expected
+
+@pytest.mark.parametrize("sms, amount, transaction_type, vpa", [
+    ("Rs 1,200 credited to your SBI a/c XX12", 1200.0, "income", None),
+    ("Rs.500 debited from State Bank a/c XX12 to zomato@ybl", 500.0, "expense", "zomato@ybl"),
+    ("Rs 300 withdrawn at ATM. SBI", 300.0, "expense", None),
+])
+def test_bank_messages_outside_the_template_fall_back_to_generic_patterns(sms, amount, transaction_type, vpa):
+    parsed = SMSParser.parse_upi_sms(sms)
+    assert parsed is not None
+    assert (parsed["bank"], parsed["amount"], parsed["type"], parsed["vpa"]) == ("SBI", amount, transaction_type, vpa)
+
+def test_message_without_an_amount_is_not_a_transaction():
+    assert SMSParser.parse_upi_sms("Your SBI OTP is 482913. Do not share it with anyone.") is None
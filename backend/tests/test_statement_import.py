@@ -0,0 +1,41 @@
+"""Statement uploads: size limit and no leaked spool files"""
+import tempfile
+import pytest
+from app.core.config import settings
+from app.services.statement_import import StatementImporter
+
+STATEMENT = b"Date,Description,Amount\n2026-09-01,SWIGGY ORDER,-245.50\n2026-09-02,SALARY SEPT,52000\n"
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+def test_statement_is_imported_and_its_spool_removed(client, register, spool_dir):
+    _, headers = register()
+    response = client.post("/api/v1/imports/statements", content=STATEMENT, headers={**headers, "Content-Type": "text/csv"})
+    assert response.status_code == 202
+    
+    job = client.get(response.json()["status_url"], headers=headers).json()
+    assert (job["status"], job["inserted"], job["failed"]) == ("completed", 2, 0)
+    assert list(spool_dir.iterdir()) == []
+
+@pytest.mark.parametrize("chunked", [False, True], ids=["content-length", "chunked"])
+def test_oversized_statement_is_rejected_with_413(client, register, spool_dir, monkeypatch, chunked):
+    monkeypatch.setattr(settings, "STATEMENT_IMPORT_MAX_BYTES", 64)
+    _, headers = register()
+    body = (STATEMENT[i:i + 16] for i in range(0, len(STATEMENT), 16)) if chunked else STATEMENT
+    
+    response = client.post("/api/v1/imports/statements", content=body, headers={**headers, "Content-Type": "text/csv"})
+    assert response.status_code == 413
+    assert list(spool_dir.iterdir()) == []
+
+def test_spool_is_removed_when_the_job_cannot_be_created(client, register, spool_dir, monkeypatch):
+    def fail(self, user_id, format):
+        raise RuntimeError("database unavailable")
+    
+    monkeypatch.setattr(StatementImporter, "create_job", fail)
+    _, headers = register()
+    response = client.post("/api/v1/imports/statements", content=STATEMENT, headers={**headers, "Content-Type": "text/csv"})
+    assert response.status_code == 500
+    assert list(spool_dir.iterdir()) == []
@@ -0,0 +1,81 @@
+"""Learned categorizer: used above the confidence threshold, keywords and user rules otherwise"""
+import pytest
+from app.core.config import settings
+from app.ml_modules import text_classifier
+from app.ml_modules.categorizer import TransactionCategorizer
+from app.ml_modules.text_classifier import TextCategoryModel, get_text_model, synthetic_corpus
+from app.services.category_rules import CategoryRules
+
+@pytest.fixture(scope="module")
+def model():
+    return TextCategoryModel(n_features=2 ** 12).fit(*synthetic_corpus(400))
+
+@pytest.fixture
+def served(model, monkeypatch):
+    """Serve the tiny model to the categorizer; returns the (label, confidence) it gives a description"""
+    calls = []
+    def get_model():
+        calls.append(1)
+        return model
+    monkeypatch.setattr(text_classifier, "get_text_model", get_model)
+
+    def predict(description):
+        labels, confidences = model.predict([description])
+        return labels[0], float(confidences[0])
+    predict.calls = calls
+    return predict
+
+def test_model_is_used_above_the_confidence_threshold(served, monkeypatch):
+    label, confidence = served("AMAZON 55120931")
+    assert label == "shopping"
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_MIN_CONFIDENCE", confidence - 0.01)
+    
+    result = TransactionCategorizer().categorize_transaction("AMAZON 55120931")
+    assert result == {"status": "success", "category": "shopping", "confidence": round(confidence, 4), "matched_keyword": None}
+
+def test_keywords_take_over_below_the_threshold_or_on_other(served, monkeypatch):
+    _, confidence = served("AMAZON 55120931")
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_MIN_CONFIDENCE", confidence + 0.01)
+    categorizer = TransactionCategorizer()
+    
+    result = categorizer.categorize_transaction("AMAZON 55120931")
+    assert (result["category"], result["matched_keyword"], result["confidence"]) == ("shopping", "amazon", 0.85)
+    
+    # A confident "other" is no better than no prediction
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_MIN_CONFIDENCE", 0.5)
+    result = categorizer._categorize("corner bakery", (["other"], [0.99]))
+    assert (result["category"], result["matched_keyword"]) == ("food", "bakery")
+
+def test_user_rules_win_over_the_model(served, monkeypatch, register, db):
+    user_id, _ = register()
+    CategoryRules(db).add(user_id, "amazon", "food")
+    db.commit()
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_MIN_CONFIDENCE", 0.0)
+    
+    result = TransactionCategorizer(db, user_id).categorize_transaction("AMAZON 55120931")
+    assert (result["category"], result["matched_keyword"]) == ("food", "amazon")
+
+def test_batch_scores_the_model_once(served, monkeypatch):
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_MIN_CONFIDENCE", 0.0)
+    transactions = [
+        {"id": 1, "description": "AMAZON 55120931"},
+        {"id": 2, "description": "UBER TRIP 88120"},
+        {"id": 3, "description": "NETFLIX 1200"}
+    ]
+    
+    results = TransactionCategorizer().batch_categorize(transactions)
+    assert len(served.calls) == 1
+    assert [result["transaction_id"] for result in results] == [1, 2, 3]
+    assert [result["category"] for result in results] == [served(t["description"])[0] for t in transactions]
+
+def test_no_model_without_a_configured_path(model, monkeypatch, tmp_path):
+    monkeypatch.setattr(text_classifier, "_model", None)
+    monkeypatch.setattr(text_classifier, "_model_loaded", False)
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_PATH", "")
+    assert get_text_model() is None
+    
+    path = str(tmp_path / "category.joblib")
+    model.save(path)
+    monkeypatch.setattr(text_classifier, "_model_loaded", False)
+    monkeypatch.setattr(settings, "CATEGORY_MODEL_PATH", path)
+    assert get_text_model().predict(["AMAZON 55120931"])[0] == model.predict(["AMAZON 55120931"])[0]
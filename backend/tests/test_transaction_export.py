@@ -0,0 +1,59 @@
+"""Streaming CSV/NDJSON export: header, filters and per-user isolation"""
+import csv
+import io
+import json
+import pytest
+from app.core.config import settings
+
+ROWS = [
+    {"amount": 12.5, "type": "expense", "category": "food", "description": "lunch, with a comma", "transaction_date": "2026-01-05T12:00:00"},
+    {"amount": 3000, "type": "income", "category": "salary", "description": "January salary", "transaction_date": "2026-01-31T09:00:00"},
+    {"amount": 40, "type": "expense", "category": "transport", "description": "fuel", "transaction_date": "2026-02-10T18:30:00"},
+    {"amount": 8.75, "type": "expense", "category": "food", "description": "coffee", "transaction_date": "2026-03-01T08:15:00"}
+]
+
+@pytest.fixture
+def exporter(client, register, monkeypatch):
+    """A user with ROWS stored (and a second user with one row of their own); returns an export getter"""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    _, headers = register()
+    _, other_headers = register()
+    assert client.post("/api/v1/transactions/bulk", json=ROWS, headers=headers).json()["inserted"] == len(ROWS)
+    client.post("/api/v1/transactions/bulk", json=[{**ROWS[0], "description": "someone else"}], headers=other_headers)
+
+    def export(**params):
+        return client.get("/api/v1/transactions/export", params=params, headers=headers)
+    return export
+
+def test_csv_has_a_header_and_every_row_oldest_first(exporter):
+    response = exporter()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="transactions-')
+    
+    reader = csv.reader(io.StringIO(response.text))
+    assert next(reader) == ["id", "transaction_date", "type", "category", "amount", "description", "created_at"]
+    rows = list(reader)
+    assert [(row[1], row[2], row[3], float(row[4]), row[5]) for row in rows] == [
+        (r["transaction_date"], r["type"], r["category"], float(r["amount"]), r["description"]) for r in ROWS
+    ]
+
+def test_ndjson_has_one_object_per_line(exporter):
+    response = exporter(format="ndjson")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["description"] for record in records] == [row["description"] for row in ROWS]
+    assert records[1]["type"] == "income" and records[1]["amount"] == 3000
+
+def test_filters_by_category_type_and_date(exporter):
+    def descriptions(**params):
+        return [json.loads(line)["description"] for line in exporter(format="ndjson", **params).text.splitlines()]
+    
+    assert descriptions(category="food") == ["lunch, with a comma", "coffee"]
+    assert descriptions(type="income") == ["January salary"]
+    assert descriptions(start_date="2026-01-31T00:00:00", end_date="2026-02-28T23:59:59") == ["January salary", "fuel"]
+    assert descriptions(category="food", start_date="2026-02-01T00:00:00") == ["coffee"]
+
+def test_unknown_category_or_format_is_rejected(exporter):
+    assert exporter(category="groceries").status_code == 422
+    assert exporter(format="xml").status_code == 422
@@ -0,0 +1,84 @@
+"""Fingerprint duplicate detection: the 24h window, Bloom-filtered imports and in-import duplicates"""
+from datetime import datetime, timedelta
+from app.ml_modules.anomaly_detector import AnomalyDetector
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.schemas.transaction import TransactionCreate
+from app.services import transaction_fingerprint
+from app.services.transaction_fingerprint import DuplicateIndex, candidate_fingerprints, fingerprint_of
+
+def store(db, user_id, when, amount=42.0, description="Coffee Shop #12"):
+    transaction = Transaction(
+        user_id=user_id, amount=amount, type=TransactionType.EXPENSE,
+        category=TransactionCategory.FOOD, description=description, transaction_date=when
+    )
+    transaction.fingerprint = fingerprint_of(transaction)
+    db.add(transaction)
+    db.commit()
+
+def incoming(when, amount=42.0, description="coffee shop 12"):
+    return TransactionCreate(
+        amount=amount, type="expense", category="food", description=description, transaction_date=when
+    )
+
+def test_duplicates_match_across_midnight_within_24_hours(register, db):
+    user_id, _ = register()
+    store(db, user_id, datetime(2026, 3, 1, 23, 30))
+    index = DuplicateIndex(db)
+    
+    # Next calendar day, one hour later: different day fingerprint, still a duplicate
+    assert index.find(user_id, 42.0, "food", "coffee shop 12", datetime(2026, 3, 2, 0, 30)) == 1
+    # Adjacent day but more than 24 hours apart
+    assert index.find(user_id, 42.0, "food", "coffee shop 12", datetime(2026, 3, 2, 23, 45)) == 0
+    assert index.find(user_id, 42.5, "food", "coffee shop 12", datetime(2026, 3, 2, 0, 30)) == 0
+
+def test_bloom_filter_negatives_skip_the_index_probe(register, db, monkeypatch):
+    user_id, _ = register()
+    start = datetime(2026, 4, 1, 9, 0)
+    for day in range(60):
+        store(db, user_id, start + timedelta(days=day), amount=10.0 + day, description="groceries")
+    store(db, user_id, datetime(2026, 4, 20, 18, 0))
+    
+    monkeypatch.setattr(transaction_fingerprint, "BLOOM_MIN_ROWS", 3)
+    probed = []
+    existing = DuplicateIndex.existing
+    def spy(self, fingerprints):
+        fingerprints = list(fingerprints)
+        probed.extend(fingerprints)
+        return existing(self, fingerprints)
+    monkeypatch.setattr(DuplicateIndex, "existing", spy)
+    
+    rows = [
+        (0, incoming(datetime(2026, 4, 10, 12, 0), amount=7.0, description="bakery")),
+        (1, incoming(datetime(2026, 4, 20, 19, 0))),
+        (2, incoming(datetime(2026, 5, 5, 8, 0), amount=99.0, description="pharmacy"))
+    ]
+    assert DuplicateIndex(db).find_in_batch(user_id, rows) == [1]
+    
+    duplicate = set(candidate_fingerprints(user_id, 42.0, "food", "coffee shop 12", datetime(2026, 4, 20, 19, 0)))
+    assert probed and set(probed) <= duplicate
+
+def test_duplicates_within_one_import_are_reported(register, db):
+    user_id, _ = register()
+    when = datetime(2026, 6, 1, 23, 50)
+    rows = [
+        (0, incoming(when)),
+        (1, incoming(when + timedelta(minutes=20))),
+        (2, incoming(when + timedelta(minutes=20), amount=5.0)),
+        (3, incoming(when + timedelta(days=2)))
+    ]
+    assert DuplicateIndex(db).find_in_batch(user_id, rows) == [1]
+
+def test_detect_duplicate_transactions_returns_a_count(register, db):
+    user_id, _ = register()
+    detector = AnomalyDetector(db)
+    assert detector.detect_duplicate_transactions(user_id, 42.0, "food", "Coffee Shop #12") == {
+        "status": "success", "is_duplicate": False, "similar_transactions": 0
+    }
+    
+    now = datetime.utcnow()
+    store(db, user_id, now - timedelta(hours=1))
+    store(db, user_id, now - timedelta(hours=3))
+    store(db, user_id, now - timedelta(days=3))
+    result = detector.detect_duplicate_transactions(user_id, 42.0, "food", "coffee shop 12")
+    assert result["is_duplicate"] is True
+    assert result["similar_transactions"] == 2